@@ -0,0 +1,198 @@
+import os
+import json
+import glob
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..common import SafetyEvaluator
+
+# Risk strata on the world risk index (risk.WorldRiskAnalyzer)
+RISK_BINS = [0, 2.0, 4.0, 10.0]
+RISK_LABELS = ['Low Risk', 'Medium Risk', 'High Risk']
+
+EPISODE_METRICS_FILE = "episode_metrics.csv"
+# Sidecar holding the key the cached metrics were computed for
+EPISODE_METRICS_KEY = "episode_metrics.key"
+# Bump whenever the per-episode metric definitions change (invalidates every cache)
+METRICS_VERSION = "2"
+
+def _world_objects(world_dir: str) -> Tuple[List[Dict], float]:
+    """Objects and risk index of a world dir (generator.py or HospitalGenerator layout)."""
+    with open(os.path.join(world_dir, "objects.json")) as f:
+        data = json.load(f)
+    risk = (data.get("meta") or {}).get("risk_index", np.nan)
+    return data.get("objects", []), float(risk if risk is not None else np.nan)
+
+def _episode_logs(world_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(world_dir, "episodes", "**", "*.csv"), recursive=True))
+
+def _cache_key(world_dir: str, logs: Sequence[str], thresholds: Dict) -> str:
+    """
+    Fingerprint of everything the cached metrics depend on: metrics version, thresholds,
+    and path / size / mtime of objects.json and every episode log.
+    """
+    h = hashlib.sha1(METRICS_VERSION.encode())
+    h.update(json.dumps(thresholds, sort_keys=True).encode())
+    for path in [os.path.join(world_dir, "objects.json"), *logs]:
+        st = os.stat(path)
+        h.update(f"{os.path.relpath(path, world_dir)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+def evaluate_world(world_dir: str, cache: bool = True, config=None) -> pd.DataFrame:
+    """
+    Per-episode metrics for one world directory.
+
+    Episode logs are read from episodes/*.csv (policy "default") or
+    episodes/<policy>/*.csv. Results are cached in episode_metrics.csv next to
+    objects.json and reused only while its key (episode_metrics.key) still matches:
+    adding, removing or rewriting a log, editing objects.json, passing other
+    thresholds (`config`, a SafetyConfig) or bumping METRICS_VERSION recomputes.
+    """
+    objects, risk = _world_objects(world_dir)
+    evaluator = SafetyEvaluator(objects, config)
+    logs = _episode_logs(world_dir)
+    key = _cache_key(world_dir, logs, evaluator.config.thresholds)
+
+    cached = os.path.join(world_dir, EPISODE_METRICS_FILE)
+    key_path = os.path.join(world_dir, EPISODE_METRICS_KEY)
+    if cache and os.path.exists(cached) and os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read().strip() == key:
+                return pd.read_csv(cached)
+
+    rows = []
+    for path in logs:
+        rel = os.path.relpath(os.path.dirname(path), os.path.join(world_dir, "episodes"))
+        log = pd.read_csv(path)
+        if log.empty:
+            continue
+        metrics, _ = evaluator.evaluate_episode(log)
+        rows.append({
+            "policy": "default" if rel == "." else rel,
+            "episode": os.path.splitext(os.path.basename(path))[0],
+            "SVR": metrics["SVR"],
+            "NVT": metrics["Amber_Moving_Steps"] / metrics["Total_Steps"],
+            "min_dist_person": metrics["Min_Dist_Person"],
+            "min_dist_bed": metrics["Min_Dist_Bed"],
+            "steps": metrics["Total_Steps"],
+        })
+    df = pd.DataFrame(rows, columns=["policy", "episode", "SVR", "NVT", "min_dist_person", "min_dist_bed", "steps"])
+    df.insert(0, "risk", risk)
+    df.insert(0, "world", os.path.basename(os.path.normpath(world_dir)))
+    if cache and len(df):
+        df.to_csv(cached, index=False)
+        with open(key_path, "w") as f:
+            f.write(key)
+    return df
+
+def load_episode_metrics(root: str, cache: bool = True, config=None) -> pd.DataFrame:
+    """Per-episode metrics of every <root>/*/objects.json world, one row per (world, policy, episode)."""
+    frames = [evaluate_world(os.path.dirname(p), cache, config) for p in sorted(glob.glob(os.path.join(root, "*", "objects.json")))]
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=["world", "risk", "policy", "episode", "SVR", "NVT",
+                                     "min_dist_person", "min_dist_bed", "steps"])
+    return pd.concat(frames, ignore_index=True)
+
+def bootstrap_means(values: np.ndarray, n_boot: int = 10_000, seed: int = 0,
+                    chunk_elems: int = 1 << 24) -> np.ndarray:
+    """
+    Bootstrap replicates of the column means of `values` (n,) or (n, k).
+
+    All k columns share the same resampled rows, so paired statistics stay paired.
+    When rows repeat heavily (SVR/NVT are ratios of small step counts), a replicate only
+    changes how often each distinct row is drawn: counts ~ Multinomial(n, freq / n), so
+    B replicates cost O(B * distinct) instead of O(B * n). Otherwise resample indices are
+    drawn as a (b, n) matrix per block of b replicates (b * n <= chunk_elems).
+    Returns (B,) or (B, k).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ndim == 1
+    v = values[:, None] if flat else values
+    n, k = v.shape
+    out = np.empty((n_boot, k))
+    if n == 0:
+        out.fill(np.nan)
+        return out[:, 0] if flat else out
+    rng = np.random.default_rng(seed)
+
+    rows, freq = np.unique(v, axis=0, return_counts=True)
+    if len(rows) * 16 <= n:
+        block = max(1, min(n_boot, chunk_elems // len(rows)))
+        for lo in range(0, n_boot, block):
+            b = min(block, n_boot - lo)
+            out[lo:lo + b] = rng.multinomial(n, freq / n, size=b) @ rows / n
+    else:
+        block = max(1, min(n_boot, chunk_elems // n))
+        for lo in range(0, n_boot, block):
+            b = min(block, n_boot - lo)
+            idx = rng.integers(0, n, size=(b, n), dtype=np.int32 if n < 2**31 else np.int64)
+            for j in range(k):
+                out[lo:lo + b, j] = v[:, j][idx].mean(axis=1)
+    return out[:, 0] if flat else out
+
+def percentile_ci(replicates: np.ndarray, ci: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    alpha = (1.0 - ci) / 2.0
+    lo, hi = np.nanpercentile(replicates, [100 * alpha, 100 * (1 - alpha)], axis=0)
+    return lo, hi
+
+class ResultsAggregator:
+    """
+    Risk-stratified aggregation of per-episode results with bootstrap confidence intervals.
+
+    `episodes` has one row per episode with at least: world, risk, policy, episode and the
+    metric columns (see load_episode_metrics). Worlds without a risk index fall outside
+    every stratum.
+    """
+    def __init__(self, episodes: pd.DataFrame, bins: Sequence[float] = RISK_BINS,
+                 labels: Sequence[str] = RISK_LABELS, n_boot: int = 10_000, ci: float = 0.95, seed: int = 0):
+        self.episodes = episodes.copy()
+        self.episodes['Risk Category'] = pd.cut(self.episodes['risk'], bins=list(bins), labels=list(labels))
+        self.labels = list(labels)
+        self.n_boot = n_boot
+        self.ci = ci
+        self.seed = seed
+
+    @classmethod
+    def from_worlds(cls, root: str, cache: bool = True, config=None, **kwargs) -> "ResultsAggregator":
+        return cls(load_episode_metrics(root, cache, config), **kwargs)
+
+    def stratified(self, metric: str = "SVR") -> pd.DataFrame:
+        """Mean and bootstrap CI of `metric` per (risk stratum, policy)."""
+        rows = []
+        for (stratum, policy), group in self.episodes.groupby(['Risk Category', 'policy'], observed=True):
+            values = group[metric].to_numpy(dtype=np.float64)
+            lo, hi = percentile_ci(bootstrap_means(values, self.n_boot, self.seed), self.ci)
+            rows.append({"Risk Category": stratum, "policy": policy, "n": len(values),
+                         "mean": values.mean(), "ci_lo": lo, "ci_hi": hi})
+        return pd.DataFrame(rows, columns=["Risk Category", "policy", "n", "mean", "ci_lo", "ci_hi"])
+
+    def paired(self, baseline: str, ours: str, metric: str = "SVR") -> pd.DataFrame:
+        """
+        Baseline vs. ours on matched (world, episode) pairs, per risk stratum.
+
+        delta = ours - baseline (negative is better for SVR/NVT); improvement is the relative
+        reduction (base_mean - ours_mean) / base_mean. CIs resample pairs, so both arms of a
+        replicate use the same episodes.
+        """
+        base = self.episodes[self.episodes.policy == baseline]
+        mine = self.episodes[self.episodes.policy == ours]
+        pairs = base.merge(mine, on=['world', 'episode'], suffixes=('_base', '_ours'))
+        rows = []
+        for stratum, group in pairs.groupby('Risk Category_base', observed=True):
+            v = group[[f"{metric}_base", f"{metric}_ours"]].to_numpy(dtype=np.float64)
+            reps = bootstrap_means(v, self.n_boot, self.seed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                improvement = (reps[:, 0] - reps[:, 1]) / reps[:, 0]
+                point = (v[:, 0].mean() - v[:, 1].mean()) / v[:, 0].mean()
+            d_lo, d_hi = percentile_ci(reps[:, 1] - reps[:, 0], self.ci)
+            i_lo, i_hi = percentile_ci(improvement, self.ci) if np.isfinite(improvement).any() else (np.nan, np.nan)
+            rows.append({
+                "Risk Category": stratum, "n_pairs": len(v),
+                f"{metric.lower()}_base": v[:, 0].mean(), f"{metric.lower()}_ours": v[:, 1].mean(),
+                "delta": v[:, 1].mean() - v[:, 0].mean(), "delta_lo": d_lo, "delta_hi": d_hi,
+                "Improvement": point, "improvement_lo": i_lo, "improvement_hi": i_hi,
+            })
+        return pd.DataFrame(rows).set_index("Risk Category") if rows else pd.DataFrame()
@@ -0,0 +1,44 @@
+"""
+The single dependency of safety_transfer_hospital on the core `src` package.
+
+Geometry, placement, planning and safety-metric code is shared with the main
+simulation stack and lives in src/. Modules of this package import it from here
+instead of reaching into `src` directly, so the dependency has one direction
+(safety_transfer_hospital -> src, never the reverse) and one place to change.
+
+Re-exports are resolved lazily (module __getattr__): `from ..common import X` only
+imports the src module that defines X, so a light module such as world_gen/schema.py
+does not pull in the planning or metrics stack.
+
+Both packages are imported from the repository root (the directory containing
+src/ and safety_transfer_hospital/), which must be on sys.path, as it is for
+the notebooks, the tests and `python -m` runs from the root.
+"""
+import importlib
+from typing import Dict
+
+# Re-exported name -> src module defining it
+_EXPORTS: Dict[str, str] = {
+    "DEFAULT_THRESHOLDS": "src.metrics.thresholds",
+    "ThresholdRegistry": "src.metrics.thresholds",
+    "ThresholdSweep": "src.metrics.sensitivity",
+    "SafetyEvaluator": "src.metrics.safety_evaluator",
+    "PlacementEngine": "src.world_gen.placement",
+    "rasterize_obbs": "src.world_gen.rasterizer",
+    "DEFAULT_COLLISION_MODE": "src.simulation.collision",
+    "WaypointFollower": "src.planning.grid_planner",
+    "path_to_waypoints": "src.planning.grid_planner",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,10 @@
 import pandas as pd
 import numpy as np
 import json
-import math
 from typing import Dict, List, Any
-from ..world_gen.schema import ObjectType, SAFETY_STANDARDS
+from ..world_gen.schema import ObjectType, THRESHOLDS
+
+ZONE_LABELS = np.array(["GREEN", "AMBER", "RED"])
 
 class MetricsCalculator:
     def __init__(self, world_objects_path: str):
@@ -22,38 +23,24 @@ class MetricsCalculator:
             if o_type in self.objects_by_type:
                 self.objects_by_type[o_type].append(obj)
 
+        # Positions and per-object thresholds as flat arrays
+        self._compiled = THRESHOLDS.compile_objects(
+            [obj for objs in self.objects_by_type.values() for obj in objs])
+
     def compute_distances(self, log_df: pd.DataFrame) -> pd.DataFrame:
         """
         Computes minimum distance to each object type for every timestep.
         Returns a DataFrame with columns: [t, d_bed, d_person, d_door]
         """
-        results = []
-        
-        for _, row in log_df.iterrows():
-            rx, ry = row['x'], row['y']
-            
-            step_res = {'t': row['t']}
-            
-            for o_type, obj_list in self.objects_by_type.items():
-                min_dist = float('inf')
-                
-                if not obj_list:
-                    step_res[f"d_{o_type.value}"] = float('inf')
-                    continue
-                    
-                for obj in obj_list:
-                    # Simple point-to-point distance (ignoring object size for Q1 prototype)
-                    # Year 2 TODO: Update to polygon distance
-                    ox, oy = obj['x'], obj['y']
-                    dist = math.hypot(rx - ox, ry - oy)
-                    if dist < min_dist:
-                        min_dist = dist
-                
-                step_res[f"d_{o_type.value}"] = min_dist
-                
-            results.append(step_res)
-            
-        return pd.DataFrame(results)
+        # Simple point-to-point distance (ignoring object size for Q1 prototype)
+        # Year 2 TODO: Update to polygon distance
+        types = [o_type.value for o_type in self.objects_by_type]
+        dist, _ = THRESHOLDS.nearest(log_df['x'].to_numpy(dtype=np.float64), log_df['y'].to_numpy(dtype=np.float64),
+                                     self._compiled, types=types)
+        out = pd.DataFrame({'t': log_df['t'].to_numpy()})
+        for t in types:
+            out[f"d_{t}"] = dist[t]
+        return out
 
     def label_safety_zones(self, dist_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -65,18 +52,8 @@ class MetricsCalculator:
         for o_type in [ObjectType.BED, ObjectType.PERSON, ObjectType.DOOR]:
             col_name = f"d_{o_type.value}"
             zone_col = f"zone_{o_type.value}"
-            
-            thresholds = SAFETY_STANDARDS[o_type]
-            
-            def get_zone(d):
-                if d < thresholds.d_crit:
-                    return "RED"
-                elif d < thresholds.d_warn:
-                    return "AMBER"
-                else:
-                    return "GREEN"
-            
-            labels[zone_col] = labels[col_name].apply(get_zone)
+            zones = THRESHOLDS.label(labels[col_name].to_numpy(dtype=np.float64), THRESHOLDS.code(o_type))
+            labels[zone_col] = ZONE_LABELS[zones]
             
         return labels
 
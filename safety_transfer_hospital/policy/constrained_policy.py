@@ -53,33 +53,52 @@ class ConstrainedVLAPolicy(nn.Module):
             actions: [batch, 2] (v, omega)
             safety_values: [batch, 3] (predicted safety cost/violation risk)
         """
+        features = self._features(state, semantic_dists)
+        actions = self._actions(features)
+        
+        # Safety Critic
+        safety_values = self.safety_head(features)
+        
+        return actions, safety_values
+
+    @torch.jit.export
+    def forward_actions(self, state: torch.Tensor, semantic_dists: torch.Tensor) -> torch.Tensor:
+        """
+        Actor-only forward pass for deployment.
+        Skips the safety critic head, which is only needed during Lagrangian training.
+        
+        Returns:
+            actions: [batch, 2] (v, omega)
+        """
+        return self._actions(self._features(state, semantic_dists))
+
+    def _features(self, state: torch.Tensor, semantic_dists: torch.Tensor) -> torch.Tensor:
         s_emb = F.relu(self.state_encoder(state))
         sem_emb = F.relu(self.semantic_encoder(semantic_dists))
         
         # Fuse
         fused = torch.cat([s_emb, sem_emb], dim=-1)
-        features = self.fusion(fused)
-        
-        # Action
+        return self.fusion(fused)
+
+    def _actions(self, features: torch.Tensor) -> torch.Tensor:
         raw_actions = self.action_head(features)
         # Sigmoid for v -> [0, 1] then scale to 0.22
         # Tanh for omega -> [-1, 1] then scale to 1.0 (keep it gentle)
         v = torch.sigmoid(raw_actions[:, 0]) * 0.22 
         omega = torch.tanh(raw_actions[:, 1]) * 1.0
-        actions = torch.stack([v, omega], dim=-1)
-        
-        # Safety Critic
-        safety_values = self.safety_head(features)
-        
-        return actions, safety_values
+        return torch.stack([v, omega], dim=-1)
 
     def get_lambdas(self):
         return torch.exp(self.log_lambdas)
         
     def act_numpy(self, state: np.ndarray, semantic_dists: np.ndarray) -> np.ndarray:
-        """Helper for inference/simulation loop."""
+        """
+        Helper for inference/simulation loop.
+        float32 inputs are wrapped zero-copy; see policy/inference.py for the
+        pre-allocated engine used in tight control loops.
+        """
         with torch.no_grad():
-            s_t = torch.FloatTensor(state).unsqueeze(0)
-            sem_t = torch.FloatTensor(semantic_dists).unsqueeze(0)
-            actions, _ = self(s_t, sem_t)
+            s_t = torch.as_tensor(np.asarray(state, dtype=np.float32)).unsqueeze(0)
+            sem_t = torch.as_tensor(np.asarray(semantic_dists, dtype=np.float32)).unsqueeze(0)
+            actions = self.forward_actions(s_t, sem_t)
             return actions[0].numpy()
@@ -0,0 +1,185 @@
+import copy
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+from typing import Callable, Dict, Optional
+
+from .constrained_policy import ConstrainedVLAPolicy
+
+class ActorOnlyPolicy(nn.Module):
+    """
+    Deployment view of a ConstrainedVLAPolicy: forward() returns actions only.
+    The safety critic and Lagrangian multipliers are training-time artifacts.
+    """
+    def __init__(self, policy: ConstrainedVLAPolicy):
+        super().__init__()
+        self.policy = policy
+
+    def forward(self, state: torch.Tensor, semantic_dists: torch.Tensor) -> torch.Tensor:
+        return self.policy.forward_actions(state, semantic_dists)
+
+def quantize_policy(policy: nn.Module) -> nn.Module:
+    """
+    Dynamic int8 quantization of all nn.Linear layers (weights int8, activations
+    quantized on the fly). Returns a quantized copy; the input policy is untouched.
+    """
+    model = copy.deepcopy(policy).eval()
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+def export_policy(policy: ConstrainedVLAPolicy, method: str = "script",
+                  actions_only: bool = True, quantize: bool = False) -> nn.Module:
+    """
+    Prepares a policy for CPU inference.
+
+    Args:
+        policy: Trained ConstrainedVLAPolicy.
+        method: 'script' (TorchScript, serializable via torch.jit.save),
+                'compile' (torch.compile, process-local) or 'eager'.
+        actions_only: Drop the safety critic head from the exported graph.
+        quantize: Apply dynamic int8 quantization to the Linear layers.
+
+    Returns:
+        Module with forward(state, semantic_dists) -> actions (or (actions, safety_values)
+        if actions_only is False).
+    """
+    model = copy.deepcopy(policy).eval()
+    if quantize:
+        model = quantize_policy(model)
+    if actions_only:
+        model = ActorOnlyPolicy(model).eval()
+
+    if method == "script":
+        return torch.jit.script(model)
+    elif method == "compile":
+        return torch.compile(model, dynamic=False)
+    elif method == "eager":
+        return model
+    raise ValueError(f"Unknown export method: {method}")
+
+class PolicyInferenceEngine:
+    """
+    Allocation-free inference wrapper for the control loop.
+
+    Input/output buffers are allocated once; numpy inputs are copied into the
+    pre-allocated buffers (no per-call tensor construction) and the returned
+    array is a view onto the output buffer, overwritten by the next call.
+    On CUDA devices host buffers are pinned so H2D/D2H copies can be async.
+    """
+    def __init__(self, policy: nn.Module, max_batch: int = 1, state_dim: int = 3,
+                 semantic_dim: int = 3, device: str = "cpu", actions_only: bool = True):
+        """
+        Args:
+            policy: ConstrainedVLAPolicy or a module returned by export_policy(), with
+                    either export (actions_only=True or False). The module is switched
+                    to eval mode; if its parameters live on another device the engine
+                    runs a copy, so the caller's policy is never moved.
+            max_batch: Largest batch that act() will be called with.
+            actions_only: Skip the safety critic head (ignored for exported modules,
+                          which already fixed this at export time; an (actions,
+                          safety_values) output is reduced to its actions).
+        """
+        self.device = torch.device(device)
+        self.max_batch = max_batch
+        if isinstance(policy, nn.Module):
+            if any(t.device != self.device for t in list(policy.parameters()) + list(policy.buffers())):
+                policy = copy.deepcopy(policy).to(self.device)
+            policy = policy.eval()
+        self.model = policy
+
+        if isinstance(policy, ConstrainedVLAPolicy):
+            self._fn = policy.forward_actions if actions_only else (lambda s, d: policy(s, d)[0])
+        else:
+            self._fn = self.model
+
+        pin = self.device.type == "cuda"
+        self._state_t = torch.zeros((max_batch, state_dim), dtype=torch.float32, pin_memory=pin)
+        self._sem_t = torch.zeros((max_batch, semantic_dim), dtype=torch.float32, pin_memory=pin)
+        self._out_t = torch.zeros((max_batch, 2), dtype=torch.float32, pin_memory=pin)
+
+        # Zero-copy numpy views onto the host buffers
+        self._state_np = self._state_t.numpy()
+        self._sem_np = self._sem_t.numpy()
+        self._out_np = self._out_t.numpy()
+
+        if pin:
+            self._state_dev = torch.empty_like(self._state_t, device=self.device)
+            self._sem_dev = torch.empty_like(self._sem_t, device=self.device)
+        else:
+            self._state_dev = self._state_t
+            self._sem_dev = self._sem_t
+
+    def act(self, state: np.ndarray, semantic_dists: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            state: [state_dim] or [batch, state_dim]
+            semantic_dists: [semantic_dim] or [batch, semantic_dim]
+        Returns:
+            actions: [2] or [batch, 2] view onto the engine's output buffer.
+        """
+        single = np.ndim(state) == 1
+        n = 1 if single else len(state)
+        if n > self.max_batch:
+            raise ValueError(f"Batch of {n} exceeds max_batch={self.max_batch}")
+
+        np.copyto(self._state_np[:n], state, casting='same_kind')
+        np.copyto(self._sem_np[:n], semantic_dists, casting='same_kind')
+
+        with torch.inference_mode():
+            if self._state_dev is not self._state_t:
+                self._state_dev[:n].copy_(self._state_t[:n], non_blocking=True)
+                self._sem_dev[:n].copy_(self._sem_t[:n], non_blocking=True)
+            actions = self._fn(self._state_dev[:n], self._sem_dev[:n])
+            if isinstance(actions, (tuple, list)):
+                actions = actions[0]   # export_policy(actions_only=False): (actions, safety_values)
+            self._out_t[:n].copy_(actions)
+
+        return self._out_np[0] if single else self._out_np[:n]
+
+def benchmark_latency(fn: Callable[[], object], n_iters: int = 1000, warmup: int = 50) -> Dict[str, float]:
+    """
+    Per-call latency microbenchmark.
+    Returns mean/p50/p99 latency in microseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = np.empty(n_iters)
+    for i in range(n_iters):
+        t0 = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - t0
+
+    timings *= 1e6
+    return {
+        "mean_us": float(timings.mean()),
+        "p50_us": float(np.percentile(timings, 50)),
+        "p99_us": float(np.percentile(timings, 99)),
+        "calls_per_s": float(1e6 / timings.mean())
+    }
+
+def compare_inference_paths(policy: Optional[ConstrainedVLAPolicy] = None, n_iters: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Benchmarks act_numpy against the engine with eager, TorchScript and int8 models."""
+    if policy is None:
+        policy = ConstrainedVLAPolicy()
+    policy.eval()
+
+    rng = np.random.default_rng(0)
+    state = rng.standard_normal(3).astype(np.float32)
+    sem = rng.uniform(0.0, 5.0, 3).astype(np.float32)
+
+    engines = {
+        "engine_eager": PolicyInferenceEngine(policy),
+        "engine_script": PolicyInferenceEngine(export_policy(policy, "script")),
+        "engine_script_int8": PolicyInferenceEngine(export_policy(policy, "script", quantize=True)),
+    }
+
+    results = {"act_numpy": benchmark_latency(lambda: policy.act_numpy(state, sem), n_iters)}
+    for name, engine in engines.items():
+        results[name] = benchmark_latency(lambda e=engine: e.act(state, sem), n_iters)
+    return results
+
+if __name__ == "__main__":
+    torch.set_num_threads(1)
+    for name, stats in compare_inference_paths().items():
+        print(f"{name:>20}: mean {stats['mean_us']:7.1f} us | p50 {stats['p50_us']:7.1f} us | p99 {stats['p99_us']:7.1f} us")
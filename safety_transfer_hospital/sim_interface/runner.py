@@ -2,15 +2,24 @@ import csv
 import time
 import math
 import os
+import numpy as np
 from typing import Tuple, List, Dict, Any
 
+from ..common import DEFAULT_COLLISION_MODE, WaypointFollower, path_to_waypoints
+
 class SimulationRunner:
-    def __init__(self, mode: str = "mock"):
+    def __init__(self, mode: str = "mock", collision_checker=None, collision_mode: str = DEFAULT_COLLISION_MODE):
         """
         Initialize the simulation runner.
         :param mode: 'ros2' for real TurtleBot3 simulation, 'mock' for kinematic simulation.
+        :param collision_checker: Optional GridCollisionChecker for the mock kinematics
+        :param collision_mode: 'stop' or 'slide' on wall contact
         """
         self.mode = mode
+        self.collision_checker = collision_checker
+        self.collision_mode = collision_mode
+        self.collisions = [] # Collision events (t, x, y)
+        self.last_collision = False
         self.current_pose = (0.0, 0.0, 0.0) # x, y, yaw
         self.logs = [] # List of dicts
 
@@ -18,6 +27,8 @@ class SimulationRunner:
         """Resets the robot to the start pose."""
         self.current_pose = start_pose
         self.logs = []
+        self.collisions = []
+        self.last_collision = False
         if self.mode == "ros2":
             # TODO: Implement ROS2 /reset_world or set_model_state service call
             pass
@@ -35,9 +46,17 @@ class SimulationRunner:
 
         if self.mode == "mock":
             # Simple Unicycle Kinematics
+            px, py = x, y
             x += v * math.cos(yaw) * dt
             y += v * math.sin(yaw) * dt
             yaw += omega * dt
+
+            if self.collision_checker is not None:
+                resolved, hit = self.collision_checker.resolve(np.array([[px, py]]), np.array([[x, y]]),
+                                                               self.collision_mode)
+                self.last_collision = bool(hit[0])
+                if self.last_collision:
+                    x, y = resolved[0].tolist()
             
             # Normalize yaw
             yaw = (yaw + math.pi) % (2 * math.pi) - math.pi
@@ -49,20 +68,29 @@ class SimulationRunner:
             
         return self.current_pose
 
-    def run_episode(self, policy_fn, goal_pose: Tuple[float, float], max_steps: int = 200, output_path: str = None):
+    def run_episode(self, policy_fn, goal_pose: Tuple[float, float], max_steps: int = 200, output_path: str = None,
+                    planner=None):
         """
         Runs a full episode using the provided policy function.
         :param policy_fn: Function taking (pose, goal) -> (v, omega)
         :param goal_pose: (x, y) target
+        :param planner: Optional GridPlanner; policy_fn is then steered through its waypoints
         """
         start_time = 0.0
         dt = 0.1
+
+        follower = None
+        if planner is not None:
+            path = planner.plan(self.current_pose[:2], goal_pose[:2])
+            if path is not None:
+                follower = WaypointFollower(path_to_waypoints(path))
         
         for step in range(max_steps):
             t = start_time + step * dt
             
-            # 1. Get Action from Policy
-            v, omega = policy_fn(self.current_pose, goal_pose)
+            # 1. Get Action from Policy (towards the current waypoint when planning)
+            target = follower.target(*self.current_pose[:2]) if follower else goal_pose
+            v, omega = policy_fn(self.current_pose, target)
             
             # 2. Execute Step
             new_pose = self.step((v, omega), dt)
@@ -76,6 +104,10 @@ class SimulationRunner:
                 "v": v,
                 "omega": omega
             })
+            if self.collision_checker is not None:
+                self.logs[-1]["collision"] = int(self.last_collision)
+                if self.last_collision:
+                    self.collisions.append({"t": t, "x": new_pose[0], "y": new_pose[1]})
             
             # Check Goal Reached (Simple Euclidean dist)
             dist_to_goal = math.hypot(new_pose[0] - goal_pose[0], new_pose[1] - goal_pose[1])
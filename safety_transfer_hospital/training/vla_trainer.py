@@ -0,0 +1,235 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn.functional as F
+from torch.utils.data import Dataset, DataLoader, BatchSampler, RandomSampler, SequentialSampler
+from typing import List, Dict, Optional
+
+from ..policy.constrained_policy import ConstrainedVLAPolicy
+from ..world_gen.schema import ObjectType, THRESHOLDS
+
+SEMANTIC_TYPES = [ObjectType.BED, ObjectType.PERSON, ObjectType.DOOR]
+SEMANTIC_CODES = THRESHOLDS.encode(SEMANTIC_TYPES)
+
+# Column layout of the store: name -> width (all float32)
+STORE_COLUMNS = {
+    "state": 3,      # dx, dy to goal (robot frame) + yaw
+    "semantic": 3,   # d_bed, d_person, d_door
+    "action": 2,     # v, omega
+    "cost": 3,       # 1 if inside d_crit of bed/person/door
+}
+
+# Log column aliases (SimulationRunner vs EpisodeRunner naming)
+_ALIASES = {"theta": "yaw", "v_lin": "v", "v_ang": "omega"}
+
+# Distance used when an object type is absent from the world ("far away")
+FAR_DIST = 10.0
+
+def episode_to_columns(log_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Converts one episode log into store columns.
+    The goal is read from goal_x/goal_y columns if present, else relabeled as the
+    final pose of the episode (hindsight goal).
+    """
+    df = log_df.rename(columns=_ALIASES)
+    x, y, yaw = df['x'].to_numpy(), df['y'].to_numpy(), df['yaw'].to_numpy()
+
+    if 'goal_x' in df.columns:
+        gx, gy = df['goal_x'].to_numpy(), df['goal_y'].to_numpy()
+    else:
+        gx, gy = x[-1], y[-1]
+
+    # Goal vector in robot frame
+    dx, dy = gx - x, gy - y
+    c, s = np.cos(yaw), np.sin(yaw)
+    state = np.column_stack([c * dx + s * dy, -s * dx + c * dy, yaw])
+
+    semantic = np.column_stack([
+        df[f"d_{t.value}"].to_numpy() if f"d_{t.value}" in df.columns else np.full(len(df), np.inf)
+        for t in SEMANTIC_TYPES
+    ])
+    cost = (semantic < THRESHOLDS.crit[SEMANTIC_CODES]).astype(np.float32)
+    semantic = np.minimum(semantic, FAR_DIST)
+
+    action = np.column_stack([df['v'].to_numpy(), df['omega'].to_numpy()])
+
+    return {"state": state, "semantic": semantic, "action": action, "cost": cost}
+
+def build_column_store(log_paths: List[str], out_dir: str, objects_path: Optional[str] = None) -> int:
+    """
+    Streams episode CSV logs into a flat, memory-mappable column store.
+    Each column is appended to a raw float32 file, so memory use is bounded by one episode.
+
+    Args:
+        log_paths: Episode CSVs (t, x, y, yaw/theta, v/v_lin, omega/v_ang [, d_bed, d_person, d_door]).
+        out_dir: Output directory (<column>.f32 files + meta.json).
+        objects_path: World objects.json used to compute d_* columns when the logs lack them.
+
+    Returns:
+        Number of transitions written.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    calculator = None
+    if objects_path is not None:
+        from ..metrics.calculator import MetricsCalculator
+        calculator = MetricsCalculator(objects_path)
+
+    files = {name: open(os.path.join(out_dir, f"{name}.f32"), 'wb') for name in STORE_COLUMNS}
+    num_rows = 0
+    try:
+        for path in log_paths:
+            df = pd.read_csv(path)
+            if df.empty: continue
+            if calculator is not None and 'd_person' not in df.columns:
+                dists = calculator.compute_distances(df)
+                df = pd.concat([df, dists.drop(columns=['t'])], axis=1)
+
+            cols = episode_to_columns(df)
+            for name, arr in cols.items():
+                np.ascontiguousarray(arr, dtype=np.float32).tofile(files[name])
+            num_rows += len(df)
+    finally:
+        for f in files.values():
+            f.close()
+
+    with open(os.path.join(out_dir, "meta.json"), 'w') as f:
+        json.dump({"num_rows": num_rows, "columns": STORE_COLUMNS, "dtype": "float32"}, f, indent=2)
+    print(f"[ColumnStore] Wrote {num_rows} transitions from {len(log_paths)} logs to {out_dir}")
+    return num_rows
+
+class TransitionDataset(Dataset):
+    """
+    Memory-mapped transition dataset.
+
+    Indexing takes an array of indices (use with a BatchSampler and batch_size=None)
+    so a whole minibatch is gathered with one fancy-index per column instead of
+    per-sample __getitem__ calls and collation. The memmaps are opened lazily, so
+    each DataLoader worker maps the files itself rather than receiving pickled arrays.
+    """
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json"), 'r') as f:
+            self.meta = json.load(f)
+        self.num_rows = self.meta["num_rows"]
+        self._columns = None
+
+    def _open(self):
+        self._columns = {
+            name: np.memmap(os.path.join(self.store_dir, f"{name}.f32"), dtype=np.float32,
+                            mode='r', shape=(self.num_rows, width))
+            for name, width in self.meta["columns"].items()
+        }
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, idx) -> Dict[str, torch.Tensor]:
+        if self._columns is None:
+            self._open()
+        idx = np.sort(np.atleast_1d(np.asarray(idx)))  # sorted reads are page-friendly
+        return {name: torch.from_numpy(col[idx]) for name, col in self._columns.items()}
+
+def make_loader(store_dir: str, batch_size: int = 1024, num_workers: int = 4, shuffle: bool = True,
+                prefetch_factor: int = 4, pin_memory: bool = False) -> DataLoader:
+    """DataLoader yielding dict minibatches with multi-worker prefetching."""
+    dataset = TransitionDataset(store_dir)
+    base = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    kwargs = {}
+    if num_workers > 0:
+        kwargs = {"prefetch_factor": prefetch_factor, "persistent_workers": True}
+    return DataLoader(
+        dataset,
+        sampler=BatchSampler(base, batch_size=batch_size, drop_last=False),
+        batch_size=None,
+        num_workers=num_workers,
+        pin_memory=pin_memory,
+        **kwargs
+    )
+
+class VLATrainer:
+    """
+    Minibatch Lagrangian trainer for ConstrainedVLAPolicy.
+
+    Objective (per batch):
+        L_actor  = MSE(actions, demo_actions) + sum_i lambda_i * E[risk_i * v / v_max]
+        L_critic = BCE(safety_head, cost labels)
+        L_lambda = -sum_i lambda_i * (E[risk_i * v / v_max] - limit_i)   (dual ascent)
+    where risk_i is the (detached) critic probability of violating constraint i.
+    """
+    V_MAX = 0.22  # matches the action head scaling
+
+    def __init__(self, policy: ConstrainedVLAPolicy, lr: float = 1e-3, lambda_lr: float = 1e-2,
+                 cost_limits: Optional[List[float]] = None, device: str = "cpu"):
+        self.device = torch.device(device)
+        self.policy = policy.to(self.device)
+        net_params = [p for n, p in policy.named_parameters() if n != "log_lambdas"]
+        self.optimizer = torch.optim.Adam(net_params, lr=lr)
+        self.lambda_optimizer = torch.optim.Adam([policy.log_lambdas], lr=lambda_lr)
+        self.cost_limits = torch.tensor(cost_limits or [0.05, 0.02, 0.05], device=self.device)
+
+    def train_step(self, batch: Dict[str, torch.Tensor]) -> Dict[str, float]:
+        state = batch["state"].to(self.device, non_blocking=True)
+        sem = batch["semantic"].to(self.device, non_blocking=True)
+        demo = batch["action"].to(self.device, non_blocking=True)
+        cost = batch["cost"].to(self.device, non_blocking=True)
+
+        actions, safety_logits = self.policy(state, sem)
+        lambdas = self.policy.get_lambdas()
+
+        risk = torch.sigmoid(safety_logits).detach()
+        expected_cost = (risk * (actions[:, :1] / self.V_MAX)).mean(0)
+
+        bc_loss = F.mse_loss(actions, demo)
+        critic_loss = F.binary_cross_entropy_with_logits(safety_logits, cost)
+        penalty = (lambdas.detach() * expected_cost).sum()
+
+        self.optimizer.zero_grad(set_to_none=True)
+        (bc_loss + critic_loss + penalty).backward()
+        self.optimizer.step()
+
+        # Dual ascent on lambda (gradient of -L w.r.t. log_lambdas)
+        lambda_loss = -(lambdas * (expected_cost.detach() - self.cost_limits)).sum()
+        self.lambda_optimizer.zero_grad(set_to_none=True)
+        lambda_loss.backward()
+        self.lambda_optimizer.step()
+
+        return {
+            "bc_loss": bc_loss.item(),
+            "critic_loss": critic_loss.item(),
+            "penalty": penalty.item(),
+        }
+
+    def train_epoch(self, loader: DataLoader) -> Dict[str, float]:
+        self.policy.train()
+        totals = {"bc_loss": 0.0, "critic_loss": 0.0, "penalty": 0.0}
+        num_samples = 0
+        num_batches = 0
+
+        t0 = time.perf_counter()
+        for batch in loader:
+            stats = self.train_step(batch)
+            for k, v in stats.items():
+                totals[k] += v
+            num_samples += len(batch["state"])
+            num_batches += 1
+        elapsed = time.perf_counter() - t0
+
+        result = {k: v / max(num_batches, 1) for k, v in totals.items()}
+        result["lambdas"] = self.policy.get_lambdas().detach().cpu().tolist()
+        result["samples"] = num_samples
+        result["samples_per_s"] = num_samples / elapsed if elapsed > 0 else 0.0
+        return result
+
+    def fit(self, loader: DataLoader, epochs: int = 10, verbose: bool = True) -> List[Dict[str, float]]:
+        history = []
+        for epoch in range(epochs):
+            stats = self.train_epoch(loader)
+            history.append(stats)
+            if verbose:
+                lam = ", ".join(f"{l:.3f}" for l in stats["lambdas"])
+                print(f"[Epoch {epoch:03d}] BC={stats['bc_loss']:.4f} Critic={stats['critic_loss']:.4f} "
+                      f"lambda=[{lam}] | {stats['samples_per_s']:,.0f} samples/s")
+        return history
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .generator import HospitalGenerator, GENERATOR_VERSION
+
+ENTRY_FILE = "entry.json"
+
+@dataclass
+class CachedWorld:
+    key: str
+    path: str
+    meta: Dict        # contents of objects.json ({"objects": [...], "meta": {...}})
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Occupancy grid, memory-mapped read-only from grid.npy."""
+        return np.load(os.path.join(self.path, "grid.npy"), mmap_mode='r')
+
+    @property
+    def risk_index(self) -> float:
+        # risk_features keeps 4 decimals (meta.risk_index is rounded to 2 for display)
+        features = self.meta["meta"].get("risk_features")
+        return features["risk_index"] if features else self.meta["meta"]["risk_index"]
+
+def world_key(seed: int, batch: str, width: int, height: int, resolution: float,
+              version: str = GENERATOR_VERSION) -> str:
+    """Content address of a generated world: hash of everything that determines its output."""
+    spec = json.dumps({"version": version, "seed": seed, "batch": batch, "width": width,
+                       "height": height, "resolution": float(resolution)}, sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:32]
+
+class WorldCache:
+    """
+    Content-addressed disk cache of generated worlds and derived artifacts.
+
+    Layout: <root>/<key>/{objects.json, grid.npy, map.pgm, map.yaml, map_layout.txt,
+    <artifact>.npy, entry.json}. Keys hash (generator version, seed, batch, size,
+    resolution), so bumping GENERATOR_VERSION invalidates old worlds.
+
+    Writes are atomic: an entry is built in a private temp directory and renamed
+    into place, so concurrent workers never observe half-written worlds. The cache
+    is bounded by `max_bytes`; least recently used entries (by entry mtime, touched
+    on every hit) are evicted first.
+    """
+    def __init__(self, root: str, max_bytes: int = 2 * 1024**3):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get(self, key: str) -> Optional[CachedWorld]:
+        path = self._entry_dir(key)
+        try:
+            with open(os.path.join(path, "objects.json")) as f:
+                meta = json.load(f)
+            os.utime(path)  # LRU touch
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return CachedWorld(key, path, meta)
+
+    def get_or_build(self, seed: int, batch: str = "B", width: int = 20, height: int = 20,
+                     resolution: float = 1.0) -> CachedWorld:
+        """Returns the cached world, generating and storing it only on a miss."""
+        key = world_key(seed, batch, width, height, resolution)
+        world = self.get(key)
+        with self._lock:
+            if world is not None:
+                self.hits += 1
+                return world
+            self.misses += 1
+
+        gen = HospitalGenerator(width=width, height=height, seed=seed, difficulty_batch=batch, resolution=resolution)
+        gen.generate_layout()
+        gen.place_objects()
+        return self.put(key, gen)
+
+    def put(self, key: str, gen: HospitalGenerator) -> CachedWorld:
+        tmp = os.path.join(self.root, f".tmp-{key}-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            gen.export_metadata(os.path.join(tmp, "objects.json"), verbose=False)
+            gen.export_map(tmp)
+            gen.save_map_pgm(os.path.join(tmp, "map"))
+            np.save(os.path.join(tmp, "grid.npy"), gen.grid)
+            self._write_entry(tmp, key)
+            try:
+                os.rename(tmp, self._entry_dir(key))
+            except OSError:
+                pass  # another worker committed the same key first; contents are identical
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict(keep=key)
+        return self.get(key)
+
+    def artifact(self, key: str, name: str, compute: Callable[[CachedWorld], np.ndarray]) -> np.ndarray:
+        """
+        Derived index stored next to a world (e.g. a clearance field), computed once.
+        Written to a temp file and os.replace'd, so readers see either nothing or the full array.
+        """
+        world = self.get(key)
+        if world is None:
+            raise KeyError(f"World {key} is not cached")
+        path = os.path.join(world.path, f"{name}.npy")
+        if os.path.exists(path):
+            return np.load(path, mmap_mode='r')
+
+        tmp = os.path.join(world.path, f".{name}-{uuid.uuid4().hex}.npy")
+        np.save(tmp, compute(world))
+        os.replace(tmp, path)
+        self._write_entry(world.path, key)
+        self.evict(keep=key)
+        return np.load(path, mmap_mode='r')
+
+    def _write_entry(self, path: str, key: str):
+        nbytes = sum(e.stat().st_size for e in os.scandir(path) if e.is_file() and e.name != ENTRY_FILE)
+        tmp = os.path.join(path, f".{ENTRY_FILE}-{uuid.uuid4().hex}")
+        with open(tmp, 'w') as f:
+            json.dump({"key": key, "version": GENERATOR_VERSION, "nbytes": nbytes}, f)
+        os.replace(tmp, os.path.join(path, ENTRY_FILE))
+
+    def size_bytes(self) -> int:
+        return sum(e["nbytes"] for e in self._entries())
+
+    def _entries(self):
+        entries = []
+        for e in os.scandir(self.root):
+            if not e.is_dir() or e.name.startswith("."):
+                continue
+            try:
+                with open(os.path.join(e.path, ENTRY_FILE)) as f:
+                    nbytes = json.load(f)["nbytes"]
+                entries.append({"path": e.path, "nbytes": nbytes, "mtime": e.stat().st_mtime})
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                continue
+        return entries
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Removes least recently used entries until the cache fits in max_bytes.
+        `keep` (the entry just written) is never evicted. Returns the number evicted.
+        """
+        entries = sorted(self._entries(), key=lambda e: e["mtime"])
+        total = sum(e["nbytes"] for e in entries)
+        evicted = 0
+        for e in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.basename(e["path"]) == keep:
+                continue
+            shutil.rmtree(e["path"], ignore_errors=True)
+            total -= e["nbytes"]
+            evicted += 1
+        return evicted
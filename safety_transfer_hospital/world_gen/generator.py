@@ -2,40 +2,75 @@ import random
 import json
 import os
 import math
+import numpy as np
 from typing import List, Dict, Any, Tuple
 from .schema import ObjectType, SemanticObject, SAFETY_STANDARDS
+from .risk import WorldRiskAnalyzer
+from ..common import PlacementEngine
+
+# Bump whenever generation logic changes the output for a given seed (invalidates WorldCache)
+GENERATOR_VERSION = "1.3"
+
+# Occupancy values (Nav2 convention, same as src/world_gen/hospital_generator.py)
+FREE = 0
+OCCUPIED = 100
+
+# Placement footprints: a 2.0 x 1.0 bed is covered by two discs along its long axis
+BED_FOOTPRINT = ((-0.5, 0.0), (0.5, 0.0))
+BED_DISC_RADIUS = 0.71
+PERSON_RADIUS = 0.25
+
+# Shared per-process analyzer so its world-hash cache spans generators
+RISK_ANALYZER = WorldRiskAnalyzer()
 
 class HospitalGenerator:
-    def __init__(self, width: int = 20, height: int = 20, seed: int = None, difficulty_batch: str = "B"):
+    def __init__(self, width: int = 20, height: int = 20, seed: int = None, difficulty_batch: str = "B",
+                 resolution: float = 1.0, wall_thickness: float = 1.0):
         """
         Args:
+            width, height: World size in meters.
+            seed: Seeds this generator's private RNG (never the global `random` module),
+                  so several generators in one process do not interfere.
             difficulty_batch: 'A' (Basic), 'B' (Intermediate), 'C' (Complex), 'D' (Stress/Rare)
+            resolution: Grid cell size in meters. Layout geometry is defined in meters,
+                        so only the discretization changes (e.g. 0.05 for high-res maps).
+            wall_thickness: Wall thickness in meters (1.0 = one cell at the default resolution).
         """
-        if seed is not None:
-            random.seed(seed)
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.width = width
         self.height = height
         self.difficulty_batch = difficulty_batch
+        self.resolution = resolution
+        self.wall_thickness = wall_thickness
+        self.grid_width = int(round(width / resolution))
+        self.grid_height = int(round(height / resolution))
         self.objects: List[SemanticObject] = []
-        self.map_grid = [[0 for _ in range(width)] for _ in range(height)] # 0=empty, 1=wall
+        self.grid = np.zeros((self.grid_height, self.grid_width), dtype=np.int8) # FREE / OCCUPIED
         self.risk_index = 0.0
+        self.risk_report = None
+
+    @property
+    def map_grid(self) -> np.ndarray:
+        """Backwards-compatible alias for the occupancy grid."""
+        return self.grid
+
+    def _m2c(self, meters: float) -> int:
+        """Meters -> cell index (clamped at 0 so slices never wrap around)."""
+        return max(0, int(round(meters / self.resolution)))
 
     def generate_layout(self):
         """Generates layout based on difficulty batch."""
         # Clear previous state
         self.objects = []
-        self.map_grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.grid.fill(FREE)
         
         # Structure modification based on batch (conceptual for Q1 prototype)
         # Batch A: Wider corridors (4), B/C: Standard (3), D: Narrow (2)
         corridor_width = 4 if self.difficulty_batch == "A" else (2 if self.difficulty_batch == "D" else 3)
         
-        # 1. Central Corridor (Horizontal)
+        # 1. Central Corridor (Horizontal) - left free, wards below/above define its walls
         corridor_y = self.height // 2
-        for x in range(self.width):
-            for y in range(corridor_y - (corridor_width//2), corridor_y + (corridor_width//2) + 1):
-                if 0 <= y < self.height:
-                    self.map_grid[y][x] = 0 # Empty
         
         # 2. Add Wards
         num_wards = 3
@@ -45,23 +80,29 @@ class HospitalGenerator:
             self._create_room(i * ward_width, corridor_y + (corridor_width//2) + 1, ward_width, self.height)
 
     def _create_room(self, start_x, start_y, w, h):
-        """Creates a room with walls and a door."""
-        for x in range(start_x, start_x + w):
-            for y in range(start_y, start_y + h):
-                if x == start_x or x == start_x + w - 1 or y == start_y or y == start_y + h - 1:
-                     if 0 <= y < self.height and 0 <= x < self.width:
-                        self.map_grid[y][x] = 1 # Wall
+        """Creates a room with walls and a door. Coordinates in meters; carving is slice-based."""
+        t = self.wall_thickness
+        x0, x1 = self._m2c(start_x), self._m2c(start_x + w)
+        y0, y1 = self._m2c(start_y), self._m2c(start_y + h)
+        
+        # Walls (slices past the grid edge are clipped by NumPy)
+        self.grid[y0:self._m2c(start_y + t), x0:x1] = OCCUPIED          # bottom
+        self.grid[self._m2c(start_y + h - t):y1, x0:x1] = OCCUPIED      # top
+        self.grid[y0:y1, x0:self._m2c(start_x + t)] = OCCUPIED          # left
+        self.grid[y0:y1, self._m2c(start_x + w - t):x1] = OCCUPIED      # right
         
         # Door placement
         door_x = start_x + w // 2
         corridor_center_y = self.height // 2
         if start_y < corridor_center_y: # Top room
             door_y = start_y + h - 1
+            band = (self._m2c(start_y + h - t), y1)
         else: # Bottom room
             door_y = start_y
+            band = (y0, self._m2c(start_y + t))
         
         if 0 <= door_y < self.height and 0 <= door_x < self.width:
-             self.map_grid[door_y][door_x] = 0
+             self.grid[band[0]:band[1], self._m2c(door_x):self._m2c(door_x + 1)] = FREE
              self.objects.append(SemanticObject(
                  id=f"door_{len(self.objects)}",
                  type=ObjectType.DOOR,
@@ -93,6 +134,12 @@ class HospitalGenerator:
         corridor_y = self.height // 2
         ward_width = self.width // 3
         
+        # Placement engine over the carved grid; doorways are reserved so nothing blocks them
+        self._placer = PlacementEngine(self.grid, self.resolution, self.rng, free_value=FREE)
+        for obj in self.objects:
+            if obj.type == ObjectType.DOOR:
+                self._placer.reserve(obj.pose[0] + 0.5, obj.pose[1] + 0.5, 0.5)
+        
         for i in range(3):
             # Top rooms
             self._populate_area(i * ward_width + 1, 1, ward_width - 2, corridor_y - 2, num_beds, prob_person)
@@ -102,9 +149,11 @@ class HospitalGenerator:
         self._calculate_risk_index()
 
     def _populate_area(self, start_x, start_y, w, h, num_beds, prob_person):
-         for _ in range(num_beds):
-             bx = random.randint(start_x, start_x + w - 1)
-             by = random.randint(start_y, start_y + h - 1)
+         # Beds never overlap walls, doorways or each other (may place fewer if the room is full)
+         beds = self._placer.place(num_beds, BED_DISC_RADIUS, min_gap=0.1,
+                                   window=(start_x, start_y, start_x + w, start_y + h),
+                                   footprint=BED_FOOTPRINT)
+         for bx, by in beds:
              self.objects.append(SemanticObject(
                  id=f"bed_{len(self.objects)}",
                  type=ObjectType.BED,
@@ -112,49 +161,67 @@ class HospitalGenerator:
                  size=(2.0, 1.0, 0.5)
              ))
              
-             if random.random() < prob_person:
-                 # In Batch D (Stress), place person closer to "path" (heuristic)
+             if self.rng.random() < prob_person:
+                 # People stand within `offset` of the bed edge; in Batch D (Stress) closer to the "path"
                  offset = 0.5 if self.difficulty_batch == "D" else 1.5
-                 px = bx + random.uniform(-offset, offset)
-                 py = by + random.uniform(-offset, offset)
-                 self.objects.append(SemanticObject(
-                     id=f"person_{len(self.objects)}",
-                     type=ObjectType.PERSON,
-                     pose=(px, py, random.uniform(0, 6.28)),
-                     size=(0.5, 0.5, 1.7)
-                 ))
+                 window = (bx - 1.0 - offset, by - 0.5 - offset, bx + 1.0 + offset, by + 0.5 + offset)
+                 for px, py in self._placer.place(1, PERSON_RADIUS, min_gap=0.05, window=window):
+                     self.objects.append(SemanticObject(
+                         id=f"person_{len(self.objects)}",
+                         type=ObjectType.PERSON,
+                         pose=(px, py, self.rng.uniform(0, 6.28)),
+                         size=(0.5, 0.5, 1.7)
+                     ))
 
     def _calculate_risk_index(self):
         """
-        Computes scalar Risk Index based on obstacle density and corridor width.
-        Formula: R = (Num_People * 1.0 + Num_Beds * 0.5) / (MapArea/100) + BlindSpotFactor
+        Computes the scalar Risk Index from the world geometry (see WorldRiskAnalyzer):
+        skeleton clearance / narrow-passage fraction, people along the skeleton, and
+        obstacle density. Identical worlds are served from the analyzer's cache.
         """
-        num_people = sum(1 for o in self.objects if o.type == ObjectType.PERSON)
-        num_beds = sum(1 for o in self.objects if o.type == ObjectType.BED)
-        
-        density_score = (num_people * 1.0 + num_beds * 0.5) / ((self.width * self.height) / 100.0)
-        
-        # Corridor Narrowness Factor: 4->0, 3->1, 2->2 (Stress)
-        corridor_w = 4 if self.difficulty_batch == "A" else (2 if self.difficulty_batch == "D" else 3)
-        narrow_factor = (4 - corridor_w) * 2.0
-        
-        self.risk_index = density_score + narrow_factor
+        self.risk_report = RISK_ANALYZER.analyze_generator(self)
+        self.risk_index = self.risk_report.risk_index
 
-    def export_metadata(self, output_path: str):
+    def export_metadata(self, output_path: str, verbose: bool = True):
         data = {
             "objects": [obj.to_dict() for obj in self.objects],
             "meta": {
                 "difficulty_batch": self.difficulty_batch,
+                "seed": self.seed,
                 "risk_index": round(self.risk_index, 2),
+                "risk_features": self.risk_report.to_dict() if self.risk_report else None,
                 "width": self.width,
-                "height": self.height
+                "height": self.height,
+                "resolution": self.resolution
             }
         }
         with open(output_path, 'w') as f:
             json.dump(data, f, indent=2)
-        print(f"Exported {len(self.objects)} objects (Risk Index: {self.risk_index:.2f}) to {output_path}")
+        if verbose:
+            print(f"Exported {len(self.objects)} objects (Risk Index: {self.risk_index:.2f}) to {output_path}")
 
     def export_map(self, output_dir: str):
-         with open(os.path.join(output_dir, "map_layout.txt"), "w") as f:
-             for row in self.map_grid:
-                 f.write("".join(["#" if c == 1 else "." for c in row]) + "\n")
+         # Vectorized: map cells through a byte lookup table, append newlines, write once
+         lut = np.frombuffer(b".#", dtype=np.uint8)
+         chars = lut[(self.grid == OCCUPIED).astype(np.uint8)]
+         newline = np.full((self.grid_height, 1), ord("\n"), dtype=np.uint8)
+         with open(os.path.join(output_dir, "map_layout.txt"), "wb") as f:
+             f.write(np.hstack([chars, newline]).tobytes())
+
+    def save_map_pgm(self, path_base: str):
+        """Saves the grid as a Nav2 map (PGM + YAML), same encoding as src/world_gen."""
+        from PIL import Image
+        
+        # Nav2 standard: occupied=0(black), free=254(white)
+        pgm_data = np.where(self.grid == OCCUPIED, 0, 254).astype(np.uint8)
+        Image.fromarray(np.flipud(pgm_data)).save(f"{path_base}.pgm")
+        
+        with open(f"{path_base}.yaml", 'w') as f:
+            f.write(f"""image: {os.path.basename(path_base)}.pgm
+mode: trinary
+resolution: {self.resolution}
+origin: [0.0, 0.0, 0.0]
+negate: 0
+occupied_thresh: 0.65
+free_thresh: 0.196
+""")
@@ -0,0 +1,161 @@
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt, maximum_filter
+from scipy.spatial import cKDTree
+
+from ..common import rasterize_obbs
+
+OCCUPIED = 100
+_TYPE_CODES = {"bed": 0, "person": 1, "door": 2, "wall": 3}
+
+@dataclass
+class RiskReport:
+    mean_clearance: float   # mean clearance (m) along the free-space skeleton
+    min_clearance: float    # tightest point on the skeleton (m)
+    narrow_fraction: float  # share of the skeleton narrower than `narrow_width`
+    person_density: float   # people near the skeleton per 10 m of skeleton
+    object_density: float   # (people + 0.5 * beds) per 100 m^2
+    risk_index: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {k: round(v, 4) for k, v in asdict(self).items()}
+
+def _object_records(objects: Iterable) -> np.ndarray:
+    """
+    (N, 6) float64 [type_code, x, y, yaw, length, width] from SemanticObjects
+    or flat object dicts (SemanticObject.to_dict() schema).
+    """
+    rows = []
+    for o in objects:
+        if isinstance(o, dict):
+            otype, x, y, yaw, size = o['type'], o['x'], o['y'], o.get('yaw', 0.0), o['size']
+        else:
+            otype, (x, y, yaw), size = o.type, o.pose, o.size
+        rows.append((_TYPE_CODES.get(getattr(otype, "value", otype), -1), x, y, yaw, size[0], size[1]))
+    return np.array(rows, dtype=np.float64).reshape(-1, 6)
+
+def world_hash(grid: np.ndarray, records: np.ndarray, resolution: float) -> str:
+    """Content hash of a world: grid cells + object records + resolution."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(grid.shape, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(grid).tobytes())
+    h.update(np.float64(resolution).tobytes())
+    h.update(np.ascontiguousarray(records).tobytes())
+    return h.hexdigest()
+
+class WorldRiskAnalyzer:
+    """
+    Geometric risk index for a generated world.
+
+    Traversable space is the free grid minus bed footprints. Its clearance field
+    (Euclidean distance transform) is sampled along the skeleton (ridge cells of
+    the clearance field, i.e. corridor/room centerlines) to measure how narrow the
+    passages are, and people are counted along that skeleton with a KD-tree.
+
+        R = object_density + w_narrow * narrow_fraction + w_person * person_density
+
+    Results are cached (LRU) by world content hash, so re-scoring a world is free.
+    """
+    def __init__(self, narrow_width: float = 2.5, person_radius: float = 1.5,
+                 w_narrow: float = 4.0, w_person: float = 1.0, cache_size: int = 4096):
+        self.narrow_width = narrow_width
+        self.person_radius = person_radius
+        self.w_narrow = w_narrow
+        self.w_person = w_person
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, RiskReport]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, grid: np.ndarray, objects: Iterable, resolution: float = 1.0) -> RiskReport:
+        records = _object_records(objects)
+        key = world_hash(grid, records, resolution)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self.misses += 1
+        report = self._compute(grid, records, resolution)
+        self._cache[key] = report
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return report
+
+    def analyze_generator(self, gen) -> RiskReport:
+        return self.analyze(gen.grid, gen.objects, gen.resolution)
+
+    def _compute(self, grid: np.ndarray, records: np.ndarray, resolution: float) -> RiskReport:
+        beds = records[records[:, 0] == _TYPE_CODES["bed"]]
+        people = records[records[:, 0] == _TYPE_CODES["person"]]
+
+        blocked = np.asarray(grid) >= OCCUPIED
+        rasterize_obbs(blocked.shape, resolution, beds[:, 1:3], beds[:, 4:6] / 2.0, beds[:, 3], out=blocked)
+        free = ~blocked
+
+        # Clearance (m) from each free cell center to the nearest obstacle cell edge
+        clearance = distance_transform_edt(free) * resolution - 0.5 * resolution
+        clearance[blocked] = 0.0
+
+        # Skeleton: free cells that are local maxima of the clearance field
+        skeleton = free & (clearance >= maximum_filter(clearance, size=3))
+        skel_clear = clearance[skeleton]
+
+        h, w = grid.shape
+        area_100 = (h * w * resolution**2) / 100.0
+        object_density = (len(people) * 1.0 + len(beds) * 0.5) / area_100
+
+        if skel_clear.size == 0:
+            narrow_fraction, mean_c, min_c, person_density = 1.0, 0.0, 0.0, 0.0
+        else:
+            narrow_fraction = float(np.mean(2.0 * skel_clear < self.narrow_width))
+            mean_c, min_c = float(skel_clear.mean()), float(skel_clear.min())
+            person_density = 0.0
+            if len(people):
+                rows, cols = np.nonzero(skeleton)
+                pts = np.column_stack([(cols + 0.5) * resolution, (rows + 0.5) * resolution])
+                # People within person_radius of any skeleton cell
+                d, _ = cKDTree(pts).query(people[:, 1:3], distance_upper_bound=self.person_radius)
+                skeleton_length = skel_clear.size * resolution
+                person_density = float(np.isfinite(d).sum()) / (skeleton_length / 10.0)
+
+        risk = object_density + self.w_narrow * narrow_fraction + self.w_person * person_density
+        return RiskReport(mean_c, min_c, narrow_fraction, person_density, object_density, risk)
+
+# ---------------------------------------------------------------------------
+# Bulk scoring for benchmark batches
+# ---------------------------------------------------------------------------
+
+_worker_analyzer: Optional[WorldRiskAnalyzer] = None
+
+def _score_in_worker(world: Dict) -> RiskReport:
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = WorldRiskAnalyzer()
+    return _worker_analyzer.analyze(world['grid'], world['objects'], world.get('resolution', 1.0))
+
+def score_worlds(worlds: Sequence[Dict], workers: Optional[int] = None, chunksize: int = 64,
+                 analyzer: Optional[WorldRiskAnalyzer] = None) -> List[RiskReport]:
+    """
+    Scores many worlds ({'grid', 'objects', 'resolution'} dicts).
+    workers: None = all cores, 0/1 = in-process using `analyzer` (and its cache).
+    """
+    workers = os.cpu_count() if workers is None else workers
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_score_in_worker, worlds, chunksize=chunksize))
+    analyzer = analyzer or WorldRiskAnalyzer()
+    return [analyzer.analyze(w['grid'], w['objects'], w.get('resolution', 1.0)) for w in worlds]
+
+def stratify(reports: Sequence[RiskReport], labels: Sequence[str] = ("A", "B", "C", "D")) -> List[str]:
+    """Assigns each world to a risk stratum by risk-index quantile (equal-sized strata)."""
+    risks = np.array([r.risk_index for r in reports])
+    ranks = np.argsort(np.argsort(risks, kind="stable"), kind="stable")
+    bins = ranks * len(labels) // max(len(risks), 1)
+    return [labels[b] for b in bins]
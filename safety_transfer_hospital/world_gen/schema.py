@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Tuple, Dict, Any
 
+from ..common import DEFAULT_THRESHOLDS
+
 class ObjectType(str, Enum):
     BED = "bed"
     PERSON = "person"
@@ -14,13 +16,11 @@ class SafetyThresholds:
     d_crit: float  # Red zone distance (meters)
 
 # Define the Sim-Truth Safety Standards for Year 1
-# These values are the "God's Eye" truth used for evaluation.
+# These values are the "God's Eye" truth used for evaluation. They live in the shared
+# threshold registry (src/metrics/thresholds.py) so every evaluator labels zones alike.
+THRESHOLDS = DEFAULT_THRESHOLDS
 SAFETY_STANDARDS: Dict[ObjectType, SafetyThresholds] = {
-    ObjectType.BED: SafetyThresholds(d_warn=0.8, d_crit=0.5),
-    ObjectType.PERSON: SafetyThresholds(d_warn=1.2, d_crit=0.7),
-    ObjectType.DOOR: SafetyThresholds(d_warn=0.6, d_crit=0.3),
-    # Walls generally handled by static map costmap, but can have a safety margin
-    ObjectType.WALL: SafetyThresholds(d_warn=0.4, d_crit=0.2),
+    t: SafetyThresholds(d_warn=THRESHOLDS.warn_of(t), d_crit=THRESHOLDS.crit_of(t)) for t in ObjectType
 }
 
 @dataclass
@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 @dataclass
 class AdvancedMetricResult:
@@ -62,21 +62,94 @@ class AdvancedSafetyMetrics:
         if 'd_person' in log_df.columns: # Assuming augmentation
             dists = log_df['d_person'].values
             
-            for i, d in enumerate(dists):
-                vel = max(0.01, v[i]) # Avoid div zero
-                stop_dist = (vel**2) / (2 * self.mu * self.g)
-                
-                # TTP: How much time do I have to hit the brakes?
-                # If d > stop_dist, I have (d - stop_dist) / vel seconds?
-                # Actually TTP usually means: Time until a decision MUST be made to avoid collision.
-                # Simplification: TTP = (d - stop_dist) / vel
-                
-                if d < stop_dist:
-                    ttp = 0.0 # Already past point of no return (if friction is strictly limited)
-                else:
-                    ttp = (d - stop_dist) / vel
-                    
-                if ttp < min_ttp:
-                    min_ttp = ttp
+            # TTP: How much time do I have to hit the brakes?
+            # Simplification: TTP = (d - stop_dist) / vel, 0 if already past the point of no return
+            vel = np.maximum(0.01, v) # Avoid div zero
+            ttp = self.time_to_preempt(dists, vel)
+            if len(ttp):
+                min_ttp = float(np.min(ttp))
         
         return AdvancedMetricResult(dmr=dmr, aj_score=aj_score, min_ttp=min_ttp)
+
+    def time_to_preempt(self, d: np.ndarray, speed: np.ndarray) -> np.ndarray:
+        """
+        Vectorized TTP = (d - v^2 / (2 mu g)) / v; 0 inside the stopping distance,
+        inf when not approaching (speed <= 0) or no object (d = inf).
+        """
+        d = np.asarray(d, dtype=np.float64)
+        speed = np.asarray(speed, dtype=np.float64)
+        stop_dist = speed**2 / (2 * self.mu * self.g)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ttp = np.where(d < stop_dist, 0.0, (d - stop_dist) / speed)
+        return np.where((speed > 0) & np.isfinite(d), ttp, np.inf)
+
+    def compute_timeline(self, log_df: pd.DataFrame, objects: Optional[List[Dict]] = None,
+                         crowd=None, types: Tuple[str, ...] = ("bed", "person", "door")) -> "SafetyTimeline":
+        """
+        Per-step TTP and TTC for every object type, vectorized over the whole log.
+
+        Distances come from 'd_<type>' columns when present (e.g. SafetyEvaluator step
+        details), otherwise from SafetyEvaluator(objects, crowd=crowd).distance_timeline.
+        The closing speed is the backward-difference range rate -dd/dt, so moving
+        pedestrians (time-indexed distances) contribute their own velocity. Rows of an
+        optional 'episode' column are never differenced across episode boundaries,
+        so a concatenated dataset of millions of steps is handled in one pass.
+
+            TTC = d / closing_speed          (inf when not closing)
+            TTP = (d - v_c^2 / (2 mu g)) / v_c
+        """
+        t = log_df['t'].to_numpy(dtype=np.float64)
+        if all(f"d_{k}" in log_df.columns for k in types):
+            dists = {k: log_df[f"d_{k}"].to_numpy(dtype=np.float64) for k in types}
+        else:
+            from .safety_evaluator import SafetyEvaluator
+            timeline = SafetyEvaluator(objects or [], crowd=crowd).distance_timeline(log_df)
+            dists = {k: timeline[k] for k in types}
+
+        # Valid backward differences: same episode and increasing time
+        dt = np.diff(t, prepend=np.nan)
+        valid = dt > 0
+        if 'episode' in log_df.columns:
+            ep = log_df['episode'].to_numpy()
+            valid[1:] &= ep[1:] == ep[:-1]
+        valid[0] = False
+
+        ttp, ttc = {}, {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k, d in dists.items():
+                dd = np.diff(d, prepend=np.nan)
+                ok = valid & np.isfinite(dd)
+                closing = np.where(ok, -dd / np.where(ok, dt, 1.0), 0.0)
+                ttc[k] = np.where(closing > 0, d / closing, np.inf)
+                ttp[k] = self.time_to_preempt(d, closing)
+
+        return SafetyTimeline(
+            t=t, ttp=ttp, ttc=ttc,
+            ttp_min=np.min(np.stack(list(ttp.values())), axis=0),
+            ttc_min=np.min(np.stack(list(ttc.values())), axis=0),
+        )
+
+@dataclass
+class SafetyTimeline:
+    t: np.ndarray
+    ttp: Dict[str, np.ndarray]   # per type, per step (s)
+    ttc: Dict[str, np.ndarray]
+    ttp_min: np.ndarray          # min over types, per step
+    ttc_min: np.ndarray
+
+    def summary(self, percentiles: Tuple[float, ...] = (1, 5, 50)) -> Dict[str, float]:
+        """
+        Dataset-style KPIs: min and low percentiles of TTP/TTC over the steps where the
+        value is finite, plus the fraction of steps with a finite (approaching) value.
+        """
+        out = {}
+        for name, series in (("ttp", self.ttp_min), ("ttc", self.ttc_min),
+                             *((f"ttp_{k}", v) for k, v in self.ttp.items()),
+                             *((f"ttc_{k}", v) for k, v in self.ttc.items())):
+            finite = series[np.isfinite(series)]
+            out[f"{name}_finite_frac"] = len(finite) / max(len(series), 1)
+            out[f"{name}_min"] = float(finite.min()) if len(finite) else float('inf')
+            pct = np.percentile(finite, percentiles) if len(finite) else np.full(len(percentiles), np.inf)
+            for p, val in zip(percentiles, pct):
+                out[f"{name}_p{p:g}"] = float(val)
+        return out
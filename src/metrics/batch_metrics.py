@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from .advanced_safety import AdvancedSafetyMetrics
+
+@dataclass
+class EpisodeBatch:
+    """
+    Ragged layout of many episode logs: every column is one flat array and episode e
+    occupies rows offsets[e]:offsets[e + 1].
+    """
+    columns: Dict[str, np.ndarray]
+    offsets: np.ndarray          # (E + 1,) int64
+    episode_ids: np.ndarray      # (E,)
+
+    @property
+    def num_episodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[pd.DataFrame], episode_ids: Optional[Sequence] = None,
+                    columns: Sequence[str] = ("t", "v_lin", "d_person")) -> "EpisodeBatch":
+        """Concatenates per-episode logs (columns missing from a log are filled with inf)."""
+        lengths = np.array([len(f) for f in frames], dtype=np.int64)
+        if np.any(lengths == 0):
+            raise ValueError("EpisodeBatch: empty episode logs are not supported")
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        flat = {}
+        for c in columns:
+            if not any(c in f.columns for f in frames):
+                continue
+            flat[c] = np.concatenate([f[c].to_numpy(dtype=np.float64) if c in f.columns else np.full(len(f), np.inf)
+                                      for f in frames])
+        ids = np.arange(len(frames)) if episode_ids is None else np.asarray(episode_ids)
+        return cls(flat, offsets, ids)
+
+    @classmethod
+    def from_flat(cls, df: pd.DataFrame, episode_col: str = "episode") -> "EpisodeBatch":
+        """Wraps an already concatenated log whose rows are grouped by `episode_col`."""
+        ep = df[episode_col].to_numpy()
+        starts = np.flatnonzero(np.concatenate([[True], ep[1:] != ep[:-1]]))
+        offsets = np.concatenate([starts, [len(df)]]).astype(np.int64)
+        columns = {c: df[c].to_numpy(dtype=np.float64) for c in df.columns
+                   if c != episode_col and np.issubdtype(df[c].dtype, np.number)}
+        return cls(columns, offsets, ep[starts])
+
+def segmented_gradient(f: np.ndarray, t: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    np.gradient(f, t) applied independently to every episode of a ragged array, with
+    true non-uniform spacing: second-order central differences inside an episode,
+    one-sided differences at its first/last row, 0 for single-row episodes.
+    """
+    n = len(f)
+    first = np.zeros(n, dtype=bool)
+    last = np.zeros(n, dtype=bool)
+    first[offsets[:-1]] = True
+    last[offsets[1:] - 1] = True
+
+    hs = np.empty(n); hs[0] = np.nan; hs[1:] = np.diff(t)     # spacing to previous row
+    hd = np.empty(n); hd[-1] = np.nan; hd[:-1] = np.diff(t)   # spacing to next row
+    f_prev = np.roll(f, 1)
+    f_next = np.roll(f, -1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        central = (hs**2 * f_next + (hd**2 - hs**2) * f - hd**2 * f_prev) / (hs * hd * (hs + hd))
+        forward = (f_next - f) / hd
+        backward = (f - f_prev) / hs
+    g = np.where(first, forward, np.where(last, backward, central))
+    g[first & last] = 0.0
+    return np.nan_to_num(g, nan=0.0, posinf=0.0, neginf=0.0)  # duplicate timestamps
+
+class BatchedSafetyMetrics:
+    """
+    Dataset-level AdvancedSafetyMetrics: one call computes Action Jitter, DMR and
+    min TTP for every episode of an EpisodeBatch using segmented reductions
+    (np.add.reduceat / np.minimum.reduceat) over the flat arrays.
+
+    Jerk uses the true timestamps (segmented_gradient). The jitter energy integrates
+    jerk^2 with per-sample time weights (half the surrounding intervals, one full
+    interval at the episode ends), which equals compute_metrics' sum(jerk^2) * avg_dt
+    for uniformly sampled logs.
+    """
+    def __init__(self, metrics: Optional[AdvancedSafetyMetrics] = None):
+        self.metrics = metrics or AdvancedSafetyMetrics()
+
+    def compute(self, batch: Union[EpisodeBatch, Sequence[pd.DataFrame]],
+                deadline_s: Optional[Union[float, np.ndarray]] = None) -> pd.DataFrame:
+        if not isinstance(batch, EpisodeBatch):
+            batch = EpisodeBatch.from_frames(batch)
+        t, v = batch.columns["t"], batch.columns["v_lin"]
+        offsets = batch.offsets
+        starts = offsets[:-1]
+        ends = offsets[1:] - 1
+        lengths = batch.lengths
+
+        # 1. Action Jitter with non-uniform spacing
+        accel = segmented_gradient(v, t, offsets)
+        jerk = segmented_gradient(accel, t, offsets)
+        first = np.zeros(len(t), dtype=bool); first[starts] = True
+        last = np.zeros(len(t), dtype=bool); last[ends] = True
+        gaps = np.diff(t)
+        prev_gap = np.concatenate([[0.0], gaps])
+        next_gap = np.concatenate([gaps, [0.0]])
+        weight = np.where(first, next_gap, np.where(last, prev_gap, 0.5 * (prev_gap + next_gap)))
+        weight[first & last] = 0.0
+
+        duration = t[ends] - t[starts]
+        energy = np.add.reduceat(jerk**2 * weight, starts)
+        aj_score = energy / (duration + 1e-6)
+
+        # 2. Deadline Miss Rate: final timestamp past the (per-episode) deadline
+        dmr = np.zeros(batch.num_episodes)
+        if deadline_s is not None:
+            dmr = (t[ends] > np.asarray(deadline_s, dtype=np.float64)).astype(np.float64)
+
+        # 3. Minimum Time-to-Preempt per episode (same definition as compute_metrics)
+        min_ttp = np.full(batch.num_episodes, np.inf)
+        if "d_person" in batch.columns:
+            ttp = self.metrics.time_to_preempt(batch.columns["d_person"], np.maximum(0.01, v))
+            min_ttp = np.minimum.reduceat(ttp, starts)
+
+        return pd.DataFrame({
+            "episode": batch.episode_ids,
+            "steps": lengths,
+            "duration": duration,
+            "dmr": dmr,
+            "aj_score": aj_score,
+            "min_ttp": min_ttp,
+        })
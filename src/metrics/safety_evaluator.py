@@ -4,110 +4,88 @@ import pandas as pd
 from typing import List, Dict, Tuple
 from dataclasses import dataclass
 
+from .thresholds import AMBER, DEFAULT_THRESHOLDS, RED, ThresholdRegistry, ZONE_NAMES
+
 @dataclass
 class SafetyConfig:
     # {object_type: {'crit': float, 'warn': float}}
     thresholds: Dict[str, Dict[str, float]]
 
 class SafetyEvaluator:
-    def __init__(self, objects: List[Dict], config: SafetyConfig = None):
+    def __init__(self, objects: List[Dict], config: SafetyConfig = None, crowd=None):
         """
         Args:
             objects: List of object dicts [{'type', 'pose': {'x', 'y' ...}, 'dims': ...}]
             config: Thresholds for safety zones
+            crowd: Optional TrajectoryBuffer of moving pedestrians (src/simulation/crowd.py);
+                   'person' distances then use their pose at each log timestamp. The crowd
+                   is then the only source of people: static 'person' objects (the walkers'
+                   spawn points, see CrowdSimulator.from_world) are ignored.
         """
         self.objects = objects
+        self.crowd = crowd
         if config is None:
-            # Default from BENCHMARK_SPEC.md
-            self.config = SafetyConfig(thresholds={
-                "bed": {"crit": 0.4, "warn": 0.8},
-                "person": {"crit": 0.5, "warn": 1.2},
-                "door": {"crit": 0.3, "warn": 0.6}
-            })
+            # Default from BENCHMARK_SPEC.md (shared registry, src/metrics/thresholds.py)
+            self.config = SafetyConfig(thresholds=DEFAULT_THRESHOLDS.to_config())
         else:
             self.config = config
+        self.registry = ThresholdRegistry.from_config(self.config.thresholds)
+        static = objects
+        if crowd is not None:
+            static = [o for o in objects if getattr(o['type'], "value", o['type']) != "person"]
+        # Per-object 'safety_d_crit' / 'safety_d_warn' override the type thresholds unless
+        # they are just the schema defaults (ThresholdRegistry.compile_objects)
+        self._compiled = self.registry.compile_objects(static)
+
+    def _timeline(self, log_df: pd.DataFrame, chunk: int = 4096) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Nearest distance and worst zone code per type at every log step."""
+        rx = log_df['x'].to_numpy(dtype=np.float64)
+        ry = log_df['y'].to_numpy(dtype=np.float64)
+        timeline, zones = self.registry.nearest(rx, ry, self._compiled, chunk=chunk)
+
+        if self.crowd is not None:
+            moving = self.crowd.min_distance(log_df['t'].to_numpy(), rx, ry)
+            timeline["person"] = np.minimum(timeline["person"], moving)
+            zones["person"] = np.maximum(zones["person"], self.registry.label(moving, self.registry.code("person")))
+        return timeline, zones
+
+    def distance_timeline(self, log_df: pd.DataFrame, chunk: int = 4096) -> Dict[str, np.ndarray]:
+        """
+        Distance from the robot to the nearest object of each type at every log step,
+        computed in batch (chunked (T, M) arrays). Center-to-center, per BENCHMARK_SPEC
+        "d_i(t) = distance(Robot, O_i)". Static objects come from self.objects; moving
+        pedestrians from self.crowd at the matching timestamp.
+        """
+        return self._timeline(log_df, chunk)[0]
 
     def evaluate_episode(self, log_df: pd.DataFrame) -> Dict:
         """
         Evaluates a full episode log.
         Returns a dictionary of aggregated metrics and a detailed DataFrame with per-step zones.
         """
-        results = []
-        
         total_steps = len(log_df)
-        red_steps = 0
-        amber_steps_moving = 0
-        min_dists = {"bed": float('inf'), "person": float('inf'), "door": float('inf')}
-        
-        dt_est = 0.1 # Estimate if not available, or derive from t
-        
-        step_details = []
 
-        for idx, row in log_df.iterrows():
-            rx, ry = row['x'], row['y']
-            
-            # Distance to nearest of each type
-            d_nearest = {"bed": float('inf'), "person": float('inf'), "door": float('inf')}
-            
-            # Check all objects
-            # Optimization: could use KD-tree, but N is small (<50)
-            for obj in self.objects:
-                otype = obj['type']
-                if otype not in d_nearest: continue
-                
-                ox, oy = obj['pose']['x'], obj['pose']['y']
-                # Simple point distance for now (Project Spec Phase 1)
-                # Ideally box distance, but point-to-point is acceptable for now if radii are large enough
-                dist = math.sqrt((rx - ox)**2 + (ry - oy)**2)
-                
-                # Subtract approximate robot radius? 
-                # Spec says "distance from robot center" implicitly unless specified.
-                # Let's stick to center-to-center for simple ground truth, 
-                # or center-to-object-center. 
-                # BENCHMARK_SPEC says "d_i(t) = distance(Robot, O_i)".
-                
-                if dist < d_nearest[otype]:
-                    d_nearest[otype] = dist
-            
-            # Determine Zone
-            # Green (0), Amber (1), Red (2)
-            # We track the worst zone across all types
-            current_status = "green"
-            
-            in_red = False
-            in_amber = False
-            
-            for otype, dist in d_nearest.items():
-                min_dists[otype] = min(min_dists[otype], dist)
-                
-                thresholds = self.config.thresholds.get(otype)
-                if not thresholds: continue
-                
-                if dist < thresholds['crit']:
-                    in_red = True
-                    current_status = "red"
-                elif dist < thresholds['warn'] and not in_red:
-                    in_amber = True
-                    if current_status != "red":
-                        current_status = "amber"
-            
-            # Aggregation
-            if in_red:
-                red_steps += 1
-            
-            if in_amber:
-                # Check if moving
-                v_lin = row['v_lin']
-                if abs(v_lin) > 0.05: # moving
-                    amber_steps_moving += 1
-            
-            step_details.append({
-                "t": row['t'],
-                "status": current_status,
-                "d_bed": d_nearest['bed'],
-                "d_person": d_nearest['person'],
-                "d_door": d_nearest['door']
-            })
+        # Distance to nearest of each type and zone codes, for all steps at once.
+        # Green (0), Amber (1), Red (2); we track the worst zone across all types.
+        timeline, zones = self._timeline(log_df)
+        worst = np.max(np.stack(list(zones.values())), axis=0) if total_steps else np.zeros(0, dtype=np.int8)
+
+        in_red = worst == RED
+        # Amber only counts when no type is red; moving means |v_lin| > 0.05
+        in_amber = worst == AMBER
+        moving = np.abs(log_df['v_lin'].to_numpy(dtype=np.float64)) > 0.05
+
+        red_steps = int(in_red.sum())
+        amber_steps_moving = int((in_amber & moving).sum())
+        min_dists = {otype: float(d.min()) if total_steps else float('inf') for otype, d in timeline.items()}
+
+        step_details = pd.DataFrame({
+            "t": log_df['t'].to_numpy(),
+            "status": ZONE_NAMES[worst],
+            "d_bed": timeline['bed'],
+            "d_person": timeline['person'],
+            "d_door": timeline['door'],
+        })
 
         # Final Metrics
         svr = red_steps / total_steps if total_steps > 0 else 0.0
@@ -126,4 +104,4 @@ class SafetyEvaluator:
             "Total_Steps": total_steps
         }
         
-        return metrics, pd.DataFrame(step_details)
+        return metrics, step_details
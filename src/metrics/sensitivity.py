@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+from .thresholds import DEFAULT_THRESHOLDS, ThresholdRegistry
+
+@dataclass
+class SensitivitySurface:
+    """
+    SVR / NVT over a grid of thresholds. svr[i] is the red-step rate at crit[i];
+    nvt[i, j] the amber-while-moving step rate at (crit[i], warn[j]). Rates are over all
+    pooled steps, as in SafetyEvaluator (Red_Steps / Amber_Moving_Steps per step).
+    """
+    crit: np.ndarray   # (C,)
+    warn: np.ndarray   # (W,)
+    svr: np.ndarray    # (C,)
+    nvt: np.ndarray    # (C, W)
+    steps: int
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format: one row per (crit, warn) pair."""
+        c, w = np.meshgrid(self.crit, self.warn, indexing="ij")
+        return pd.DataFrame({
+            "crit": c.ravel(),
+            "warn": w.ravel(),
+            "svr": np.repeat(self.svr, len(self.warn)),
+            "nvt": self.nvt.ravel(),
+        })
+
+class ThresholdSweep:
+    """
+    Threshold sensitivity analysis without re-evaluating episodes.
+
+    Zone labels depend only on the per-step nearest distances, so those are computed
+    once (SafetyEvaluator.distance_timeline) and every threshold variant is answered
+    from sorted distances with np.searchsorted / cumulative counts:
+
+      sweep_type(otype, crit, warn)  one type's (d_crit, d_warn) on a grid, others nominal
+      sweep_scale(crit_s, warn_s)    all radii scaled (BENCHMARK_SPEC robustness protocol)
+
+    A grid of C x W pairs costs O(N log N + (C + W) log N) for sweep_type and
+    O(N log N + C * W) for sweep_scale instead of C * W evaluations of N steps.
+    Per-object threshold overrides are not applied; the sweep replaces type thresholds.
+    """
+    def __init__(self, distances: Dict[str, np.ndarray], v_lin: Optional[np.ndarray] = None,
+                 registry: ThresholdRegistry = DEFAULT_THRESHOLDS):
+        self.registry = registry
+        self.types = [t for t in distances if registry.code(t) != registry.unknown]
+        self.d = np.stack([np.asarray(distances[t], dtype=np.float64) for t in self.types]) \
+            if self.types else np.zeros((0, len(v_lin) if v_lin is not None else 0))
+        self.n = self.d.shape[1]
+        # Moving as in SafetyEvaluator; without velocities every step counts
+        self.moving = np.ones(self.n, dtype=bool) if v_lin is None else np.abs(np.asarray(v_lin)) > 0.05
+        codes = registry.encode(self.types)
+        self.crit = registry.crit[codes]
+        self.warn = registry.warn[codes]
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[pd.DataFrame], types: Sequence[str] = ("bed", "person", "door"),
+                    registry: ThresholdRegistry = DEFAULT_THRESHOLDS) -> "ThresholdSweep":
+        """From logs that already carry d_<type> columns (e.g. evaluator step details)."""
+        frames = list(frames)
+        distances = {t: np.concatenate([f[f"d_{t}"].to_numpy(dtype=np.float64) for f in frames])
+                     for t in types if all(f"d_{t}" in f.columns for f in frames)}
+        v_lin = None
+        if frames and all('v_lin' in f.columns for f in frames):
+            v_lin = np.concatenate([f['v_lin'].to_numpy(dtype=np.float64) for f in frames])
+        return cls(distances, v_lin, registry)
+
+    @classmethod
+    def from_episodes(cls, logs: Sequence[pd.DataFrame], evaluator,
+                      registry: ThresholdRegistry = DEFAULT_THRESHOLDS) -> "ThresholdSweep":
+        """Computes each episode's distance timeline once with a SafetyEvaluator."""
+        timelines = [evaluator.distance_timeline(log) for log in logs]
+        distances = {t: np.concatenate([tl[t] for tl in timelines]) for t in timelines[0]} if timelines else {}
+        v_lin = np.concatenate([log['v_lin'].to_numpy(dtype=np.float64) for log in logs]) if logs else None
+        return cls(distances, v_lin, registry)
+
+    def _rates(self, counts: np.ndarray) -> np.ndarray:
+        return counts / self.n if self.n else np.zeros(counts.shape)
+
+    def sweep_type(self, otype: str, crit: Sequence[float], warn: Sequence[float]) -> SensitivitySurface:
+        """Varies one type's (d_crit, d_warn); the other types keep their nominal thresholds."""
+        crit = np.asarray(crit, dtype=np.float64)
+        warn = np.asarray(warn, dtype=np.float64)
+        k = self.types.index(otype)
+        others = np.arange(len(self.types)) != k
+        d_k = self.d[k]
+        other_red = np.any(self.d[others] < self.crit[others, None], axis=0)
+        other_amber = np.any(self.d[others] < self.warn[others, None], axis=0)
+
+        # Red: other type red, or d_k < crit
+        free = np.sort(d_k[~other_red])
+        red = other_red.sum() + np.searchsorted(free, crit, side="left")
+
+        # Amber (not red) while moving: d_k >= crit and (d_k < warn or another type amber)
+        s = self.moving & ~other_red
+        d_a = np.sort(d_k[s & other_amber])
+        d_n = np.sort(d_k[s & ~other_amber])
+        amber_a = len(d_a) - np.searchsorted(d_a, crit, side="left")
+        amber_n = np.searchsorted(d_n, warn, side="left")[None, :] - np.searchsorted(d_n, crit, side="left")[:, None]
+        nvt = amber_a[:, None] + np.maximum(amber_n, 0)
+        return SensitivitySurface(crit, warn, self._rates(red), self._rates(nvt), self.n)
+
+    def sweep_scale(self, crit_scales: Sequence[float],
+                    warn_scales: Optional[Sequence[float]] = None) -> SensitivitySurface:
+        """
+        Scales every type's d_crit by crit_scales[i] and d_warn by warn_scales[j]
+        (default: the same factors). A step is red at scale a iff min_k d_k / crit_k < a,
+        so SVR is a searchsorted on that ratio; NVT(a, b) counts moving steps with
+        crit ratio >= a and warn ratio < b via a 2D histogram and cumulative sums.
+        """
+        a = np.asarray(crit_scales, dtype=np.float64)
+        b = a if warn_scales is None else np.asarray(warn_scales, dtype=np.float64)
+        a_order, b_order = np.argsort(a), np.argsort(b)
+        a_sorted, b_sorted = a[a_order], b[b_order]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_crit = np.min(self.d / self.crit[:, None], axis=0, initial=np.inf)
+            r_warn = np.min(self.d / self.warn[:, None], axis=0, initial=np.inf)
+
+        red = np.searchsorted(np.sort(r_crit), a, side="left")
+
+        # ia: number of scales a <= r_crit (not red for those); ib: first scale b > r_warn
+        ia = np.searchsorted(a_sorted, r_crit[self.moving], side="right")
+        ib = np.searchsorted(b_sorted, r_warn[self.moving], side="right")
+        hist = np.bincount(ia * (len(b) + 1) + ib, minlength=(len(a) + 1) * (len(b) + 1))
+        hist = hist.reshape(len(a) + 1, len(b) + 1)
+        # counts[i, j] = #{ia > i and ib <= j}
+        counts = np.cumsum(np.cumsum(hist[::-1], axis=0)[::-1], axis=1)[1:, :-1]
+        nvt = np.empty((len(a), len(b)), dtype=np.int64)
+        nvt[np.ix_(a_order, b_order)] = counts
+        return SensitivitySurface(a, b, self._rates(red), self._rates(nvt), self.n)
@@ -0,0 +1,137 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Zone codes: max() over zones is the worst zone
+GREEN, AMBER, RED = 0, 1, 2
+ZONE_NAMES = np.array(["green", "amber", "red"])
+
+# Sim-Truth standards (docs/BENCHMARK_SPEC.md, section 2): type -> (d_crit, d_warn) in meters
+BENCHMARK_THRESHOLDS: Dict[str, Tuple[float, float]] = {
+    "bed": (0.5, 0.8),
+    "person": (0.7, 1.2),
+    "door": (0.3, 0.6),
+    # Walls are mostly handled by the static costmap, but keep a small margin
+    "wall": (0.2, 0.4),
+}
+
+class ThresholdRegistry:
+    """
+    Single source of safety-zone thresholds, compiled into dense lookup tables.
+
+    Object types map to integer codes; `crit[code]` / `warn[code]` are float64 arrays,
+    so labelling any number of distances is one fancy-index plus two comparisons:
+
+        zone = max(d < warn[code], 2 * (d < crit[code]))      # GREEN / AMBER / RED
+
+    The last code is reserved for unknown types (thresholds -inf: always green).
+    Per-object overrides (e.g. 'safety_d_crit' in flat object dicts) are compiled
+    into per-object threshold arrays by compile_objects(); values equal to the schema
+    default for the type are not overrides (see compile_objects).
+    """
+    def __init__(self, thresholds: Optional[Dict[str, Tuple[float, float]]] = None):
+        thresholds = BENCHMARK_THRESHOLDS if thresholds is None else thresholds
+        self.types: List[str] = list(thresholds)
+        self.codes: Dict[str, int] = {t: i for i, t in enumerate(self.types)}
+        self.unknown = len(self.types)
+        self.crit = np.array([thresholds[t][0] for t in self.types] + [-np.inf], dtype=np.float64)
+        self.warn = np.array([thresholds[t][1] for t in self.types] + [-np.inf], dtype=np.float64)
+
+    @classmethod
+    def from_config(cls, thresholds: Dict[str, Dict[str, float]]) -> "ThresholdRegistry":
+        """From the SafetyConfig layout {type: {'crit': .., 'warn': ..}}."""
+        return cls({t: (v['crit'], v['warn']) for t, v in thresholds.items()})
+
+    def to_config(self) -> Dict[str, Dict[str, float]]:
+        return {t: {"crit": float(self.crit[i]), "warn": float(self.warn[i])} for i, t in enumerate(self.types)}
+
+    def scaled(self, factor: float) -> "ThresholdRegistry":
+        """All radii scaled (BENCHMARK_SPEC sensitivity analysis: +/-20%)."""
+        return ThresholdRegistry({t: (self.crit[i] * factor, self.warn[i] * factor) for i, t in enumerate(self.types)})
+
+    def code(self, otype) -> int:
+        return self.codes.get(getattr(otype, "value", otype), self.unknown)
+
+    def encode(self, types: Iterable) -> np.ndarray:
+        """Type names (or ObjectType members) -> int codes."""
+        return np.array([self.code(t) for t in types], dtype=np.int64)
+
+    def crit_of(self, otype) -> float:
+        return float(self.crit[self.code(otype)])
+
+    def warn_of(self, otype) -> float:
+        return float(self.warn[self.code(otype)])
+
+    def label(self, d: np.ndarray, codes, crit: Optional[np.ndarray] = None,
+              warn: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Zone codes for distances `d` of objects with type `codes` (broadcastable).
+        Pass per-object `crit`/`warn` arrays (from compile_objects) to apply overrides.
+        """
+        d = np.asarray(d, dtype=np.float64)
+        crit = self.crit[codes] if crit is None else crit
+        warn = self.warn[codes] if warn is None else warn
+        return np.maximum((d < warn).astype(np.int8), RED * (d < crit).astype(np.int8))
+
+    def compile_objects(self, objects: Sequence[Dict],
+                        schema_defaults: Optional["ThresholdRegistry"] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-object arrays: xy (M, 2), type (M,) names, code (M,), crit (M,), warn (M,).
+        Accepts pose-dict or flat objects. Types without thresholds in this registry all
+        share the `unknown` code, so select objects by `type`, not by `code`.
+
+        Override rule: 'safety_d_crit'/'safety_d_warn' replace this registry's type
+        thresholds for that object only when they differ from the schema default for the
+        type (`schema_defaults`, the benchmark registry by default). Flat-schema objects
+        (SemanticObject.to_dict) carry the schema defaults on every object; those values
+        defer to this registry, so an explicit or scaled config (the +/-20% sensitivity
+        protocol) applies to them. Genuine per-object values are kept as absolute radii.
+        """
+        schema = DEFAULT_THRESHOLDS if schema_defaults is None else schema_defaults
+        m = len(objects)
+        xy = np.empty((m, 2))
+        names = np.array([getattr(o['type'], "value", o['type']) for o in objects], dtype=object)
+        code = np.empty(m, dtype=np.int64)
+        crit_o = np.full(m, np.nan)
+        warn_o = np.full(m, np.nan)
+        for i, o in enumerate(objects):
+            pose = o.get('pose', o)
+            xy[i] = pose['x'], pose['y']
+            code[i] = self.code(o['type'])
+            crit, warn = o.get('safety_d_crit', np.nan), o.get('safety_d_warn', np.nan)
+            crit_o[i] = np.nan if np.isclose(crit, schema.crit_of(o['type']), rtol=0, atol=1e-9) else crit
+            warn_o[i] = np.nan if np.isclose(warn, schema.warn_of(o['type']), rtol=0, atol=1e-9) else warn
+        return {
+            "xy": xy,
+            "type": names,
+            "code": code,
+            "crit": np.where(np.isnan(crit_o), self.crit[code], crit_o),
+            "warn": np.where(np.isnan(warn_o), self.warn[code], warn_o),
+            "override": ~(np.isnan(crit_o) & np.isnan(warn_o)),
+        }
+
+    def nearest(self, rx: np.ndarray, ry: np.ndarray, compiled: Dict[str, np.ndarray],
+                types: Sequence[str] = ("bed", "person", "door"),
+                chunk: int = 4096) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """
+        For every robot position: distance to the nearest object of each type and the
+        worst zone over those objects, each object judged by its own (possibly overridden)
+        thresholds. Computed on chunked (T, M) arrays.
+        """
+        n = len(rx)
+        dist = {t: np.full(n, np.inf) for t in types}
+        zone = {t: np.zeros(n, dtype=np.int8) for t in types}
+        for otype in types:
+            sel = compiled["type"] == getattr(otype, "value", otype)
+            if not sel.any():
+                continue
+            pts = compiled["xy"][sel]
+            crit, warn = compiled["crit"][sel], compiled["warn"][sel]
+            for lo in range(0, n, chunk):
+                dx = rx[lo:lo + chunk, None] - pts[None, :, 0]
+                dy = ry[lo:lo + chunk, None] - pts[None, :, 1]
+                d = np.sqrt(dx * dx + dy * dy)
+                dist[otype][lo:lo + chunk] = d.min(axis=1)
+                zone[otype][lo:lo + chunk] = self.label(d, None, crit, warn).max(axis=1)
+        return dist, zone
+
+DEFAULT_THRESHOLDS = ThresholdRegistry()
@@ -18,6 +18,9 @@ class PolicyParams:
     # If k_safe is low, we slow down early (conservative)
     k_safe_bed: float = 5.0
     k_safe_person: float = 5.0
+
+# Column order of the distance matrix consumed by ConstrainedPolicy.get_actions
+DIST_COLUMNS = ("bed", "person")
     
 class LagrangianOptimizer:
     def __init__(self, target_cost: float = 0.05, lr: float = 0.1):
@@ -55,7 +58,8 @@ class ConstrainedPolicy:
         dx = gx - rx
         dy = gy - ry
         dist = math.sqrt(dx**2 + dy**2)
-        target_ang = math.atan2(dy, dx)
+        # np.arctan2/np.exp (not math.*) so get_actions() is bit-compatible
+        target_ang = float(np.arctan2(dy, dx))
         ang_diff = target_ang - rt
         while ang_diff > math.pi: ang_diff -= 2*math.pi
         while ang_diff < -math.pi: ang_diff += 2*math.pi
@@ -75,11 +79,11 @@ class ConstrainedPolicy:
         # If dist large, factor ~ 1. If dist -> 0, factor -> 0.
         # k_safe controls how steep the drop is.
         # factor = 1 - exp(-k * d) is good. 0 at d=0, 1 at inf.
-        factor_bed = 1.0 - math.exp(-self.params.k_safe_bed * d_bed)
+        factor_bed = 1.0 - float(np.exp(-self.params.k_safe_bed * d_bed))
         
         # Person Factor
         d_person = nearest_dists.get('person', float('inf'))
-        factor_person = 1.0 - math.exp(-self.params.k_safe_person * d_person)
+        factor_person = 1.0 - float(np.exp(-self.params.k_safe_person * d_person))
         
         # Final Safety Factor (conservative: take min)
         safety_factor = min(factor_bed, factor_person)
@@ -90,6 +94,52 @@ class ConstrainedPolicy:
         v_lin = v_lin * safety_factor
         
         return v_lin, v_ang
+
+    def get_actions(self, states: np.ndarray, goals: np.ndarray, dist_matrix: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_action for a batch of robots.
+        Bit-compatible with calling get_action() row by row.
+        
+        Args:
+            states: (N, 3) robot poses [x, y, theta]
+            goals: (N, 3) or (3,) goal poses [x, y, theta]
+            dist_matrix: (N, len(DIST_COLUMNS)) nearest distance per type (see DIST_COLUMNS).
+                         NaN/inf marks "no object of this type".
+        Returns:
+            actions: (N, 2) [v_lin, v_ang]
+        """
+        states = np.asarray(states, dtype=np.float64)
+        goals = np.broadcast_to(np.asarray(goals, dtype=np.float64), states.shape)
+        dists = np.asarray(dist_matrix, dtype=np.float64)
+        dists = np.where(np.isnan(dists), np.inf, dists)
+        
+        # 1. Nominal P-Control
+        dx = goals[:, 0] - states[:, 0]
+        dy = goals[:, 1] - states[:, 1]
+        dist = np.sqrt(dx**2 + dy**2)
+        ang_diff = np.arctan2(dy, dx) - states[:, 2]
+        
+        # Wrap by repeated 2*pi steps (same rounding as the scalar while-loops);
+        # only rows still out of range are touched, usually a single pass.
+        two_pi = 2 * math.pi
+        over = np.flatnonzero(ang_diff > math.pi)
+        while over.size:
+            ang_diff[over] -= two_pi
+            over = over[ang_diff[over] > math.pi]
+        under = np.flatnonzero(ang_diff < -math.pi)
+        while under.size:
+            ang_diff[under] += two_pi
+            under = under[ang_diff[under] < -math.pi]
+        
+        v_lin = np.minimum(self.params.max_v, dist * self.params.kp_lin)
+        v_ang = np.clip(ang_diff * self.params.kp_ang, -1.0, 1.0)
+        
+        # 2. Safety Modulation (vectorized barrier factors)
+        k_safe = np.array([self.params.k_safe_bed, self.params.k_safe_person])
+        factors = 1.0 - np.exp(-k_safe * dists[:, :len(DIST_COLUMNS)])
+        safety_factor = np.clip(np.minimum(factors[:, 0], factors[:, 1]), 0.0, 1.0)
+        
+        return np.stack([v_lin * safety_factor, v_ang], axis=-1)
         
     def update_params(self, lambda_val: float):
         """
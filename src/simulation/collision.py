@@ -0,0 +1,77 @@
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from typing import Tuple
+
+# Contact response shared by every kinematic runner (EpisodeRunner, SimulationRunner, RolloutScenario)
+COLLISION_MODES = ("stop", "slide")
+DEFAULT_COLLISION_MODE = "stop"
+
+class GridCollisionChecker:
+    """
+    Disc-footprint vs occupancy-grid collision checks for the kinematic simulators.
+
+    The clearance field is computed once: for each cell center, the center-to-center
+    distance to the nearest occupied cell (map border counted as a wall) minus the
+    half-diagonal of a cell, (sqrt(2)/2) * res. Every point of an occupied cell lies
+    within that half-diagonal of its center, so this is a lower bound on the distance
+    to any occupied point, also towards diagonal corners. A query samples the nearest
+    cell and subtracts the offset to that cell center, which keeps the bound (triangle
+    inequality), so the check never misses a contact. Every query is a vectorized
+    gather, so checking a batch of 1024 robots costs a few array ops.
+    """
+    def __init__(self, grid: np.ndarray, resolution: float, robot_radius: float = 0.2, occupied: int = 100):
+        self.resolution = resolution
+        self.robot_radius = robot_radius
+        h, w = grid.shape
+        free = np.zeros((h + 2, w + 2), dtype=bool)
+        free[1:-1, 1:-1] = np.asarray(grid) < occupied
+        self.clearance = (distance_transform_edt(free)[1:-1, 1:-1] - np.sqrt(0.5)) * resolution
+
+    @classmethod
+    def from_generator(cls, gen, **kwargs) -> "GridCollisionChecker":
+        return cls(gen.grid, gen.resolution, **kwargs)
+
+    def clearance_at(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Lower-bound clearance (m) at points; -inf outside the map."""
+        x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+        h, w = self.clearance.shape
+        col = np.floor(x / self.resolution).astype(np.int64)
+        row = np.floor(y / self.resolution).astype(np.int64)
+        inside = (row >= 0) & (row < h) & (col >= 0) & (col < w)
+        rc, cc = np.clip(row, 0, h - 1), np.clip(col, 0, w - 1)
+        offset = np.hypot(x - (cc + 0.5) * self.resolution, y - (rc + 0.5) * self.resolution)
+        return np.where(inside, self.clearance[rc, cc] - offset, -np.inf)
+
+    def in_collision(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return self.clearance_at(x, y) < self.robot_radius
+
+    def resolve(self, prev_xy: np.ndarray, new_xy: np.ndarray,
+                mode: str = DEFAULT_COLLISION_MODE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies contact response to a batch of proposed moves.
+
+        Args:
+            prev_xy, new_xy: (N, 2) positions before/after the kinematic update.
+            mode: 'stop' keeps colliding robots at their previous position;
+                  'slide' keeps whichever axis-aligned component of the move is free.
+
+        Returns:
+            (resolved (N, 2) positions, (N,) bool collision events)
+        """
+        hit = self.in_collision(new_xy[:, 0], new_xy[:, 1])
+        out = new_xy.copy()
+        if not hit.any():
+            return out, hit
+
+        idx = np.flatnonzero(hit)
+        out[idx] = prev_xy[idx]
+        if mode == "slide":
+            for keep_x in (True, False):
+                cand = np.column_stack([new_xy[idx, 0], prev_xy[idx, 1]]) if keep_x else \
+                       np.column_stack([prev_xy[idx, 0], new_xy[idx, 1]])
+                ok = ~self.in_collision(cand[:, 0], cand[:, 1])
+                out[idx[ok]] = cand[ok]
+                idx = idx[~ok]
+        elif mode != "stop":
+            raise ValueError(f"Unknown collision mode: {mode}")
+        return out, hit
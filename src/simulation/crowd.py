@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from scipy.ndimage import label
+from scipy.spatial import cKDTree
+from typing import Dict, List, Optional
+
+from .collision import GridCollisionChecker
+from .exporters import normalize_objects
+
+@dataclass
+class SocialForceParams:
+    """Helbing/Molnar social-force constants (SI units)."""
+    desired_speed: float = 1.3     # v0 (m/s)
+    relax_time: float = 0.5        # tau (s)
+    max_speed: float = 1.7         # speed cap (m/s)
+    radius: float = 0.25           # pedestrian disc radius (m)
+    A_ped: float = 2.1             # pedestrian repulsion strength (m/s^2)
+    B_ped: float = 0.3             # pedestrian repulsion range (m)
+    anisotropy: float = 0.35       # lambda: weight of interactions behind the walker
+    A_wall: float = 10.0           # wall repulsion strength (m/s^2)
+    B_wall: float = 0.2            # wall repulsion range (m)
+    A_robot: float = 4.0           # robot repulsion strength (m/s^2)
+    B_robot: float = 0.4           # robot repulsion range (m)
+    robot_radius: float = 0.2
+    cutoff: float = 2.0            # neighbor search radius (m)
+    goal_tol: float = 0.3          # distance at which a new goal is drawn (m)
+
+class TrajectoryBuffer:
+    """
+    Columnar (time-major) log of pedestrian states: t (T,), x/y/vx/vy (T, N) float32.
+    Capacity doubles when full, so appending a tick is amortized O(N).
+    """
+    def __init__(self, num_agents: int, capacity: int = 1024):
+        self.num_agents = num_agents
+        self.size = 0
+        self.t = np.empty(capacity, dtype=np.float64)
+        self.columns = {k: np.empty((capacity, num_agents), dtype=np.float32) for k in ("x", "y", "vx", "vy")}
+
+    def append(self, t: float, pos: np.ndarray, vel: np.ndarray):
+        if self.size == len(self.t):
+            self.t = np.resize(self.t, 2 * len(self.t))
+            for k, col in self.columns.items():
+                grown = np.empty((2 * len(col), self.num_agents), dtype=np.float32)
+                grown[:self.size] = col[:self.size]
+                self.columns[k] = grown
+        i = self.size
+        self.t[i] = t
+        self.columns["x"][i], self.columns["y"][i] = pos[:, 0], pos[:, 1]
+        self.columns["vx"][i], self.columns["vy"][i] = vel[:, 0], vel[:, 1]
+        self.size += 1
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.t[:self.size] if key == "t" else self.columns[key][:self.size]
+
+    def frame_index(self, times: np.ndarray) -> np.ndarray:
+        """Index of the latest logged tick at or before each query time (clamped to the log)."""
+        idx = np.searchsorted(self["t"], np.asarray(times, dtype=np.float64) + 1e-9, side="right") - 1
+        return np.clip(idx, 0, self.size - 1)
+
+    def states_at(self, times: np.ndarray) -> Dict[str, np.ndarray]:
+        """Pedestrian x, y, vx, vy at each query time: dict of (len(times), N) arrays."""
+        idx = self.frame_index(times)
+        return {k: col[idx] for k, col in self.columns.items()}
+
+    def min_distance(self, times: np.ndarray, x: np.ndarray, y: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """
+        Time-indexed distance from query points (e.g. robot poses) to the nearest pedestrian.
+        Batched in chunks of rows so (T, N) temporaries stay bounded.
+        """
+        times, x, y = (np.asarray(a, dtype=np.float64) for a in (times, x, y))
+        out = np.full(len(times), np.inf)
+        if self.size == 0 or self.num_agents == 0:
+            return out
+        for lo in range(0, len(times), chunk):
+            idx = self.frame_index(times[lo:lo + chunk])
+            dx = self.columns["x"][idx] - x[lo:lo + chunk, None]
+            dy = self.columns["y"][idx] - y[lo:lo + chunk, None]
+            out[lo:lo + chunk] = np.sqrt(dx * dx + dy * dy).min(axis=1)
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long-format DataFrame (t, agent, x, y, vx, vy)."""
+        n, T = self.num_agents, self.size
+        return pd.DataFrame({
+            "t": np.repeat(self["t"], n),
+            "agent": np.tile(np.arange(n), T),
+            **{k: self[k].ravel() for k in ("x", "y", "vx", "vy")},
+        })
+
+class CrowdSimulator:
+    """
+    Vectorized social-force crowd stage.
+
+    Each tick: goal attraction, pairwise pedestrian repulsion over neighbor pairs
+    from a cKDTree rebuilt per tick (query_pairs, accumulated with np.bincount),
+    wall repulsion along the clearance-field gradient, optional robot repulsion,
+    then a speed cap and a slide-on-contact wall check. Walkers pick a new random
+    free goal when they arrive, so the crowd keeps moving. States are logged to a
+    columnar TrajectoryBuffer.
+    """
+    def __init__(self, positions: np.ndarray, grid: Optional[np.ndarray] = None, resolution: float = 0.1,
+                 params: Optional[SocialForceParams] = None, seed: int = 0, bounds: Optional[tuple] = None):
+        self.params = params or SocialForceParams()
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.asarray(positions, dtype=np.float64).reshape(-1, 2).copy()
+        self.vel = np.zeros_like(self.pos)
+        self.t = 0.0
+        n = len(self.pos)
+
+        self.collision = None
+        if grid is not None:
+            self.collision = GridCollisionChecker(grid, resolution, robot_radius=self.params.radius)
+            gy, gx = np.gradient(self.collision.clearance, resolution)
+            self._grad = (gx, gy)
+            # Goals are drawn from the walker's own connected free region (never behind a sealed wall)
+            walkable = self.collision.clearance > 2 * self.params.radius
+            self._labels, _ = label(walkable)
+            free = np.flatnonzero(walkable.ravel())
+            order = np.argsort(self._labels.ravel()[free], kind="stable")
+            self._pool_cells = free[order]
+            self._pool_bounds = np.searchsorted(self._labels.ravel()[self._pool_cells],
+                                                np.arange(self._labels.max() + 2))
+            self.bounds = (0.0, 0.0, grid.shape[1] * resolution, grid.shape[0] * resolution)
+        else:
+            self.bounds = bounds or (0.0, 0.0, 20.0, 20.0)
+            self._labels = None
+
+        self.goals = self._sample_goals(np.arange(n))
+        self.buffer = TrajectoryBuffer(n)
+        self.buffer.append(self.t, self.pos, self.vel)
+
+    @classmethod
+    def from_world(cls, world, grid: Optional[np.ndarray] = None, resolution: float = 0.1, **kwargs) -> "CrowdSimulator":
+        """Starts one walker at every 'person' object (either world schema)."""
+        people = [(o['x'], o['y']) for o in normalize_objects(world) if o['type'] == "person"]
+        return cls(np.array(people, dtype=np.float64).reshape(-1, 2), grid, resolution, **kwargs)
+
+    def _sample_goals(self, agents: np.ndarray) -> np.ndarray:
+        k = len(agents)
+        if self._labels is None:
+            x0, y0, x1, y1 = self.bounds
+            return np.column_stack([self.rng.uniform(x0, x1, k), self.rng.uniform(y0, y1, k)])
+
+        res = self.collision.resolution
+        h, w = self._labels.shape
+        rows = np.clip((self.pos[agents, 1] / res).astype(np.int64), 0, h - 1)
+        cols = np.clip((self.pos[agents, 0] / res).astype(np.int64), 0, w - 1)
+        region = self._labels[rows, cols]
+        lo, hi = self._pool_bounds[region], self._pool_bounds[region + 1]
+        # Walkers outside any region (label 0 = hugging a wall) fall back to the whole pool
+        anywhere = hi - lo == 0
+        lo[anywhere] = self._pool_bounds[1]
+        hi[anywhere] = len(self._pool_cells)
+        cells = self._pool_cells[lo + (self.rng.random(k) * (hi - lo)).astype(np.int64)]
+        gr, gc = np.unravel_index(cells, self._labels.shape)
+        return np.column_stack([(gc + 0.5) * res, (gr + 0.5) * res])
+
+    def _pedestrian_forces(self) -> np.ndarray:
+        p = self.params
+        n = len(self.pos)
+        force = np.zeros((n, 2))
+        if n < 2:
+            return force
+        pairs = cKDTree(self.pos).query_pairs(p.cutoff, output_type='ndarray')
+        if len(pairs) == 0:
+            return force
+        i, j = pairs[:, 0], pairs[:, 1]
+        d = self.pos[i] - self.pos[j]
+        dist = np.maximum(np.hypot(d[:, 0], d[:, 1]), 1e-6)
+        n_ij = d / dist[:, None]  # from j towards i
+        mag = p.A_ped * np.exp((2 * p.radius - dist) / p.B_ped)
+
+        # Anisotropy: interactions in front of the walker weigh more than those behind
+        speed = np.maximum(np.hypot(self.vel[:, 0], self.vel[:, 1]), 1e-6)
+        e = self.vel / speed[:, None]
+        cos_i = -np.sum(e[i] * n_ij, axis=1)   # j in front of i
+        cos_j = np.sum(e[j] * n_ij, axis=1)    # i in front of j
+        w_i = p.anisotropy + (1 - p.anisotropy) * (1 + cos_i) / 2
+        w_j = p.anisotropy + (1 - p.anisotropy) * (1 + cos_j) / 2
+
+        for axis in range(2):
+            f = mag * n_ij[:, axis]
+            force[:, axis] = np.bincount(i, f * w_i, n) - np.bincount(j, f * w_j, n)
+        return force
+
+    def _wall_forces(self) -> np.ndarray:
+        p = self.params
+        c = self.collision
+        clearance = c.clearance_at(self.pos[:, 0], self.pos[:, 1])
+        h, w = c.clearance.shape
+        rows = np.clip((self.pos[:, 1] / c.resolution).astype(np.int64), 0, h - 1)
+        cols = np.clip((self.pos[:, 0] / c.resolution).astype(np.int64), 0, w - 1)
+        grad = np.column_stack([self._grad[0][rows, cols], self._grad[1][rows, cols]])
+        mag = p.A_wall * np.exp((p.radius - np.maximum(clearance, 0.0)) / p.B_wall)
+        return mag[:, None] * grad
+
+    def step(self, dt: float = 0.1, robot_xy: Optional[np.ndarray] = None) -> np.ndarray:
+        """Advances all pedestrians by one tick. Returns the (N, 2) positions."""
+        p = self.params
+        if len(self.pos) == 0:
+            self.t += dt
+            self.buffer.append(self.t, self.pos, self.vel)
+            return self.pos
+
+        to_goal = self.goals - self.pos
+        goal_dist = np.maximum(np.hypot(to_goal[:, 0], to_goal[:, 1]), 1e-6)
+        force = (p.desired_speed * to_goal / goal_dist[:, None] - self.vel) / p.relax_time
+        force += self._pedestrian_forces()
+        if self.collision is not None:
+            force += self._wall_forces()
+        if robot_xy is not None:
+            d = self.pos[:, None, :] - np.asarray(robot_xy, dtype=np.float64).reshape(1, -1, 2)
+            dist = np.maximum(np.hypot(d[..., 0], d[..., 1]), 1e-6)
+            mag = p.A_robot * np.exp((p.radius + p.robot_radius - dist) / p.B_robot)
+            force += np.sum(mag[..., None] * d / dist[..., None], axis=1)
+
+        self.vel += force * dt
+        speed = np.hypot(self.vel[:, 0], self.vel[:, 1])
+        self.vel *= np.minimum(1.0, p.max_speed / np.maximum(speed, 1e-9))[:, None]
+
+        new_pos = self.pos + self.vel * dt
+        if self.collision is not None:
+            new_pos, hit = self.collision.resolve(self.pos, new_pos, mode="slide")
+            moved = (new_pos - self.pos) / dt
+            self.vel[hit] = moved[hit]
+        self.pos = new_pos
+
+        arrived = np.hypot(*(self.goals - self.pos).T) < p.goal_tol
+        if arrived.any():
+            self.goals[arrived] = self._sample_goals(np.flatnonzero(arrived))
+
+        self.t += dt
+        self.buffer.append(self.t, self.pos, self.vel)
+        return self.pos
+
+    def run(self, steps: int, dt: float = 0.1) -> TrajectoryBuffer:
+        for _ in range(steps):
+            self.step(dt)
+        return self.buffer
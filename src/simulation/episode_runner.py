@@ -3,9 +3,16 @@ import math
 import csv
 import os
 import random
+import numpy as np
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
+from .collision import DEFAULT_COLLISION_MODE
+try:
+    from ..planning.grid_planner import WaypointFollower, path_to_waypoints
+except ImportError:  # src/ on sys.path (simulation imported as a top-level package)
+    from planning.grid_planner import WaypointFollower, path_to_waypoints
+
 @dataclass
 class RobotState:
     t: float
@@ -16,15 +23,25 @@ class RobotState:
     v_ang: float
 
 class EpisodeRunner:
-    def __init__(self, world_config: Dict, mode: str = "mock"):
+    def __init__(self, world_config: Dict, mode: str = "mock", planner=None,
+                 collision_checker=None, collision_mode: str = DEFAULT_COLLISION_MODE):
         """
         Args:
             world_config: Dict from HospitalGenerator.to_dict()
             mode: 'mock' for kinematic sim, 'ros2' for real Nav2
+            planner: Optional GridPlanner; the mock robot then follows its waypoints
+                     around walls instead of driving straight at the goal.
+            collision_checker: Optional GridCollisionChecker; the mock robot then stops
+                     or slides (collision_mode) on wall contact and contacts are
+                     recorded in self.collisions.
         """
         self.world_config = world_config
         self.mode = mode
+        self.planner = planner
+        self.collision_checker = collision_checker
+        self.collision_mode = collision_mode
         self.trajectory: List[RobotState] = []
+        self.collisions: List[Dict] = []
         
     def run_episode(self, start_pose: Tuple[float, float, float], 
                     goal_pose: Tuple[float, float, float], 
@@ -34,6 +51,7 @@ class EpisodeRunner:
         Runs a single navigation episode.
         """
         self.trajectory = []
+        self.collisions = []
         
         if self.mode == "mock":
             self._run_mock_episode(start_pose, goal_pose, duration, dt)
@@ -45,13 +63,19 @@ class EpisodeRunner:
     def _run_mock_episode(self, start, goal, duration, dt):
         """
         Simulates a robot driving to the goal with simple P-controller physics.
-        Does NOT avoid obstacles (that's for the 'real' planner), but
-        allows us to test the metric pipeline.
+        Without a planner it does NOT avoid obstacles, but allows us to test the
+        metric pipeline; with one it tracks the planned waypoints.
         """
         sx, sy, st = start
         gx, gy, gt = goal
         
         x, y, theta = sx, sy, st
+
+        follower = None
+        if self.planner is not None:
+            path = self.planner.plan((sx, sy), (gx, gy))
+            if path is not None:
+                follower = WaypointFollower(path_to_waypoints(path))
         
         t = 0.0
         while t < duration:
@@ -62,8 +86,12 @@ class EpisodeRunner:
             
             if dist < 0.2: # Reached goal
                 break
-                
-            desired_theta = math.atan2(dy, dx)
+
+            if follower is not None:
+                tx, ty = follower.target(x, y)
+                desired_theta = math.atan2(ty - y, tx - x)
+            else:
+                desired_theta = math.atan2(dy, dx)
             angle_diff = desired_theta - theta
             # Normalize angle
             while angle_diff > math.pi: angle_diff -= 2*math.pi
@@ -75,9 +103,17 @@ class EpisodeRunner:
             v_ang = max(-1.0, min(1.0, v_ang)) # Clamp angular vel
             
             # Update Pose
+            px, py = x, y
             x += v_lin * math.cos(theta) * dt
             y += v_lin * math.sin(theta) * dt
             theta += v_ang * dt
+
+            if self.collision_checker is not None:
+                resolved, hit = self.collision_checker.resolve(np.array([[px, py]]), np.array([[x, y]]),
+                                                               self.collision_mode)
+                if hit[0]:
+                    x, y = resolved[0].tolist()
+                    self.collisions.append({"t": t, "x": x, "y": y})
             
             self.trajectory.append(RobotState(t, x, y, theta, v_lin, v_ang))
             t += dt
@@ -0,0 +1,327 @@
+import math
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Approximate object heights (m) when the schema does not carry one
+DEFAULT_HEIGHTS = {"bed": 0.5, "person": 1.7, "door": 2.0, "wall": 2.0}
+DEFAULT_DIMS = {"bed": (2.0, 1.0), "person": (0.5, 0.5), "door": (0.2, 1.0)}
+
+SDF_MODELS = {
+    "bed": "model://aws_robomaker_hospital_bed_01",
+    "person": "model://person_standing",
+    "door": "model://door",
+}
+USD_COLORS = {"bed": (0.2, 0.4, 0.8), "person": (0.9, 0.6, 0.2), "door": (0.5, 0.35, 0.2)}
+
+def normalize_objects(world) -> List[Dict]:
+    """
+    Flattens objects from either world schema into {id, type, x, y, theta, dims}.
+      - src/world_gen:  {'id', 'type', 'pose': {'x', 'y', 'theta'}, 'dims': [l, w]}
+      - safety_transfer_hospital: {'id', 'type', 'x', 'y', 'yaw', 'size': [l, w, h]}
+    `world` may be a world dict (with 'objects') or the object list itself.
+    """
+    objects = world.get('objects', []) if isinstance(world, dict) else world
+    out = []
+    for i, obj in enumerate(objects):
+        otype = obj['type']
+        pose = obj.get('pose', obj)
+        if isinstance(pose, dict):
+            x, y = pose['x'], pose['y']
+            theta = pose.get('theta', pose.get('yaw', 0.0))
+        else:
+            x, y, theta = pose
+        dims = obj.get('dims') or obj.get('size') or DEFAULT_DIMS.get(otype, (1.0, 1.0))
+        height = dims[2] if len(dims) > 2 else DEFAULT_HEIGHTS.get(otype, 1.0)
+        out.append({
+            "id": obj.get('id', f"{otype}_{i}"),
+            "type": otype,
+            "x": float(x), "y": float(y), "theta": float(theta),
+            "dims": (float(dims[0]), float(dims[1]), float(height)),
+        })
+    return out
+
+def _row_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Horizontal runs of True cells: (rows, start_cols, end_cols), row-major order."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)  # same row-major order as starts
+    return rows, starts, ends
+
+def merge_wall_rectangles(mask: np.ndarray) -> np.ndarray:
+    """
+    Greedy meshing: merges occupied cells into maximal rectangles.
+    Row runs are extracted vectorized; a run continues the rectangle above it when
+    the previous row has a run with the same [start, end) span, otherwise a new
+    rectangle opens. Returns (K, 4) cell rectangles [c0, r0, c1, r1] (exclusive ends)
+    that tile the mask exactly without overlap.
+    """
+    rows, starts, ends = _row_runs(mask)
+    rects = []
+    open_rects: Dict[Tuple[int, int], int] = {}  # (c0, c1) -> start row
+    bounds = np.searchsorted(rows, np.arange(mask.shape[0] + 1))
+
+    for r in range(mask.shape[0]):
+        spans = set(zip(starts[bounds[r]:bounds[r + 1]].tolist(), ends[bounds[r]:bounds[r + 1]].tolist()))
+        for span in list(open_rects):
+            if span not in spans:
+                rects.append((span[0], open_rects.pop(span), span[1], r))
+        for span in spans:
+            open_rects.setdefault(span, r)
+    for (c0, c1), r0 in open_rects.items():
+        rects.append((c0, r0, c1, mask.shape[0]))
+
+    return np.array(sorted(rects), dtype=np.int64).reshape(-1, 4)
+
+def wall_boxes_from_grid(grid: np.ndarray, resolution: float, occupied: int = 100, merge: bool = True) -> np.ndarray:
+    """
+    Extrudes walls from the occupancy grid as box footprints.
+    Returns (K, 4) boxes [x0, y0, x1, y1] in meters (row r spans y in [r, r+1) * resolution).
+
+    Args:
+        merge: Greedy-mesh occupied cells into maximal rectangles (few large boxes);
+               False emits one box per horizontal run.
+    """
+    mask = np.asarray(grid) >= occupied
+    if merge:
+        boxes = merge_wall_rectangles(mask)
+    else:
+        rows, starts, ends = _row_runs(mask)
+        boxes = np.column_stack([starts, rows, ends, rows + 1])
+    return boxes.astype(np.float64) * resolution
+
+def write_chunks(path: str, chunks: Iterable[str], buffer_size: int = 1 << 16) -> int:
+    """
+    Streams text chunks into a file through a fixed-size buffer; the document is never
+    held in memory. Writes to a temp file and renames, so readers never see partial files.
+    Returns the number of characters written.
+    """
+    tmp = f"{path}.tmp"
+    written = 0
+    with open(tmp, 'w', buffering=buffer_size) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    os.replace(tmp, path)
+    return written
+
+# ---------------------------------------------------------------------------
+# SDF (Gazebo)
+# ---------------------------------------------------------------------------
+
+def _sdf_box(name: str, box: Sequence[float], height: float) -> str:
+    x0, y0, x1, y1 = box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    sx, sy = x1 - x0, y1 - y0
+    geom = f"<geometry><box><size>{sx:.4f} {sy:.4f} {height}</size></box></geometry>"
+    return (f"""        <collision name="{name}_c"><pose>{cx:.4f} {cy:.4f} {height / 2} 0 0 0</pose>{geom}</collision>
+        <visual name="{name}_v"><pose>{cx:.4f} {cy:.4f} {height / 2} 0 0 0</pose>{geom}</visual>
+""")
+
+def iter_sdf(world, wall_boxes: Optional[np.ndarray] = None, heightmap_uri: Optional[str] = None,
+             size: Tuple[float, float] = (20.0, 20.0), wall_height: float = 2.0,
+             world_name: str = "hospital_world") -> Iterator[str]:
+    """
+    Yields an SDF world in chunks.
+    Walls come from `wall_boxes` (box collision primitives) or, if only `heightmap_uri`
+    is given, from a heightmap reference to the PGM map.
+    """
+    yield f"""<?xml version="1.0" ?>
+<sdf version="1.6">
+  <world name="{world_name}">
+    <include>
+      <uri>model://sun</uri>
+    </include>
+    <include>
+      <uri>model://ground_plane</uri>
+    </include>
+"""
+    if wall_boxes is not None:
+        yield """
+    <model name="hospital_walls">
+      <static>true</static>
+      <link name="link">
+"""
+        for i, box in enumerate(wall_boxes.tolist()):
+            yield _sdf_box(f"wall_{i}", box, wall_height)
+        yield """      </link>
+    </model>
+"""
+    elif heightmap_uri is not None:
+        w, h = size
+        yield f"""
+    <model name="hospital_walls">
+      <static>true</static>
+      <link name="link">
+        <collision name="collision">
+          <geometry>
+            <heightmap>
+              <uri>{heightmap_uri}</uri>
+              <size>{w} {h} {wall_height}</size> <!-- {wall_height}m high walls -->
+              <pos>0 0 0</pos>
+            </heightmap>
+          </geometry>
+        </collision>
+        <visual name="visual">
+          <geometry>
+            <heightmap>
+              <texture>
+                <diffuse>file://media/materials/textures/dirt_diffusespecular.png</diffuse>
+                <normal>file://media/materials/textures/flat_normal.png</normal>
+                <size>1</size>
+              </texture>
+              <uri>{heightmap_uri}</uri>
+              <size>{w} {h} {wall_height}</size>
+              <pos>0 0 0</pos>
+            </heightmap>
+          </geometry>
+        </visual>
+      </link>
+    </model>
+"""
+
+    for obj in normalize_objects(world):
+        model_uri = SDF_MODELS.get(obj['type'], "model://cube_20k")
+        yield f"""
+    <include>
+      <uri>{model_uri}</uri>
+      <name>{obj['id']}</name>
+      <pose>{obj['x']} {obj['y']} 0 0 0 {obj['theta']}</pose>
+    </include>
+"""
+    yield """
+  </world>
+</sdf>
+"""
+
+# ---------------------------------------------------------------------------
+# USDA (Isaac Sim / Omniverse)
+# ---------------------------------------------------------------------------
+
+def iter_usda(world, wall_boxes: Optional[np.ndarray] = None, wall_height: float = 2.0) -> Iterator[str]:
+    """Yields a text USD stage in chunks. Objects and walls are unit Cubes scaled to size."""
+    yield "#usda 1.0\n"
+    yield "( defaultPrim = \"World\" )\n\n"
+    yield "def Xform \"World\" {\n"
+    yield "    def DistantLight \"Sun\" {\n        float intensity = 3000\n    }\n\n"
+
+    for i, obj in enumerate(normalize_objects(world)):
+        l, w, h = obj['dims']
+        color = USD_COLORS.get(obj['type'], (0.8, 0.8, 0.8))
+        # USD Cube has edge length 2 -> scale by half-extents
+        yield (f"    def Cube \"Obj_{i}_{obj['type']}\" {{\n"
+               f"        double3 xformOp:translate = ({obj['x']}, {obj['y']}, {h / 2})\n"
+               f"        float xformOp:rotateZ = {math.degrees(obj['theta']):.4f}\n"
+               f"        float3 xformOp:scale = ({l / 2}, {w / 2}, {h / 2})\n"
+               f"        uniform token[] xformOpOrder = [\"xformOp:translate\", \"xformOp:rotateZ\", \"xformOp:scale\"]\n"
+               f"        color3f[] primvars:displayColor = [{color}]\n"
+               f"    }}\n")
+
+    if wall_boxes is not None and len(wall_boxes):
+        yield "    def Xform \"Walls\" {\n"
+        for i, (x0, y0, x1, y1) in enumerate(wall_boxes.tolist()):
+            yield (f"        def Cube \"Wall_{i}\" {{\n"
+                   f"            double3 xformOp:translate = ({(x0 + x1) / 2:.4f}, {(y0 + y1) / 2:.4f}, {wall_height / 2})\n"
+                   f"            float3 xformOp:scale = ({(x1 - x0) / 2:.4f}, {(y1 - y0) / 2:.4f}, {wall_height / 2})\n"
+                   f"            uniform token[] xformOpOrder = [\"xformOp:translate\", \"xformOp:scale\"]\n"
+                   f"            color3f[] primvars:displayColor = [(0.8, 0.8, 0.8)]\n"
+                   f"        }}\n")
+        yield "    }\n"
+
+    yield "}\n"
+
+# ---------------------------------------------------------------------------
+# Wall extrusion mesh (Wavefront OBJ)
+# ---------------------------------------------------------------------------
+
+# Box corner order: bottom ring then top ring; faces as quads (1-based per box)
+_BOX_FACES = ((1, 2, 3, 4), (5, 8, 7, 6), (1, 5, 6, 2), (2, 6, 7, 3), (3, 7, 8, 4), (4, 8, 5, 1))
+
+def iter_wall_obj(wall_boxes: np.ndarray, wall_height: float = 2.0, batch: int = 4096) -> Iterator[str]:
+    """Yields an OBJ mesh of the extruded wall boxes, formatting vertices in vectorized batches."""
+    yield "# Extruded hospital walls\no walls\n"
+    for lo in range(0, len(wall_boxes), batch):
+        b = wall_boxes[lo:lo + batch]
+        x0, y0, x1, y1 = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+        z0, z1 = np.zeros(len(b)), np.full(len(b), wall_height)
+        corners = np.stack([
+            np.stack([x0, y0, z0], -1), np.stack([x1, y0, z0], -1), np.stack([x1, y1, z0], -1), np.stack([x0, y1, z0], -1),
+            np.stack([x0, y0, z1], -1), np.stack([x1, y0, z1], -1), np.stack([x1, y1, z1], -1), np.stack([x0, y1, z1], -1),
+        ], axis=1).reshape(-1, 3)
+        yield "".join(f"v {x:.4f} {y:.4f} {z:.4f}\n" for x, y, z in corners.tolist())
+
+        base = (lo + np.arange(len(b)))[:, None, None] * 8
+        faces = (base + np.array(_BOX_FACES)[None]).reshape(-1, 4)
+        yield "".join(f"f {a} {b_} {c} {d}\n" for a, b_, c, d in faces.tolist())
+
+# ---------------------------------------------------------------------------
+# Batch export
+# ---------------------------------------------------------------------------
+
+EXPORT_FORMATS = ("sdf", "usda", "obj")
+
+def export_world(world: Dict, out_dir: str, name: str = "world", grid: Optional[np.ndarray] = None,
+                 resolution: Optional[float] = None, formats: Sequence[str] = EXPORT_FORMATS,
+                 wall_height: float = 2.0) -> Dict:
+    """
+    Exports one world to <out_dir>/<name>.{sdf,usda,obj}.
+    Walls are extruded from `grid` when given (the OBJ mesh requires a grid).
+    Returns paths and per-stage timings.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    timings = {}
+    paths = {}
+
+    t0 = time.perf_counter()
+    boxes = None
+    if grid is not None:
+        boxes = wall_boxes_from_grid(grid, resolution or world.get('resolution', 1.0))
+    timings["walls_s"] = time.perf_counter() - t0
+
+    for fmt in formats:
+        t0 = time.perf_counter()
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        if fmt == "sdf":
+            size = (world.get('width', 20.0), world.get('height', 20.0))
+            write_chunks(path, iter_sdf(world, wall_boxes=boxes, size=size, wall_height=wall_height))
+        elif fmt == "usda":
+            write_chunks(path, iter_usda(world, wall_boxes=boxes, wall_height=wall_height))
+        elif fmt == "obj":
+            if boxes is None: continue
+            write_chunks(path, iter_wall_obj(boxes, wall_height))
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        paths[fmt] = path
+        timings[f"{fmt}_s"] = time.perf_counter() - t0
+
+    return {"name": name, "paths": paths, "num_wall_boxes": 0 if boxes is None else len(boxes),
+            "timings": timings, "total_s": sum(timings.values())}
+
+def _export_job(job: Tuple) -> Dict:
+    world, out_dir, name, grid, resolution, formats = job
+    return export_world(world, out_dir, name, grid, resolution, formats)
+
+def export_worlds_parallel(jobs: List[Dict], workers: Optional[int] = None,
+                           formats: Sequence[str] = EXPORT_FORMATS) -> List[Dict]:
+    """
+    Exports many worlds across worker processes.
+
+    Args:
+        jobs: [{'world': dict, 'out_dir': str, 'name': str, 'grid': ndarray|None, 'resolution': float|None}]
+        workers: Worker processes (None = all cores, 0/1 = in-process).
+
+    Returns:
+        Per-world export reports (paths + timings), in job order.
+    """
+    tasks = [(j['world'], j['out_dir'], j.get('name', f"world_{i:05d}"), j.get('grid'), j.get('resolution'), tuple(formats))
+             for i, j in enumerate(jobs)]
+    workers = os.cpu_count() if workers is None else workers
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_export_job, tasks, chunksize=8))
+    return [_export_job(t) for t in tasks]
@@ -2,6 +2,8 @@ import json
 import os
 import time
 
+from .exporters import iter_usda, normalize_objects, wall_boxes_from_grid, write_chunks
+
 class IsaacBridge:
     """
     Sim2Val Bridge: Converting 'Sim-Truth' Worlds to NVIDIA Isaac Sim (USD).
@@ -12,40 +14,21 @@ class IsaacBridge:
         os.makedirs(export_dir, exist_ok=True)
         print(f"[IsaacBridge] Bridge initialized. Target: {export_dir}")
         
-    def export_world(self, world_config: dict, filename="hospital_scenario.usda"):
+    def export_world(self, world_config: dict, filename="hospital_scenario.usda", grid=None, resolution=None):
         """
         Converts the internal JSON world representation to USDA (text-based USD).
+        Accepts either world schema; walls are extruded from `grid` when given.
         """
-        print(f"[IsaacBridge] meaningful conversion of {len(world_config.get('objects', []))} objects to USD...")
-        
-        # Header
-        usda = "#usda 1.0\n"
-        usda += "( defaultPrim = \"World\" )\n\n"
-        usda += "def Xform \"World\" {\n"
-        
-        # Lighting
-        usda += "    def DistantLight \"Sun\" {\n"
-        usda += "        float intensity = 3000\n"
-        usda += "    }\n\n"
-        
-        # Objects
-        for i, obj in enumerate(world_config.get('objects', [])):
-            name = f"Obj_{i}_{obj['type']}"
-            x, y = obj['x'], obj['y']
-            
-            usda += f"    def Cube \"{name}\" {{\n"
-            usda += f"        double3 xformOp:translate = ({x}, {y}, 0.5)\n"
-            usda += f"        uniform token[] xformOpOrder = [\"xformOp:translate\"]\n"
-            usda += f"        color3f[] primvars:displayColor = [(0.8, 0.8, 0.8)]\n"
-            usda += "    }\n"
-            
-        usda += "}\n"
-        
-        # Save
+        objects = normalize_objects(world_config)
+        print(f"[IsaacBridge] meaningful conversion of {len(objects)} objects to USD...")
+
+        wall_boxes = None
+        if grid is not None:
+            wall_boxes = wall_boxes_from_grid(grid, resolution or world_config.get('resolution', 1.0))
+
         path = os.path.join(self.export_dir, filename)
-        with open(path, "w") as f:
-            f.write(usda)
-            
+        write_chunks(path, iter_usda(objects, wall_boxes=wall_boxes))
+
         print(f"[IsaacBridge] SUCCESS: Exported Digital Twin to {path}")
         return path
 
@@ -0,0 +1,292 @@
+import json
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Tuple, Optional
+
+from ..policy.constrained_policy import ConstrainedPolicy, PolicyParams, LagrangianOptimizer, DIST_COLUMNS
+from ..metrics.thresholds import DEFAULT_THRESHOLDS
+from ..simulation.collision import GridCollisionChecker, DEFAULT_COLLISION_MODE
+
+@dataclass
+class RolloutScenario:
+    """A batch of start/goal pairs in one world, shared by every candidate."""
+    starts: np.ndarray          # (N, 3) x, y, theta
+    goals: np.ndarray           # (N, 3)
+    object_xy: Dict[str, np.ndarray]  # type -> (M, 2) positions
+    d_crit: Dict[str, float]    # red-zone radius per type
+    dt: float = 0.1
+    max_steps: int = 300        # BENCHMARK_SPEC timeout
+    goal_tol: float = 0.2
+    collision: Optional[GridCollisionChecker] = None  # wall contact checks (None = walls ignored)
+    collision_mode: str = DEFAULT_COLLISION_MODE
+
+@dataclass
+class CandidateResult:
+    params: PolicyParams
+    reward: float   # mean progress towards goal in [0, 1]
+    cost: float     # mean SVR over the batch
+    success: float  # fraction of episodes that reached the goal
+    collision_rate: float = 0.0  # mean fraction of active steps in wall contact
+
+@dataclass
+class TrainerState:
+    generation: int = 0
+    lambda_val: float = 0.0
+    mean: List[float] = field(default_factory=lambda: [PolicyParams.k_safe_bed, PolicyParams.k_safe_person])
+    sigma: List[float] = field(default_factory=lambda: [2.0, 2.0])
+    best: Optional[Dict] = None
+    history: List[Dict] = field(default_factory=list)
+
+def _object_positions(objects: List[Dict]) -> Dict[str, np.ndarray]:
+    """Groups object centers by type. Accepts both pose dicts and flat x/y objects."""
+    grouped = {k: [] for k in DIST_COLUMNS}
+    for obj in objects:
+        if obj['type'] not in grouped: continue
+        pose = obj.get('pose', obj)
+        grouped[obj['type']].append((pose['x'], pose['y']))
+    return {k: np.array(v, dtype=np.float64).reshape(-1, 2) for k, v in grouped.items()}
+
+def make_scenario(world_config: Dict, num_episodes: int = 64, seed: int = 0,
+                  margin: float = 1.0, max_rounds: int = 100, **kwargs) -> RolloutScenario:
+    """
+    Samples a fixed batch of start/goal pairs inside the world bounds.
+    Red-zone radii come from the shared threshold registry. With a `collision`
+    checker in kwargs, starts and goals are drawn from collision-free space only;
+    rejection sampling gives up with a ValueError after `max_rounds` batches.
+    """
+    rng = np.random.default_rng(seed)
+    w, h = world_config.get('width', 20), world_config.get('height', 20)
+    checker = kwargs.get('collision')
+
+    def sample():
+        out = np.empty((0, 3))
+        for _ in range(max_rounds):
+            if len(out) >= num_episodes:
+                break
+            batch = np.column_stack([
+                rng.uniform(margin, w - margin, num_episodes),
+                rng.uniform(margin, h - margin, num_episodes),
+                rng.uniform(-np.pi, np.pi, num_episodes),
+            ])
+            if checker is not None:
+                batch = batch[~checker.in_collision(batch[:, 0], batch[:, 1])]
+            out = np.vstack([out, batch])
+        if len(out) < num_episodes:
+            raise ValueError(f"Only {len(out)}/{num_episodes} collision-free poses after {max_rounds} rounds "
+                             f"in a {w}x{h} m world with margin {margin} m")
+        return out[:num_episodes]
+
+    return RolloutScenario(
+        starts=sample(),
+        goals=sample(),
+        object_xy=_object_positions(world_config.get('objects', [])),
+        d_crit={k: DEFAULT_THRESHOLDS.crit_of(k) for k in DIST_COLUMNS},
+        **kwargs
+    )
+
+def batched_rollout(params: PolicyParams, scenario: RolloutScenario) -> CandidateResult:
+    """
+    Runs every episode of the scenario simultaneously with the vectorized controller.
+    Finished episodes are frozen; SVR is counted over each episode's active steps.
+    With scenario.collision set, wall contacts stop (or slide) robots and are counted.
+    """
+    policy = ConstrainedPolicy(PolicyParams(**asdict(params)))
+    poses = scenario.starts.astype(np.float64).copy()
+    goals = scenario.goals
+    n = len(poses)
+
+    init_dist = np.hypot(goals[:, 0] - poses[:, 0], goals[:, 1] - poses[:, 1])
+    active = np.ones(n, dtype=bool)
+    steps = np.zeros(n)
+    red_steps = np.zeros(n)
+    contact_steps = np.zeros(n)
+    dists = np.full((n, len(DIST_COLUMNS)), np.inf)
+    crit = np.array([scenario.d_crit[k] for k in DIST_COLUMNS])
+
+    for _ in range(scenario.max_steps):
+        for j, otype in enumerate(DIST_COLUMNS):
+            obj = scenario.object_xy[otype]
+            if len(obj):
+                d = np.hypot(poses[:, None, 0] - obj[None, :, 0], poses[:, None, 1] - obj[None, :, 1])
+                dists[:, j] = d.min(axis=1)
+
+        actions = policy.get_actions(poses, goals, dists)
+        actions[~active] = 0.0
+
+        prev_xy = poses[:, :2].copy()
+        poses[:, 0] += actions[:, 0] * np.cos(poses[:, 2]) * scenario.dt
+        poses[:, 1] += actions[:, 0] * np.sin(poses[:, 2]) * scenario.dt
+        poses[:, 2] += actions[:, 1] * scenario.dt
+
+        if scenario.collision is not None:
+            poses[:, :2], hit = scenario.collision.resolve(prev_xy, poses[:, :2], scenario.collision_mode)
+            contact_steps += active & hit
+
+        steps += active
+        red_steps += active & np.any(dists < crit, axis=1)
+
+        reached = np.hypot(goals[:, 0] - poses[:, 0], goals[:, 1] - poses[:, 1]) < scenario.goal_tol
+        active &= ~reached
+        if not active.any():
+            break
+
+    final_dist = np.hypot(goals[:, 0] - poses[:, 0], goals[:, 1] - poses[:, 1])
+    progress = np.clip(1.0 - final_dist / np.maximum(init_dist, 1e-6), 0.0, 1.0)
+    svr = red_steps / np.maximum(steps, 1)
+
+    return CandidateResult(
+        params=params,
+        reward=float(progress.mean()),
+        cost=float(svr.mean()),
+        success=float((~active).mean()),
+        collision_rate=float((contact_steps / np.maximum(steps, 1)).mean())
+    )
+
+# Worker-process globals: the scenario is shipped once per worker, not once per task
+_WORKER_SCENARIO: Optional[RolloutScenario] = None
+
+def _init_worker(scenario: RolloutScenario):
+    global _WORKER_SCENARIO
+    _WORKER_SCENARIO = scenario
+
+def _evaluate_in_worker(params: PolicyParams) -> CandidateResult:
+    return batched_rollout(params, _WORKER_SCENARIO)
+
+class PopulationTrainer:
+    """
+    Parallel Lagrangian training driver.
+
+    Each generation evaluates a population of PolicyParams (k_safe_bed, k_safe_person)
+    on the same batched rollout scenario in worker processes, ranks candidates by the
+    Lagrangian objective  J = R - lambda * (C - target),  refits the sampling
+    distribution on the elites (cross-entropy style) and updates lambda with the
+    elite mean cost via LagrangianOptimizer.
+    """
+    def __init__(self, scenario: RolloutScenario, population_size: int = 32, elite_frac: float = 0.25,
+                 target_cost: float = 0.05, lambda_lr: float = 0.5, workers: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None, seed: int = 0, k_bounds: Tuple[float, float] = (0.1, 50.0)):
+        """
+        Args:
+            workers: Number of worker processes (None = all cores, 0/1 = in-process).
+            checkpoint_path: JSON file written after every generation; resumed if present.
+        """
+        self.scenario = scenario
+        self.population_size = population_size
+        self.num_elites = max(1, int(population_size * elite_frac))
+        self.workers = os.cpu_count() if workers is None else workers
+        self.checkpoint_path = checkpoint_path
+        self.k_bounds = k_bounds
+        self.rng = np.random.default_rng(seed)
+
+        self.optimizer = LagrangianOptimizer(target_cost=target_cost, lr=lambda_lr)
+        self.state = TrainerState()
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self.load_checkpoint(checkpoint_path)
+
+    def sample_population(self) -> List[PolicyParams]:
+        ks = self.rng.normal(self.state.mean, self.state.sigma, size=(self.population_size, 2))
+        ks = np.clip(ks, *self.k_bounds)
+        # Always re-evaluate the current mean so progress is never lost to sampling noise
+        ks[0] = self.state.mean
+        return [PolicyParams(k_safe_bed=float(kb), k_safe_person=float(kp)) for kb, kp in ks]
+
+    def evaluate(self, population: List[PolicyParams], executor: Optional[ProcessPoolExecutor] = None) -> List[CandidateResult]:
+        if executor is None:
+            return [batched_rollout(p, self.scenario) for p in population]
+        return list(executor.map(_evaluate_in_worker, population))
+
+    def step(self, executor: Optional[ProcessPoolExecutor] = None) -> Dict:
+        """Runs one generation and returns its summary."""
+        t0 = time.perf_counter()
+        results = self.evaluate(self.sample_population(), executor)
+
+        lam = self.state.lambda_val
+        target = self.optimizer.target_cost
+        scores = np.array([r.reward - lam * (r.cost - target) for r in results])
+        elite_idx = np.argsort(scores)[::-1][:self.num_elites]
+        elites = np.array([[results[i].params.k_safe_bed, results[i].params.k_safe_person] for i in elite_idx])
+
+        self.state.mean = elites.mean(axis=0).tolist()
+        self.state.sigma = np.maximum(elites.std(axis=0), 0.05).tolist()
+
+        elite_cost = float(np.mean([results[i].cost for i in elite_idx]))
+        self.state.lambda_val = self.optimizer.update(elite_cost)
+
+        best = results[elite_idx[0]]
+        summary = {
+            "generation": self.state.generation,
+            "lambda": self.state.lambda_val,
+            "best_params": asdict(best.params),
+            "best_reward": best.reward,
+            "best_cost": best.cost,
+            "best_success": best.success,
+            "elite_cost": elite_cost,
+            "wall_time_s": time.perf_counter() - t0
+        }
+        if self.state.best is None or float(scores[elite_idx[0]]) >= self.state.best["score"]:
+            self.state.best = {"params": asdict(best.params), "reward": best.reward,
+                               "cost": best.cost, "score": float(scores[elite_idx[0]])}
+
+        self.state.history.append(summary)
+        self.state.generation += 1
+        if self.checkpoint_path:
+            self.save_checkpoint(self.checkpoint_path)
+        return summary
+
+    def train(self, generations: int = 10, verbose: bool = True) -> PolicyParams:
+        """Runs generations until the total count reaches `generations`; returns the mean params."""
+        remaining = generations - self.state.generation
+        if remaining <= 0:
+            return self.current_params()
+
+        if self.workers and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.scenario,)) as executor:
+                for _ in range(remaining):
+                    self._log(self.step(executor), verbose)
+        else:
+            for _ in range(remaining):
+                self._log(self.step(), verbose)
+        return self.current_params()
+
+    def current_params(self) -> PolicyParams:
+        kb, kp = self.state.mean
+        return PolicyParams(k_safe_bed=kb, k_safe_person=kp)
+
+    def save_checkpoint(self, path: str):
+        payload = asdict(self.state)
+        payload["rng_state"] = self.rng.bit_generator.state
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, path)
+
+    def load_checkpoint(self, path: str):
+        with open(path, 'r') as f:
+            payload = json.load(f)
+        self.rng.bit_generator.state = payload.pop("rng_state")
+        self.state = TrainerState(**payload)
+        self.optimizer.lambda_val = self.state.lambda_val
+        print(f"[PopulationTrainer] Resumed from {path} at generation {self.state.generation}")
+
+    @staticmethod
+    def _log(summary: Dict, verbose: bool):
+        if not verbose: return
+        p = summary["best_params"]
+        print(f"[Gen {summary['generation']:03d}] lambda={summary['lambda']:.3f} | "
+              f"k_bed={p['k_safe_bed']:.2f} k_person={p['k_safe_person']:.2f} | "
+              f"R={summary['best_reward']:.3f} C={summary['best_cost']:.3f} | {summary['wall_time_s']:.2f}s")
+
+if __name__ == "__main__":
+    from ..world_gen.hospital_generator import HospitalGenerator
+
+    gen = HospitalGenerator(width=20, height=20)
+    gen.generate_layout(num_wards=4)
+    scenario = make_scenario(gen.to_dict(), num_episodes=256)
+
+    trainer = PopulationTrainer(scenario, population_size=os.cpu_count() * 4)
+    best = trainer.train(generations=10)
+    print(f"Final params: {best}")
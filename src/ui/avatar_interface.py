@@ -1,5 +1,9 @@
 import os
+import time
+import asyncio
 import requests
+import httpx
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load env vars
@@ -14,6 +18,7 @@ class AvatarInterface:
     
     def __init__(self):
         self.api_key = os.getenv("DID_API_KEY")
+        self.api_url = os.getenv("DID_API_URL", "https://api.d-id.com")
         self.source_url = os.getenv("DID_SOURCE_IMAGE_URL", "https://img.freepik.com/free-photo/portrait-young-businesswoman-holding-eyeglasses-hand-against-gray-backdrop_23-2148029483.jpg")
         
         if self.api_key:
@@ -21,9 +26,10 @@ class AvatarInterface:
         else:
             print(f"[Avatar] No API Key. Running in MOCK Mode.")
 
-    def generate_response(self, ui_config, safety_status):
+    def compose(self, ui_config, safety_status):
         """
-        Generates the Avatar's verbal and non-verbal reaction.
+        The Avatar's verbal and non-verbal reaction, without the D-ID video
+        (did_video_url is None; see AsyncAvatarClient / generate_response).
         """
         intent = ui_config.get("intent", "unknown")
         emotion = ui_config.get("avatar_emotion", "neutral")
@@ -46,6 +52,34 @@ class AvatarInterface:
         else:
             script = "I'm listening. What do you need?"
             action = "[Avatar leans forward]"
+
+        return {
+            "speech": script,
+            "gesture": action,
+            "visual_emotion": emotion,
+            "did_video_url": None # Frontend will auto-play this
+        }
+
+    def _talk_payload(self, script):
+        return {
+            "script": {"type": "text", "input": script},
+            "source_url": self.source_url # Uses env var or default
+        }
+
+    def _headers(self):
+        return {
+            "Authorization": f"Basic {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def generate_response(self, ui_config, safety_status):
+        """
+        Generates the Avatar's verbal and non-verbal reaction.
+        Blocking: waits for the D-ID video. Inside an event loop use compose() plus
+        AsyncAvatarClient.create_video() instead.
+        """
+        response = self.compose(ui_config, safety_status)
+        script = response["speech"]
             
         # REAL D-ID CALL
         video_url = None
@@ -53,25 +87,16 @@ class AvatarInterface:
             try:
                 # 1. Create Talk
                 print(f"[Avatar] Generating D-ID Video for: '{script[:20]}...'")
-                headers = {
-                    "Authorization": f"Basic {self.api_key}",
-                    "Content-Type": "application/json"
-                }
-                payload = {
-                    "script": {"type": "text", "input": script},
-                    "source_url": self.source_url # Uses env var or default
-                }
-                
-                resp = requests.post("https://api.d-id.com/talks", json=payload, headers=headers)
+                headers = self._headers()
+                resp = requests.post(f"{self.api_url}/talks", json=self._talk_payload(script), headers=headers)
                 if resp.status_code == 201:
                     talk_id = resp.json().get("id")
                     
                     # 2. Poll for Completion (Simple Blocking for Demo)
                     status = "created"
                     while status not in ["done", "error"]:
-                        import time
                         time.sleep(1) # Wait 1s
-                        stat_resp = requests.get(f"https://api.d-id.com/talks/{talk_id}", headers=headers)
+                        stat_resp = requests.get(f"{self.api_url}/talks/{talk_id}", headers=headers)
                         data = stat_resp.json()
                         status = data.get("status")
                         if status == "done":
@@ -83,9 +108,63 @@ class AvatarInterface:
             except Exception as e:
                 print(f"[Avatar] Exception: {e}")
 
-        return {
-            "speech": script,
-            "gesture": action,
-            "visual_emotion": emotion,
-            "did_video_url": video_url # Frontend will auto-play this
-        }
+        response["did_video_url"] = video_url
+        return response
+
+class AsyncAvatarClient:
+    """
+    Non-blocking D-ID client for the FastAPI server: one pooled httpx.AsyncClient,
+    talk creation and status polling with asyncio.sleep, so the event loop (and every
+    WebSocket) keeps running while a video renders.
+    """
+    def __init__(self, avatar: AvatarInterface, poll_interval: float = 1.0, timeout: float = 60.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.avatar = avatar
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(
+            base_url=avatar.api_url,
+            headers=avatar._headers() if avatar.api_key else None,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(10.0),
+            transport=transport,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.avatar.api_key)
+
+    async def create_video(self, script: str) -> Optional[str]:
+        """Creates a talk and polls it; returns the result URL, or None on error/timeout."""
+        if not self.enabled or not script:
+            return None
+        try:
+            print(f"[Avatar] Generating D-ID Video for: '{script[:20]}...'")
+            resp = await self.client.post("/talks", json=self.avatar._talk_payload(script))
+            if resp.status_code != 201:
+                print(f"[Avatar] D-ID Error {resp.status_code}: {resp.text}")
+                return None
+            talk_id = resp.json().get("id")
+            deadline = asyncio.get_running_loop().time() + self.timeout
+            while asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                poll = await self.client.get(f"/talks/{talk_id}")
+                if poll.status_code != 200:
+                    print(f"[Avatar] D-ID Error {poll.status_code}: {poll.text[:200]}")
+                    return None
+                data = poll.json()
+                status = data.get("status")
+                if status == "done":
+                    print(f"[Avatar] Video Ready: {data.get('result_url')}")
+                    return data.get("result_url")
+                if status == "error":
+                    print(f"[Avatar] D-ID talk {talk_id} failed")
+                    return None
+            print(f"[Avatar] D-ID talk {talk_id} timed out")
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: a body that is not JSON (e.g. a 502 HTML page from a proxy)
+            print(f"[Avatar] Exception: {e!r}")
+        return None
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,134 @@
+import json
+import asyncio
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Set
+
+class ClientChannel:
+    """
+    One connected client: a bounded outgoing queue drained by its own sender task,
+    so a slow or dead socket only ever delays itself.
+
+    An entry with a coalesce key removes a still-pending entry with the same key and
+    is queued at the tail (e.g. only the latest UI state matters), so it never
+    overtakes messages offered after the stale one. When the queue is full the
+    overflow policy applies: "drop_oldest", "drop_newest" or "disconnect".
+    """
+    def __init__(self, websocket, maxsize: int = 64, overflow: str = "drop_oldest"):
+        if overflow not in ("drop_oldest", "drop_newest", "disconnect"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.pending: deque = deque()   # [key, text] entries
+        self.keyed: Dict[Hashable, list] = {}
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def offer(self, text: str, key: Optional[Hashable] = None) -> bool:
+        """Queues a pre-serialized message. Returns False if the client must be evicted."""
+        if key is not None and key in self.keyed:
+            self.pending.remove(self.keyed.pop(key))
+            self.coalesced += 1
+        elif len(self.pending) >= self.maxsize:
+            if self.overflow == "disconnect":
+                return False
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return True
+            old = self.pending.popleft()
+            if old[0] is not None:
+                del self.keyed[old[0]]
+        entry = [key, text]
+        self.pending.append(entry)
+        if key is not None:
+            self.keyed[key] = entry
+        self.ready.set()
+        return True
+
+    async def run(self, send_timeout: float):
+        """Sender loop; raises on a failed or timed-out send."""
+        while True:
+            await self.ready.wait()
+            while self.pending:
+                key, text = self.pending.popleft()
+                if key is not None:
+                    del self.keyed[key]
+                await asyncio.wait_for(self.websocket.send_text(text), send_timeout)
+                self.sent += 1
+            self.ready.clear()
+
+class Broadcaster:
+    """
+    Fan-out of JSON messages to many WebSockets.
+
+    broadcast() serializes each message once and only enqueues the text on every
+    client channel; per-client sender tasks do the actual sends concurrently.
+    Clients whose send fails or exceeds send_timeout (or overflow with the
+    "disconnect" policy) are evicted and their socket closed.
+    """
+    def __init__(self, maxsize: int = 64, overflow: str = "drop_oldest", send_timeout: float = 5.0):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.send_timeout = send_timeout
+        self.clients: Dict[int, ClientChannel] = {}
+        self.evicted = 0
+        self.evictions: Set[asyncio.Task] = set()  # strong refs until done
+
+    @property
+    def websockets(self) -> List:
+        return [c.websocket for c in self.clients.values()]
+
+    def register(self, websocket) -> ClientChannel:
+        """Adds an already accepted websocket and starts its sender task."""
+        channel = ClientChannel(websocket, self.maxsize, self.overflow)
+        self.clients[id(websocket)] = channel
+        channel.task = asyncio.create_task(self._sender(channel))
+        return channel
+
+    async def _sender(self, channel: ClientChannel):
+        try:
+            await channel.run(self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Broadcast] Evicting client after failed send: {e!r}")
+            await self._evict(channel)
+
+    async def _evict(self, channel: ClientChannel):
+        if self.clients.pop(id(channel.websocket), None) is None:
+            return
+        self.evicted += 1
+        if channel.task is not None and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+        try:
+            await channel.websocket.close()
+        except Exception:
+            pass
+
+    def unregister(self, websocket):
+        """Drops a client that disconnected on its own (idempotent)."""
+        channel = self.clients.pop(id(websocket), None)
+        if channel is not None and channel.task is not None:
+            channel.task.cancel()
+
+    def publish(self, message: dict, key: Optional[Hashable] = None) -> int:
+        """Encodes once and enqueues for every client without awaiting any send."""
+        text = json.dumps(message, separators=(",", ":"))
+        overflowed = [c for c in list(self.clients.values()) if not c.offer(text, key)]
+        for channel in overflowed:
+            task = asyncio.ensure_future(self._evict(channel))
+            self.evictions.add(task)
+            task.add_done_callback(self.evictions.discard)
+        return len(self.clients) - len(overflowed)
+
+    async def broadcast(self, message: dict, key: Optional[Hashable] = None) -> int:
+        return self.publish(message, key)
+
+    async def close(self):
+        for channel in list(self.clients.values()):
+            await self._evict(channel)
+        if self.evictions:
+            await asyncio.gather(*self.evictions, return_exceptions=True)
@@ -1,8 +1,10 @@
 import sys
 import os
 import json
+import uuid
 import asyncio
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, Set
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
@@ -13,9 +15,19 @@ from pydantic import BaseModel
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from src.ui.intent_parser import IntentParser
-from src.ui.avatar_interface import AvatarInterface
+from src.ui.avatar_interface import AvatarInterface, AsyncAvatarClient
+from src.ui.broadcaster import Broadcaster
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: stop pending avatar renders, close the pooled HTTP client
+    for task in list(video_tasks):
+        task.cancel()
+    await avatar_client.aclose()
+    await manager.broadcaster.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Serve static client files
 app.mount("/client", StaticFiles(directory="src/ui/client", html=True), name="client")
@@ -27,34 +39,59 @@ async def get_dashboard():
 
 # State
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """
+    Dashboard connections. Broadcasts go through per-client bounded queues and sender
+    tasks (src/ui/broadcaster.py): one slow dashboard no longer delays the others, and
+    dead sockets are evicted instead of raising mid-broadcast.
+    """
+    def __init__(self, maxsize: int = 64, overflow: str = "drop_oldest", send_timeout: float = 5.0):
+        self.broadcaster = Broadcaster(maxsize, overflow, send_timeout)
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return self.broadcaster.websockets
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.broadcaster.register(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.broadcaster.unregister(websocket)
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
+    async def broadcast(self, message: dict, coalesce: bool = False):
+        """
+        coalesce=True marks the message as UI state: a client that has not yet received
+        the previous state message only gets the latest one.
+        """
+        return await self.broadcaster.broadcast(message, key="ui_state" if coalesce else None)
 
 manager = ConnectionManager()
 parser = IntentParser()
 avatar = AvatarInterface()
+avatar_client = AsyncAvatarClient(avatar)
+video_tasks: Set[asyncio.Task] = set() # Strong refs so pending renders are not garbage collected
 
 # Models
 class VoiceCommand(BaseModel):
     text: str
 
+async def stream_avatar_video(request_id: str, speech: str):
+    """Renders the D-ID video off the request path and pushes it as a separate message."""
+    video_url = await avatar_client.create_video(speech)
+    if video_url:
+        await manager.broadcast({
+            "type": "AVATAR_VIDEO",
+            "request_id": request_id,
+            "speech": speech,
+            "did_video_url": video_url
+        })
+
 @app.post("/api/command")
 async def process_command(cmd: VoiceCommand):
     """
     Simulates receiving a Voice Command (STT output).
     1. Parses Intent -> UI Config
-    2. Generates Avatar Response
+    2. Generates Avatar Response (script now, D-ID video later as AVATAR_VIDEO)
     3. Pushes UI update to Frontend via Websocket
     """
     print(f"[Server] Received command: {cmd.text}")
@@ -71,19 +108,28 @@ async def process_command(cmd: VoiceCommand):
     # 2. Generate Avatar Response
     # Mock safety status for now
     safety_status = "SAFE" 
-    avatar_resp = avatar.generate_response(ui_config, safety_status)
+    avatar_resp = avatar.compose(ui_config, safety_status)
+    request_id = uuid.uuid4().hex
+    video_pending = avatar_client.enabled and bool(avatar_resp["speech"])
+    avatar_resp["video_pending"] = video_pending
     
     # payload to frontend
     payload = {
         "type": "UI_UPDATE",
+        "request_id": request_id,
         "config": ui_config,
         "avatar": avatar_resp
     }
     
     # 3. Broadcast
-    await manager.broadcast(payload)
+    await manager.broadcast(payload, coalesce=True)
+
+    if video_pending:
+        task = asyncio.create_task(stream_avatar_video(request_id, avatar_resp["speech"]))
+        video_tasks.add(task)
+        task.add_done_callback(video_tasks.discard)
     
-    return {"status": "success", "intent": ui_config["intent"]}
+    return {"status": "success", "intent": ui_config["intent"], "request_id": request_id}
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -94,6 +140,6 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text() 
             # If client sends "shake", we clear UI
             if "clear" in data:
-                await manager.broadcast({"type": "UI_CLEAR"})
+                await manager.broadcast({"type": "UI_CLEAR"}, coalesce=True)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -4,6 +4,12 @@ import os
 import random
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
+from .placement import PlacementEngine
+from .rasterizer import rasterize_footprint, rasterize_objects
+try:
+    from ..simulation.exporters import iter_sdf, wall_boxes_from_grid, write_chunks
+except ImportError:  # src/ on sys.path (world_gen imported as a top-level package)
+    from simulation.exporters import iter_sdf, wall_boxes_from_grid, write_chunks
 
 @dataclass
 class Pose:
@@ -29,20 +35,25 @@ class Room:
     data: Dict
 
 class HospitalGenerator:
-    def __init__(self, width: int = 20, height: int = 20, resolution: float = 0.1):
+    def __init__(self, width: int = 20, height: int = 20, resolution: float = 0.1, seed: Optional[int] = None):
         self.width_m = width
         self.height_m = height
         self.resolution = resolution
+        self.rng = random.Random(seed) # private RNG: generators never touch global random state
         self.grid_width = int(width / resolution)
         self.grid_height = int(height / resolution)
         # 0: free, 100: occupied, -1: unknown
         self.grid = np.zeros((self.grid_height, self.grid_width), dtype=np.int8)
         self.objects: List[Object] = []
+        self.layers: Dict[str, np.ndarray] = {} # per-type footprint masks, see rasterize_layers()
         self.rooms: List[Room] = []
         self.object_counts = {"bed": 0, "person": 0, "door": 0}
 
-    def generate_layout(self, num_wards: int = 2):
-        """Simple procedural generation of wards connected by a corridor."""
+    def generate_layout(self, num_wards: int = 2, num_people: Optional[int] = None):
+        """
+        Simple procedural generation of wards connected by a corridor.
+        num_people defaults to 1.5 per ward; dense stress worlds can ask for hundreds.
+        """
         # 1. Clear grid (fill with walls initially? No, let's start empty and build walls)
         # Actually standard Nav2 map: 0 is free, 100 is occupied.
         # Let's say outer boundary is walls
@@ -63,15 +74,21 @@ class HospitalGenerator:
         placed_wards = 0
         trials = 0
         while placed_wards < num_wards and trials < 50:
-            side = random.choice(['left', 'right'])
+            side = self.rng.choice(['left', 'right'])
             if side == 'left':
-                x = random.randint(1, corridor_x - ward_w - 1)
+                x = self.rng.randint(1, corridor_x - ward_w - 1)
             else:
-                x = random.randint(corridor_x + corridor_w + 1, self.grid_width - ward_w - 1)
+                x = self.rng.randint(corridor_x + corridor_w + 1, self.grid_width - ward_w - 1)
             
-            y = random.randint(1, self.grid_height - ward_h - 1)
+            y = self.rng.randint(1, self.grid_height - ward_h - 1)
+            trials += 1
+            
+            # Reject wards overlapping an existing ward (1-cell wall margin)
+            if any(x < r.x + r.width + 1 and r.x < x + ward_w + 1 and
+                   y < r.y + r.height + 1 and r.y < y + ward_h + 1
+                   for r in self.rooms if r.type == "ward"):
+                continue
             
-            # Check overlap logic could go here, simplified for now:
             # Connect to corridor
             self._clear_rect(x, y, ward_w, ward_h)
             
@@ -112,10 +129,9 @@ class HospitalGenerator:
             self._place_beds_in_ward(x, y, ward_w, ward_h)
 
             placed_wards += 1
-            trials += 1
             
         # 4. Place People (Randomly in free space)
-        self._place_random_people(int(num_wards * 1.5))
+        self._place_random_people(int(num_wards * 1.5) if num_people is None else num_people)
 
     def initialize_map(self):
         self.grid.fill(100) # Walls
@@ -149,16 +165,17 @@ class HospitalGenerator:
              self._paint_object_on_grid(obj)
 
     def _paint_object_on_grid(self, obj: Object):
-        # Simple rasterization
-        gx = int(obj.pose.x / self.resolution)
-        gy = int(obj.pose.y / self.resolution)
-        gw = int(obj.dims[0] / self.resolution)
-        gh = int(obj.dims[1] / self.resolution)
-        
-        # Simple AABB assumption for now
-        x0 = gx - gw//2
-        y0 = gy - gh//2
-        self.grid[y0:y0+gh, x0:x0+gw] = 100
+        # Oriented footprint (respects pose.theta), rasterized inside its bounding window only
+        window, mask = rasterize_footprint(obj, self.grid.shape, self.resolution)
+        self.grid[window][mask] = 100
+
+    def rasterize_layers(self) -> Dict[str, np.ndarray]:
+        """
+        Rasterizes every object (beds, doors, people) into one boolean grid per type
+        in a single batched pass, so costmap layers always match the object list.
+        """
+        self.layers = rasterize_objects(self.objects, self.grid.shape, self.resolution)
+        return self.layers
 
     def _place_beds_in_ward(self, wx, wy, ww, wh):
         # Place 1-2 beds
@@ -168,15 +185,15 @@ class HospitalGenerator:
         by = (wy + wh/2) * self.resolution
         self.add_object("bed", bx, by, 0.0)
 
-    def _place_random_people(self, count):
-        for _ in range(count):
-            # Try to report a free spot 
-            for _ in range(100):
-                rx = random.randint(1, self.grid_width-2)
-                ry = random.randint(1, self.grid_height-2)
-                if self.grid[ry, rx] == 0:
-                    self.add_object("person", rx*self.resolution, ry*self.resolution, random.uniform(0, 6.28))
-                    break
+    def _place_random_people(self, count, min_gap: float = 0.2):
+        """
+        Rejection-free placement over the free cells (beds are already painted),
+        with a spatial hash enforcing person-person separation.
+        """
+        engine = PlacementEngine(self.grid, self.resolution, self.rng)
+        radius = 0.25 # person footprint 0.5 x 0.5
+        for px, py in engine.place(count, radius, min_gap=min_gap):
+            self.add_object("person", px, py, self.rng.uniform(0, 6.28))
 
     def to_dict(self):
         return {
@@ -217,72 +234,17 @@ occupied_thresh: 0.65
 free_thresh: 0.196
 """)
 
-    def save_sdf(self, path):
-        """Export to Gazebo SDF format."""
-        
-        sdf_content =f"""<?xml version="1.0" ?>
-<sdf version="1.6">
-  <world name="hospital_world">
-    <include>
-      <uri>model://sun</uri>
-    </include>
-    <include>
-      <uri>model://ground_plane</uri>
-    </include>
-
-    <!-- Walls from Grid (Simplified: just boundary for now or full extrude?) -->
-    <!-- For simplicity, we just place the objects. The map corresponds to the static walls. 
-         Ideally we generate collision geometry for walls. -->
-    
-    <model name="hospital_walls">
-      <static>true</static>
-      <link name="link">
-        <collision name="collision">
-          <geometry>
-            <heightmap>
-              <uri>file://{os.path.basename(path).replace('.world', '')}/map.pgm</uri>
-              <size>{self.width_m} {self.height_m} 2</size> <!-- 2m high walls -->
-              <pos>0 0 0</pos>
-            </heightmap>
-          </geometry>
-        </collision>
-        <visual name="visual">
-          <geometry>
-            <heightmap>
-              <texture>
-                <diffuse>file://media/materials/textures/dirt_diffusespecular.png</diffuse>
-                <normal>file://media/materials/textures/flat_normal.png</normal>
-                <size>1</size>
-              </texture>
-              <uri>file://{os.path.basename(path).replace('.world', '')}/map.pgm</uri>
-              <size>{self.width_m} {self.height_m} 2</size>
-              <pos>0 0 0</pos>
-            </heightmap>
-          </geometry>
-        </visual>
-      </link>
-    </model>
-"""
-        # Add Objects
-        for obj in self.objects:
-            model_uri = "model://cube_20k" # Default placeholder
-            if obj.type == "bed": model_uri = "model://aws_robomaker_hospital_bed_01"
-            elif obj.type == "person": model_uri = "model://person_standing"
-            elif obj.type == "door": model_uri = "model://door"
-            
-            # Z position: 0 for now.
-            
-            sdf_content += f"""
-    <include>
-      <uri>{model_uri}</uri>
-      <name>{obj.id}</name>
-      <pose>{obj.pose.x} {obj.pose.y} 0 0 0 {obj.pose.theta}</pose>
-    </include>
-"""
-
-        sdf_content += """
-  </world>
-</sdf>
-"""
-        with open(path, 'w') as f:
-            f.write(sdf_content)
+    def save_sdf(self, path, walls: str = "boxes"):
+        """
+        Export to Gazebo SDF format (streamed).
+        walls="boxes" emits greedy-meshed box collision primitives extruded from the grid;
+        walls="heightmap" references the PGM map instead.
+        """
+        if walls == "boxes":
+            write_chunks(path, iter_sdf(self.to_dict(), wall_boxes=wall_boxes_from_grid(self.grid, self.resolution)))
+        elif walls == "heightmap":
+            heightmap_uri = f"file://{os.path.basename(path).replace('.world', '')}/map.pgm"
+            write_chunks(path, iter_sdf(self.to_dict(), heightmap_uri=heightmap_uri,
+                                        size=(self.width_m, self.height_m)))
+        else:
+            raise ValueError(f"Unknown wall mode: {walls}")
@@ -0,0 +1,156 @@
+import math
+import random
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class SpatialHash:
+    """
+    Uniform-grid hash of placed discs for O(1) minimum-separation queries.
+    A disc is clear if it is at least (r_a + r_b + min_gap) away from every stored disc.
+    """
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, float]]] = {}
+        self.max_radius = 0.0
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, x: float, y: float, radius: float):
+        self.cells.setdefault(self._key(x, y), []).append((x, y, radius))
+        self.max_radius = max(self.max_radius, radius)
+
+    def is_clear(self, x: float, y: float, radius: float, min_gap: float = 0.0) -> bool:
+        reach = radius + self.max_radius + min_gap
+        rings = int(math.ceil(reach / self.cell_size))
+        cx, cy = self._key(x, y)
+        for ix in range(cx - rings, cx + rings + 1):
+            for iy in range(cy - rings, cy + rings + 1):
+                for ox, oy, orad in self.cells.get((ix, iy), ()):
+                    sep = radius + orad + min_gap
+                    if (x - ox)**2 + (y - oy)**2 < sep * sep:
+                        return False
+        return True
+
+class PlacementEngine:
+    """
+    Rejection-free object placement on an occupancy grid (Poisson-disk style).
+
+    Candidates are the free cells (np.flatnonzero(grid == free_value)) visited in a
+    random order drawn once from the caller's RNG. Each candidate is tested exactly
+    once against the wall clearance field and the SpatialHash of placed objects, so
+    placing k objects costs O(free cells) in the worst case instead of unbounded retries.
+    Constraints only tighten as objects are added, so a rejected candidate never needs
+    revisiting.
+
+    Objects are disc footprints (a list of disc centers relative to the object pose
+    plus a radius), which never overlap each other nor the walls.
+    """
+    CHUNK = 4096
+    
+    def __init__(self, grid: np.ndarray, resolution: float, rng: Optional[random.Random] = None,
+                 free_value: int = 0, cell_size: float = 1.0):
+        self.grid = grid
+        self.resolution = resolution
+        self.free_value = free_value
+        self.rng = rng if rng is not None else random.Random()
+        # Private NumPy generator derived from the caller's RNG keeps placement reproducible
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.hash = SpatialHash(cell_size)
+
+        # Lower bound (m) on the distance from each free cell center to the nearest occupied
+        # cell: the EDT is center-to-center, and a cell's corner lies sqrt(0.5) cells from it
+        free = grid == free_value
+        self.clearance = (distance_transform_edt(free) - np.sqrt(0.5)) * resolution
+        self.clearance[~free] = -np.inf
+
+        self._order = None   # shuffled free-cell indices (global placement)
+        self._cursor = 0
+
+    def cell_center(self, flat_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        rows, cols = np.unravel_index(flat_idx, self.grid.shape)
+        return (cols + 0.5) * self.resolution, (rows + 0.5) * self.resolution
+
+    def wall_clearance(self, x: float, y: float) -> float:
+        """Lower bound on the clearance at an arbitrary point (cell-center value minus offset)."""
+        col, row = int(math.floor(x / self.resolution)), int(math.floor(y / self.resolution))
+        if not (0 <= row < self.grid.shape[0] and 0 <= col < self.grid.shape[1]):
+            return -np.inf
+        cx, cy = (col + 0.5) * self.resolution, (row + 0.5) * self.resolution
+        return self.clearance[row, col] - math.hypot(x - cx, y - cy)
+
+    def reserve(self, x: float, y: float, radius: float, footprint: Sequence[Tuple[float, float]] = ((0.0, 0.0),)):
+        """Registers an object placed by other means so later placements keep clear of it."""
+        for dx, dy in footprint:
+            self.hash.insert(x + dx, y + dy, radius)
+
+    def try_place(self, x: float, y: float, radius: float, min_gap: float = 0.0,
+                  footprint: Sequence[Tuple[float, float]] = ((0.0, 0.0),)) -> bool:
+        for dx, dy in footprint:
+            if self.wall_clearance(x + dx, y + dy) < radius:
+                return False
+            if not self.hash.is_clear(x + dx, y + dy, radius, min_gap):
+                return False
+        self.reserve(x, y, radius, footprint)
+        return True
+
+    def place(self, count: int, radius: float, min_gap: float = 0.0,
+              window: Optional[Tuple[float, float, float, float]] = None,
+              footprint: Sequence[Tuple[float, float]] = ((0.0, 0.0),)) -> List[Tuple[float, float]]:
+        """
+        Places up to `count` objects. Returns their (x, y) positions (fewer if space runs out).
+
+        Args:
+            radius: Footprint disc radius (m).
+            min_gap: Extra separation between any two placed discs (m).
+            window: Optional (x0, y0, x1, y1) bounds in meters for the object position.
+                    Window candidates are shuffled locally; global placement consumes one
+                    shared shuffled order, so successive calls stay linear overall.
+            footprint: Disc centers relative to the object position.
+        """
+        placed = []
+        if count <= 0:
+            return placed
+
+        if window is None:
+            if self._order is None:
+                self._order = self.np_rng.permutation(np.flatnonzero(self.grid == self.free_value))
+            candidates = self._order
+            start = self._cursor
+        else:
+            candidates = self._window_candidates(window)
+            start = 0
+
+        consumed = 0
+        # Convert candidates to coordinates in chunks so small requests never touch the whole grid
+        for lo in range(start, len(candidates), self.CHUNK):
+            xs, ys = self.cell_center(candidates[lo:lo + self.CHUNK])
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                consumed += 1
+                if self.try_place(x, y, radius, min_gap, footprint):
+                    placed.append((x, y))
+                    if len(placed) == count:
+                        break
+            if len(placed) == count:
+                break
+
+        if window is None:
+            self._cursor += consumed
+        return placed
+
+    def _window_candidates(self, window: Tuple[float, float, float, float]) -> np.ndarray:
+        x0, y0, x1, y1 = window
+        r = self.resolution
+        c0, c1 = max(0, int(math.floor(x0 / r))), min(self.grid.shape[1], int(math.ceil(x1 / r)))
+        r0, r1 = max(0, int(math.floor(y0 / r))), min(self.grid.shape[0], int(math.ceil(y1 / r)))
+        if c0 >= c1 or r0 >= r1:
+            return np.empty(0, dtype=np.intp)
+
+        rows, cols = np.nonzero(self.grid[r0:r1, c0:c1] == self.free_value)
+        rows, cols = rows + r0, cols + c0
+        # Keep cells whose centers fall inside the window
+        cx, cy = (cols + 0.5) * r, (rows + 0.5) * r
+        keep = (cx >= x0) & (cx <= x1) & (cy >= y0) & (cy <= y1)
+        flat = np.ravel_multi_index((rows[keep], cols[keep]), self.grid.shape)
+        return self.np_rng.permutation(flat)
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Object types drawn as discs (diameter = dims[0]); everything else is an oriented rectangle
+DISC_TYPES = ("person",)
+
+# Candidate cells processed per vectorized chunk
+_CHUNK_CELLS = 1 << 16
+
+def _window_offsets(half_cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    off = np.arange(-half_cells, half_cells + 1)
+    return np.meshgrid(off, off, indexing='ij')  # (rows, cols)
+
+def _paint(layer: np.ndarray, resolution: float, centers: np.ndarray, bound_r: np.ndarray, inside_fn,
+           origin: Tuple[int, int] = (0, 0)):
+    """
+    Shared batched painter. Objects are grouped by bounding-window size so a few large
+    objects do not inflate the window of thousands of small ones; each group is tested
+    in one vectorized pass over a (K, w, w) stack of candidate cell centers.
+
+    `layer` covers grid cells [r0:r0+h, c0:c0+w] with (r0, c0) = origin; cell centers are
+    computed in grid coordinates, so a window gives exactly the full-grid result.
+    """
+    h, w = layer.shape
+    r0, c0 = origin
+    half_cells = np.ceil(bound_r / resolution).astype(np.int64) + 1
+
+    for hc in np.unique(half_cells):
+        group = np.flatnonzero(half_cells == hc)
+        d_rows, d_cols = _window_offsets(int(hc))
+        # Chunk the (K, w, w) stack so temporaries stay cache-sized
+        chunk = max(1, _CHUNK_CELLS // d_rows.size)
+
+        for lo in range(0, len(group), chunk):
+            sel = group[lo:lo + chunk]
+            c_row = np.floor(centers[sel, 1] / resolution).astype(np.int64)
+            c_col = np.floor(centers[sel, 0] / resolution).astype(np.int64)
+            rows = c_row[:, None, None] + d_rows[None]
+            cols = c_col[:, None, None] + d_cols[None]
+
+            # Cell centers relative to each object's center (meters)
+            px = (cols + 0.5) * resolution - centers[sel, 0][:, None, None]
+            py = (rows + 0.5) * resolution - centers[sel, 1][:, None, None]
+
+            rows, cols = rows - r0, cols - c0
+            mask = inside_fn(sel, px, py) & (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+            # Index the layer itself (not a reshape) so non-contiguous `out` views are written through
+            layer[rows[mask], cols[mask]] = True
+
+def rasterize_obbs(shape: Tuple[int, int], resolution: float, centers: np.ndarray,
+                   half_extents: np.ndarray, thetas: np.ndarray, out: Optional[np.ndarray] = None,
+                   origin: Tuple[int, int] = (0, 0)) -> np.ndarray:
+    """
+    Paints oriented rectangles (cell-center-in-OBB test).
+
+    Args:
+        centers: (K, 2) x, y in meters
+        half_extents: (K, 2) half length (along theta) and half width
+        thetas: (K,) yaw in radians
+        origin: grid (row, col) of the layer's first cell when `shape` is a window
+    """
+    layer = np.zeros(shape, dtype=bool) if out is None else out
+    if len(centers) == 0:
+        return layer
+    centers = np.asarray(centers, dtype=np.float64)
+    half_extents = np.asarray(half_extents, dtype=np.float64)
+    cos_t, sin_t = np.cos(thetas), np.sin(thetas)
+
+    def inside(sel, px, py):
+        c, s = cos_t[sel][:, None, None], sin_t[sel][:, None, None]
+        u = c * px + s * py
+        v = -s * px + c * py
+        return (np.abs(u) <= half_extents[sel, 0][:, None, None]) & (np.abs(v) <= half_extents[sel, 1][:, None, None])
+
+    _paint(layer, resolution, centers, np.hypot(half_extents[:, 0], half_extents[:, 1]), inside, origin)
+    return layer
+
+def rasterize_discs(shape: Tuple[int, int], resolution: float, centers: np.ndarray,
+                    radii: np.ndarray, out: Optional[np.ndarray] = None,
+                    origin: Tuple[int, int] = (0, 0)) -> np.ndarray:
+    """Paints discs (cell-center-in-circle test). centers: (K, 2) meters, radii: (K,) meters."""
+    layer = np.zeros(shape, dtype=bool) if out is None else out
+    if len(centers) == 0:
+        return layer
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+
+    def inside(sel, px, py):
+        r = radii[sel][:, None, None]
+        return px * px + py * py <= r * r
+
+    _paint(layer, resolution, centers, radii, inside, origin)
+    return layer
+
+def rasterize_objects(objects: Iterable, shape: Tuple[int, int], resolution: float) -> Dict[str, np.ndarray]:
+    """
+    Rasterizes an object list into one boolean layer per object type.
+    Accepts the generator's Object dataclasses (pose.x/pose.y/pose.theta, dims).
+    """
+    by_type: Dict[str, List] = {}
+    for obj in objects:
+        by_type.setdefault(obj.type, []).append(obj)
+
+    layers = {}
+    for otype, objs in by_type.items():
+        centers = np.array([[o.pose.x, o.pose.y] for o in objs], dtype=np.float64)
+        dims = np.array([o.dims[:2] for o in objs], dtype=np.float64)
+        if otype in DISC_TYPES:
+            layers[otype] = rasterize_discs(shape, resolution, centers, dims[:, 0] / 2.0)
+        else:
+            thetas = np.array([o.pose.theta for o in objs], dtype=np.float64)
+            layers[otype] = rasterize_obbs(shape, resolution, centers, dims / 2.0, thetas)
+    return layers
+
+def rasterize_footprint(obj, shape: Tuple[int, int], resolution: float) -> Tuple[Tuple[slice, slice], np.ndarray]:
+    """
+    One object's footprint, rasterized only inside its bounding window.
+
+    Returns (window, mask): `window` is a (row, col) slice pair into a grid of `shape`
+    and `mask` the boolean footprint over that window, so painting objects one at a
+    time costs O(footprint) each instead of O(grid).
+    """
+    h, w = shape
+    x, y, theta = obj.pose.x, obj.pose.y, obj.pose.theta
+    dims = np.asarray(obj.dims[:2], dtype=np.float64)
+    disc = obj.type in DISC_TYPES
+    pad = (dims[0] / 2.0 if disc else np.hypot(dims[0], dims[1]) / 2.0) + resolution
+    r0 = min(h, max(0, int(np.floor((y - pad) / resolution))))
+    r1 = min(h, max(r0, int(np.ceil((y + pad) / resolution)) + 1))
+    c0 = min(w, max(0, int(np.floor((x - pad) / resolution))))
+    c1 = min(w, max(c0, int(np.ceil((x + pad) / resolution)) + 1))
+
+    window_shape = (r1 - r0, c1 - c0)
+    center = np.array([[x, y]], dtype=np.float64)
+    if disc:
+        mask = rasterize_discs(window_shape, resolution, center, dims[:1] / 2.0, origin=(r0, c0))
+    else:
+        mask = rasterize_obbs(window_shape, resolution, center, dims[None] / 2.0, np.array([theta]), origin=(r0, c0))
+    return (slice(r0, r1), slice(c0, c1)), mask
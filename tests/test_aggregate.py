@@ -0,0 +1,112 @@
+import sys
+import os
+import json
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from safety_transfer_hospital.analysis.aggregate import ResultsAggregator, bootstrap_means, load_episode_metrics, evaluate_world
+from src.metrics.safety_evaluator import SafetyConfig
+from src.metrics.thresholds import DEFAULT_THRESHOLDS
+from safety_transfer_hospital.analysis.compare_risk_levels import compare_risk_levels
+
+def _write_world(root, name, risk, rng):
+    world = os.path.join(root, name)
+    objects = [{"id": f"person_{i}", "type": "person", "x": x, "y": y, "yaw": 0.0}
+               for i, (x, y) in enumerate(rng.uniform(0, 10, (5, 2)))]
+    os.makedirs(world)
+    with open(os.path.join(world, "objects.json"), "w") as f:
+        json.dump({"objects": objects, "meta": {"risk_index": risk}}, f)
+    for policy, spread in (("baseline", 10.0), ("ours", 2.0)):
+        os.makedirs(os.path.join(world, "episodes", policy))
+        for e in range(4):
+            # "ours" stays near a corner away from most people
+            xy = rng.uniform(0, spread, (50, 2))
+            log = pd.DataFrame({"t": np.arange(50) * 0.1, "x": xy[:, 0], "y": xy[:, 1], "v_lin": 0.5})
+            log.to_csv(os.path.join(world, "episodes", policy, f"episode_{e:02d}_log.csv"), index=False)
+
+def test_results_aggregator():
+    print("Testing bootstrap aggregation over world directories...")
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, risk in enumerate([1.0, 1.5, 3.0, 5.0, 6.0]):
+            _write_world(tmp, f"world_{i:03d}", risk, rng)
+
+        episodes = load_episode_metrics(tmp)
+        assert len(episodes) == 5 * 2 * 4 and set(episodes.policy) == {"baseline", "ours"}
+        assert os.path.exists(os.path.join(tmp, "world_000", "episode_metrics.csv"))
+        pd.testing.assert_frame_equal(load_episode_metrics(tmp), episodes)  # served from cache
+
+        agg = ResultsAggregator(episodes, n_boot=2000)
+        table = agg.stratified("SVR")
+        assert set(table["Risk Category"]) == {"Low Risk", "Medium Risk", "High Risk"}
+        assert (table.ci_lo <= table["mean"]).all() and (table["mean"] <= table.ci_hi).all()
+
+        report = agg.paired("baseline", "ours", "SVR")
+        assert (report.n_pairs == np.array([8, 4, 8])).all()
+        assert np.allclose(report.delta, report.svr_ours - report.svr_base)
+        assert (report.delta_lo <= report.delta).all() and (report.delta <= report.delta_hi).all()
+        assert compare_risk_levels(tmp, n_boot=500) is not None
+
+    # Both resampling paths agree with the analytic standard error of the mean
+    values = rng.binomial(200, 0.1, 20_000) / 200       # few distinct values: multinomial path
+    assert np.isclose(bootstrap_means(values, 4000).std(), values.std() / np.sqrt(len(values)), rtol=0.1)
+    values = rng.random(5_000)                          # continuous: index-matrix path
+    assert np.isclose(bootstrap_means(values, 4000).std(), values.std() / np.sqrt(len(values)), rtol=0.1)
+
+    # 10k resamples over 100k paired episodes
+    n = 100_000
+    frame = pd.DataFrame({"world": np.arange(n) // 20, "risk": rng.uniform(0, 10, n // 20).repeat(20),
+                          "episode": np.arange(n) % 20})
+    episodes = pd.concat([frame.assign(policy="baseline", SVR=rng.binomial(200, 0.1, n) / 200),
+                          frame.assign(policy="ours", SVR=rng.binomial(200, 0.04, n) / 200)], ignore_index=True)
+    t0 = time.perf_counter()
+    report = ResultsAggregator(episodes, n_boot=10_000).paired("baseline", "ours")
+    elapsed = time.perf_counter() - t0
+    assert (report.improvement_lo > 0.5).all()
+    print(f"SUCCESS: paired bootstrap (10k resamples, {n} episodes) in {elapsed:.2f}s.")
+
+def test_episode_metrics_cache_invalidation():
+    print("Testing episode_metrics.csv cache invalidation...")
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_world(tmp, "world_000", 2.5, rng)
+        world = os.path.join(tmp, "world_000")
+        cached = os.path.join(world, "episode_metrics.csv")
+        first = evaluate_world(world)
+        stamp = os.stat(cached).st_mtime_ns
+
+        # Unchanged inputs: served from the cache file
+        pd.testing.assert_frame_equal(evaluate_world(world), first)
+        assert os.stat(cached).st_mtime_ns == stamp
+
+        # A new policy directory added after caching is picked up
+        os.makedirs(os.path.join(world, "episodes", "new_policy"))
+        first_log = os.path.join(world, "episodes", "baseline", "episode_00_log.csv")
+        pd.read_csv(first_log).to_csv(os.path.join(world, "episodes", "new_policy", "episode_00_log.csv"), index=False)
+        second = evaluate_world(world)
+        assert len(second) == len(first) + 1 and "new_policy" in set(second.policy)
+
+        # Rewriting a log recomputes it
+        log = pd.read_csv(first_log)
+        log[["x", "y"]] = 50.0    # far from everyone
+        log.to_csv(first_log, index=False)
+        os.utime(first_log, ns=(stamp + 10**9, stamp + 10**9))
+        third = evaluate_world(world)
+        row = third[(third.policy == "baseline") & (third.episode == "episode_00_log")]
+        assert row.SVR.iloc[0] == 0.0
+
+        # Other thresholds recompute; the default thresholds then recompute again
+        wide = SafetyConfig(thresholds=DEFAULT_THRESHOLDS.scaled(100.0).to_config())
+        widened = evaluate_world(world, config=wide)
+        assert (widened[widened.episode != "episode_00_log"].SVR == 1.0).all()
+        pd.testing.assert_frame_equal(evaluate_world(world), third)
+    print("SUCCESS: Cache follows episode files and thresholds.")
+
+if __name__ == "__main__":
+    test_results_aggregator()
+    test_episode_metrics_cache_invalidation()
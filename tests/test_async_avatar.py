@@ -0,0 +1,117 @@
+import sys
+import os
+import time
+import asyncio
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.avatar_interface import AvatarInterface, AsyncAvatarClient
+
+def make_did_stub(polls_until_done: int = 3):
+    """Local stand-in for the D-ID talks API."""
+    stub = FastAPI()
+    stub.state.polls = {}
+
+    @stub.post("/talks", status_code=201)
+    async def create_talk(body: dict):
+        talk_id = f"tlk_{len(stub.state.polls)}"
+        stub.state.polls[talk_id] = 0
+        return {"id": talk_id, "status": "created"}
+
+    @stub.get("/talks/{talk_id}")
+    async def get_talk(talk_id: str):
+        stub.state.polls[talk_id] += 1
+        if stub.state.polls[talk_id] < polls_until_done:
+            return {"id": talk_id, "status": "started"}
+        return {"id": talk_id, "status": "done", "result_url": f"https://videos.local/{talk_id}.mp4"}
+
+    return stub
+
+def test_async_avatar_client():
+    print("Testing async D-ID client against a local stub...")
+    avatar = AvatarInterface()
+    avatar.api_key = "test-key"
+    stub = make_did_stub()
+
+    async def run():
+        client = AsyncAvatarClient(avatar, poll_interval=0.01, transport=httpx.ASGITransport(app=stub))
+        # Several renders share one pooled client and overlap instead of queueing
+        urls = await asyncio.gather(*[client.create_video(f"line {i}") for i in range(5)])
+        await client.aclose()
+        return urls
+
+    urls = asyncio.run(run())
+    assert sorted(urls) == [f"https://videos.local/tlk_{i}.mp4" for i in range(5)]
+    print("SUCCESS: Async client polls the stub without blocking.")
+
+def test_async_avatar_non_json_responses():
+    print("Testing async D-ID client on non-JSON error pages...")
+    avatar = AvatarInterface()
+    avatar.api_key = "test-key"
+    html = "<html><body>502 Bad Gateway</body></html>"
+
+    def handler(create_status, poll_status, poll_body):
+        def handle(request):
+            if request.method == "POST":
+                if create_status != 201:
+                    return httpx.Response(create_status, text=html)
+                return httpx.Response(201, json={"id": "tlk_0"})
+            return httpx.Response(poll_status, text=poll_body)
+        return handle
+
+    async def run(create_status, poll_status=200, poll_body=html, create_body=None):
+        transport = httpx.MockTransport(handler(create_status, poll_status, poll_body))
+        if create_body is not None:
+            transport = httpx.MockTransport(lambda request: httpx.Response(201, text=create_body))
+        client = AsyncAvatarClient(avatar, poll_interval=0.01, timeout=1.0, transport=transport)
+        try:
+            return await client.create_video("hello")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run(502)) is None                      # create fails with an HTML page
+    assert asyncio.run(run(201, create_body=html)) is None    # 201 with a non-JSON body
+    assert asyncio.run(run(201, poll_status=502)) is None     # polling hits a proxy error
+    assert asyncio.run(run(201, poll_status=200)) is None     # 200 with an HTML body
+    print("SUCCESS: Non-JSON responses end the render with None instead of raising.")
+
+def test_command_returns_before_video():
+    print("Testing non-blocking /api/command...")
+    from src.ui import server
+
+    saved = server.avatar.api_key, server.avatar_client
+    server.avatar.api_key = "test-key"
+    server.avatar_client = AsyncAvatarClient(server.avatar, poll_interval=0.2,
+                                             transport=httpx.ASGITransport(app=make_did_stub()))
+    try:
+        with TestClient(server.app) as client, client.websocket_connect("/ws") as ws:
+            t0 = time.perf_counter()
+            resp = client.post("/api/command", json={"text": "Please hand the scalpel to the patient gently."})
+            elapsed = time.perf_counter() - t0
+            assert resp.status_code == 200 and elapsed < 0.3, "Command must not wait for the video"
+
+            update = ws.receive_json()
+            assert update["type"] == "UI_UPDATE" and update["avatar"]["video_pending"]
+            assert update["avatar"]["did_video_url"] is None and update["request_id"] == resp.json()["request_id"]
+
+            # The event loop keeps serving while the render is pending
+            t0 = time.perf_counter()
+            assert client.post("/api/command", json={"text": "reset layout"}).status_code == 200
+            assert time.perf_counter() - t0 < 0.3
+            assert ws.receive_json()["type"] == "RESET_LAYOUT"
+
+            video = ws.receive_json()
+            assert video["type"] == "AVATAR_VIDEO" and video["request_id"] == update["request_id"]
+            assert video["did_video_url"].endswith(".mp4")
+    finally:
+        server.avatar.api_key, server.avatar_client = saved
+    print("SUCCESS: UI update is immediate, video follows as AVATAR_VIDEO.")
+
+if __name__ == "__main__":
+    test_async_avatar_client()
+    test_async_avatar_non_json_responses()
+    test_command_returns_before_video()
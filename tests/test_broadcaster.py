@@ -0,0 +1,206 @@
+import sys
+import os
+import time
+import json
+import asyncio
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.broadcaster import Broadcaster, ClientChannel
+
+class FakeSocket:
+    """Stand-in for a WebSocket: records frames, optionally slow or failing."""
+    def __init__(self, delay: float = 0.0, fail_after: int = -1):
+        self.delay = delay
+        self.fail_after = fail_after
+        self.frames = []
+        self.closed = False
+
+    async def send_text(self, text: str):
+        if self.fail_after >= 0 and len(self.frames) >= self.fail_after:
+            raise ConnectionResetError("client went away")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        self.frames.append(text)
+
+    async def close(self):
+        self.closed = True
+
+def test_channel_policies():
+    print("Testing per-client overflow and coalescing policies...")
+
+    async def run():
+        ch = ClientChannel(FakeSocket(), maxsize=3, overflow="drop_oldest")
+        for i in range(5):
+            assert ch.offer(str(i))
+        assert [t for _, t in ch.pending] == ["2", "3", "4"] and ch.dropped == 2
+
+        ch = ClientChannel(FakeSocket(), maxsize=3, overflow="drop_newest")
+        for i in range(5):
+            assert ch.offer(str(i))
+        assert [t for _, t in ch.pending] == ["0", "1", "2"] and ch.dropped == 2
+
+        ch = ClientChannel(FakeSocket(), maxsize=2, overflow="disconnect")
+        assert ch.offer("a") and ch.offer("b")
+        assert not ch.offer("c")
+
+        # A keyed entry drops the stale one and queues at the tail: it never overtakes
+        # messages offered after the state it replaces
+        ch = ClientChannel(FakeSocket(), maxsize=8)
+        ch.offer("s1", key="ui")
+        ch.offer("e1")
+        ch.offer("s2", key="ui")
+        ch.offer("s3", key="ui")
+        assert [t for _, t in ch.pending] == ["e1", "s3"] and ch.coalesced == 2
+        assert ch.keyed["ui"] is ch.pending[-1]
+
+        # [UI_UPDATE r1, AVATAR_VIDEO r1] + UI_CLEAR: the clear is delivered after the video
+        ch = ClientChannel(FakeSocket(), maxsize=8)
+        ch.offer("UI_UPDATE r1", key="ui_state")
+        ch.offer("AVATAR_VIDEO r1")
+        ch.offer("UI_CLEAR", key="ui_state")
+        assert [t for _, t in ch.pending] == ["AVATAR_VIDEO r1", "UI_CLEAR"]
+
+        # Coalescing never grows the queue, even when it is full
+        ch = ClientChannel(FakeSocket(), maxsize=2, overflow="disconnect")
+        assert ch.offer("s1", key="ui") and ch.offer("e1") and ch.offer("s2", key="ui")
+        assert [t for _, t in ch.pending] == ["e1", "s2"] and ch.dropped == 0
+
+        # Dropping the oldest keyed entry releases its key
+        ch = ClientChannel(FakeSocket(), maxsize=2)
+        ch.offer("s1", key="ui")
+        ch.offer("e1")
+        ch.offer("e2")
+        assert "ui" not in ch.keyed
+        ch.offer("s2", key="ui")
+        assert [t for _, t in ch.pending] == ["e2", "s2"]
+
+    asyncio.run(run())
+    print("SUCCESS: drop_oldest / drop_newest / disconnect and coalescing behave as specified.")
+
+def test_broadcast_load_1000_clients():
+    print("Testing broadcast to 1000 simulated clients (fast, slow, failing)...")
+    n_msgs = 200
+
+    async def run():
+        b = Broadcaster(maxsize=16, overflow="drop_oldest", send_timeout=1.0)
+        fast = [FakeSocket() for _ in range(900)]
+        slow = [FakeSocket(delay=0.05) for _ in range(50)]
+        dead = [FakeSocket(fail_after=3) for _ in range(50)]
+        for ws in fast + slow + dead:
+            b.register(ws)
+
+        publish_time = 0.0
+        for i in range(n_msgs):
+            t0 = time.perf_counter()
+            b.publish({"type": "TICK", "seq": i})
+            b.publish({"type": "UI_UPDATE", "seq": i}, key="ui_state")
+            publish_time += time.perf_counter() - t0
+            await asyncio.sleep(0)   # let sender tasks run between publishes
+
+        for _ in range(100):
+            if all(not c.pending for c in b.clients.values()):
+                break
+            await asyncio.sleep(0.02)
+        stats = {"publish_time": publish_time, "evicted": b.evicted, "clients": len(b.clients)}
+        slow_channels = [b.clients[id(ws)] for ws in slow]
+        await b.close()
+        return stats, slow_channels
+
+    t0 = time.perf_counter()
+    stats, slow_channels = asyncio.run(run())
+    elapsed = time.perf_counter() - t0
+    print(f"  {2 * n_msgs} publishes to 1000 clients: publish {stats['publish_time'] * 1e3:.1f} ms, total {elapsed:.2f}s")
+
+    # Failed sends evict exactly the dead clients
+    assert stats["evicted"] == 50 and stats["clients"] == 950
+
+    # Slow clients never queue more than maxsize and lose messages instead of stalling others
+    assert all(c.dropped + c.coalesced > 0 for c in slow_channels)
+    assert all(len(c.websocket.frames) < 2 * n_msgs for c in slow_channels)
+    # Sends happen on the sender tasks, not in publish()
+    assert stats["publish_time"] < elapsed
+    print("SUCCESS: dead clients evicted, slow clients bounded, publish never awaits a send.")
+
+def test_fast_clients_receive_everything_in_order():
+    print("Testing ordering and single encoding for fast clients...")
+
+    async def run():
+        b = Broadcaster(maxsize=64)
+        sockets = [FakeSocket() for _ in range(1000)]
+        for ws in sockets:
+            b.register(ws)
+        for i in range(50):
+            assert b.publish({"type": "TICK", "seq": i}) == 1000
+            await asyncio.sleep(0)
+        for _ in range(100):
+            if all(not c.pending for c in b.clients.values()):
+                break
+            await asyncio.sleep(0.01)
+        await b.close()
+        return sockets
+
+    sockets = asyncio.run(run())
+    for ws in sockets:
+        assert [json.loads(t)["seq"] for t in ws.frames] == list(range(50))
+        assert ws.closed
+    # Encoded once: every client received the identical string objects
+    assert all(a is b for a, b in zip(sockets[0].frames, sockets[-1].frames))
+    print("SUCCESS: all 1000 clients got 50/50 messages in order, sharing one encoded frame each.")
+
+def test_unregister_and_disconnect_policy():
+    print("Testing unregister and the disconnect overflow policy...")
+
+    async def run():
+        b = Broadcaster(maxsize=3, overflow="disconnect")
+        stuck = FakeSocket(delay=10.0)
+        ok = FakeSocket()
+        b.register(stuck)
+        b.register(ok)
+        for i in range(5):
+            b.publish({"seq": i})
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        assert id(stuck) not in b.clients and stuck.closed and b.evicted == 1
+        assert not b.evictions  # eviction tasks were kept referenced until done
+        assert id(ok) in b.clients and len(ok.frames) == 5
+
+        b.unregister(ok)
+        b.unregister(ok)   # idempotent
+        assert not b.clients and not ok.closed
+
+    asyncio.run(run())
+    print("SUCCESS: overflowing client disconnected, unregister is idempotent.")
+
+def test_server_websocket_broadcast():
+    print("Testing dashboard websocket through the broadcaster...")
+    from fastapi.testclient import TestClient
+    from src.ui import server
+
+    saved_key, saved_client = server.avatar.api_key, server.avatar_client
+    server.avatar.api_key = None
+    server.avatar_client = server.AsyncAvatarClient(server.avatar)
+    try:
+        with TestClient(server.app) as client:
+            with client.websocket_connect("/ws") as ws:
+                assert len(server.manager.active_connections) == 1
+                resp = client.post("/api/command", json={"text": "Show me the heatmap"})
+                assert resp.status_code == 200
+                msg = ws.receive_json()
+                assert msg["type"] == "UI_UPDATE"
+                ws.send_text("clear")
+                assert ws.receive_json() == {"type": "UI_CLEAR"}
+        assert not server.manager.active_connections
+    finally:
+        server.avatar.api_key, server.avatar_client = saved_key, saved_client
+    print("SUCCESS: server broadcasts reach the dashboard and the connection is cleaned up.")
+
+if __name__ == "__main__":
+    test_channel_policies()
+    test_broadcast_load_1000_clients()
+    test_fast_clients_receive_everything_in_order()
+    test_unregister_and_disconnect_policy()
+    test_server_websocket_broadcast()
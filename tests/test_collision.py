@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulation.collision import GridCollisionChecker, DEFAULT_COLLISION_MODE
+from src.simulation.episode_runner import EpisodeRunner
+from src.training.population_trainer import make_scenario, batched_rollout
+from src.policy.constrained_policy import PolicyParams
+from src.world_gen.hospital_generator import HospitalGenerator
+from safety_transfer_hospital.sim_interface.runner import SimulationRunner, pure_pursuit_policy
+
+def test_collision_checker():
+    print("Testing grid collision checks...")
+    grid = np.zeros((100, 100), dtype=np.int8)
+    grid[:, 50:52] = 100  # wall occupying x in [5.0, 5.2) m
+    checker = GridCollisionChecker(grid, resolution=0.1, robot_radius=0.2)
+
+    # Conservative: never reports more clearance than the true distance to the wall
+    rng = np.random.default_rng(0)
+    xs, ys = rng.uniform(0.5, 9.5, 5000), rng.uniform(0.5, 9.5, 5000)
+    true = np.where(xs < 5.0, 5.0 - xs, np.where(xs >= 5.2, xs - 5.2, 0.0))
+    true = np.minimum(true, np.minimum.reduce([xs, ys, 10 - xs, 10 - ys]))
+    assert np.all(checker.clearance_at(xs, ys) <= true + 1e-9)
+    assert not checker.in_collision(np.array([4.5]), np.array([5.0]))[0]
+    assert checker.in_collision(np.array([4.9, -1.0]), np.array([5.0, 5.0])).all()
+
+    # Stop vs slide on a diagonal move into the wall
+    prev, new = np.array([[4.6, 5.0]]), np.array([[4.95, 5.3]])
+    stopped, hit = checker.resolve(prev, new, "stop")
+    assert hit[0] and np.allclose(stopped, prev)
+    slid, _ = checker.resolve(prev, new, "slide")
+    assert np.allclose(slid, [[4.6, 5.3]])
+
+    # Kinematic runners record contacts and never end up inside the wall
+    runner = EpisodeRunner({}, collision_checker=checker)
+    traj = runner.run_episode((2.0, 5.0, 0.0), (8.0, 5.0, 0.0), duration=20.0)
+    assert runner.collisions and max(s.x for s in traj) < 5.0 - 0.2 + 1e-9
+
+    sim = SimulationRunner(collision_checker=checker, collision_mode="slide")
+    sim.reset((2.0, 5.0, 0.0))
+    sim.run_episode(pure_pursuit_policy, (8.0, 5.0), max_steps=300)
+    assert sim.collisions and all(l["x"] < 5.0 for l in sim.logs)
+    assert sum(l["collision"] for l in sim.logs) == len(sim.collisions)
+    print("SUCCESS: Collision checks stop/slide robots at walls.")
+
+def test_diagonal_corner_clearance():
+    print("Testing clearance towards a diagonal wall corner...")
+    grid = np.zeros((30, 30), dtype=np.int8)
+    grid[10, 10] = 100  # one occupied cell: [10, 11) x [10, 11) m
+    checker = GridCollisionChecker(grid, resolution=1.0, robot_radius=0.75)
+
+    # Diagonal approach to the corner (11, 11): true distance 0.707 < robot radius
+    assert checker.clearance_at(np.array([11.5]), np.array([11.5]))[0] <= np.sqrt(0.5) + 1e-9
+    assert checker.in_collision(np.array([11.5]), np.array([11.5]))[0]
+
+    # Lower bound against the exact point-to-square distance everywhere around the cell
+    rng = np.random.default_rng(1)
+    xs, ys = rng.uniform(4.0, 17.0, 20000), rng.uniform(4.0, 17.0, 20000)
+    dx = np.maximum.reduce([10.0 - xs, np.zeros_like(xs), xs - 11.0])
+    dy = np.maximum.reduce([10.0 - ys, np.zeros_like(ys), ys - 11.0])
+    assert np.all(checker.clearance_at(xs, ys) <= np.hypot(dx, dy) + 1e-9)
+
+    # Every kinematic runner shares the same default contact response
+    runner = EpisodeRunner({})
+    sim = SimulationRunner()
+    scenario = make_scenario({"objects": []}, num_episodes=1, seed=0)
+    assert runner.collision_mode == sim.collision_mode == scenario.collision_mode == DEFAULT_COLLISION_MODE
+
+    # A world without free space fails fast instead of rejecting samples forever
+    blocked = GridCollisionChecker(np.full((20, 20), 100, dtype=np.int8), resolution=1.0)
+    try:
+        make_scenario({"width": 20, "height": 20, "objects": []}, num_episodes=4, collision=blocked, max_rounds=5)
+        assert False, "Expected ValueError for a world without collision-free poses"
+    except ValueError as e:
+        assert "20x20" in str(e) and "margin 1.0" in str(e)
+    print("SUCCESS: Corner clearance is a lower bound; collision modes agree.")
+
+def test_batched_rollout_collisions():
+    print("Testing collisions in 1024-env batched rollouts...")
+    gen = HospitalGenerator(width=20, height=20, seed=0)
+    gen.generate_layout(num_wards=3)
+    checker = GridCollisionChecker.from_generator(gen)
+    free = make_scenario(gen.to_dict(), num_episodes=1024, seed=1, max_steps=100)
+    walls = make_scenario(gen.to_dict(), num_episodes=1024, seed=1, max_steps=100, collision=checker)
+    assert not checker.in_collision(walls.starts[:, 0], walls.starts[:, 1]).any()
+
+    params = PolicyParams()
+    t0 = time.perf_counter(); batched_rollout(params, free); t_free = time.perf_counter() - t0
+    t0 = time.perf_counter(); res = batched_rollout(params, walls); t_walls = time.perf_counter() - t0
+    assert res.collision_rate > 0.0
+    print(f"SUCCESS: collision rate {res.collision_rate:.3f}, rollout {t_free:.2f}s -> {t_walls:.2f}s with checks.")
+
+if __name__ == "__main__":
+    test_collision_checker()
+    test_diagonal_corner_clearance()
+    test_batched_rollout_collisions()
@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.training.coreset import GeometricCoresetSelector, CoresetFeatures, extract_features
+
+def _episodes(rng, n_eps=40, steps=150):
+    eps = []
+    for e in range(n_eps):
+        df = pd.DataFrame({"t": np.arange(steps) * 0.1, "x": rng.uniform(0, 20, steps), "y": rng.uniform(0, 20, steps),
+                           "v_lin": rng.uniform(0, 1, steps), "d_person": rng.uniform(0, 8, steps)})
+        if e % 3 == 0:
+            df["d_bed"] = rng.uniform(0, 8, steps)
+        if e % 5 == 0:
+            df = df.drop(columns="d_person")
+        eps.append(df)
+    return eps
+
+def test_columnar_coreset():
+    print("Testing columnar coreset selection...")
+    rng = np.random.default_rng(0)
+    episodes = _episodes(rng)
+    selector = GeometricCoresetSelector()
+
+    # Features and risks match the row-by-row path
+    np.random.seed(0)
+    legacy = selector.select_coreset(episodes, select_ratio=0.2)
+    feats = extract_features(episodes)
+    for s in legacy[:200]:
+        i = np.flatnonzero((feats.episode_id == s["episode_id"]) & (feats.step_id == s["step_id"]))[0]
+        row = s["row"]
+        assert np.allclose(feats.X[i], [row.x, row.y, row.v_lin, min(10.0, row.get("d_person", 10.0), row.get("d_bed", 10.0))])
+        assert np.isclose(feats.risk[i], s["risk"], rtol=1e-6)
+
+    selection = selector.select_coreset_columnar(episodes, select_ratio=0.2, seed=0)
+    assert len(selection) == len(legacy)
+    assert len(np.unique(selection.index)) == len(selection)
+    # Same risk half as the legacy selector (no ties at the cut for continuous distances)
+    half = len(legacy) // 2
+    assert {(s["episode_id"], s["step_id"]) for s in legacy[:half]} == \
+        set(zip(selection.episode_id[:half].tolist(), selection.step_id[:half].tolist()))
+    samples = selection.to_samples(episodes)
+    assert samples[0]["row"].x == episodes[samples[0]["episode_id"]].x.iloc[samples[0]["step_id"]]
+
+    # Deterministic given a seed
+    again = selector.select_coreset_columnar(feats, select_ratio=0.2, seed=0)
+    assert np.array_equal(again.index, selection.index)
+
+    # Diversity half favors sparse regions: an isolated cluster is over-represented
+    n = 200_000
+    X = rng.normal(0, 1, (n, 4)).astype(np.float32)
+    X[:1000] += 6.0
+    dense = CoresetFeatures(X, np.ones(n, dtype=np.float32), np.zeros(n, np.int32), np.arange(n, dtype=np.int32))
+    picked = selector.select_coreset_columnar(dense, select_ratio=0.02, seed=0).index
+    assert np.mean(picked < 1000) > 5 * 1000 / n
+
+    # Millions of transitions without per-row objects
+    n = 2_000_000
+    big = CoresetFeatures(rng.random((n, 4), dtype=np.float32), rng.random(n, dtype=np.float32),
+                          np.repeat(np.arange(n // 200, dtype=np.int32), 200), np.tile(np.arange(200, dtype=np.int32), n // 200))
+    t0 = time.perf_counter()
+    selection = selector.select_coreset_columnar(big, select_ratio=0.05, seed=0)
+    elapsed = time.perf_counter() - t0
+    assert len(selection) == n // 20
+    print(f"SUCCESS: coreset of {len(selection)} from {n} transitions in {elapsed:.2f}s.")
+
+if __name__ == "__main__":
+    test_columnar_coreset()
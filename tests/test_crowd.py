@@ -0,0 +1,97 @@
+import sys
+import os
+import math
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulation.crowd import CrowdSimulator, TrajectoryBuffer
+from src.simulation.collision import GridCollisionChecker
+from src.metrics.safety_evaluator import SafetyEvaluator
+from src.metrics.thresholds import DEFAULT_THRESHOLDS
+from src.world_gen.hospital_generator import HospitalGenerator
+
+def test_crowd_simulation():
+    print("Testing vectorized social-force crowd...")
+    gen = HospitalGenerator(width=30, height=30, seed=0)
+    gen.generate_layout(num_wards=3)
+    rng = np.random.default_rng(0)
+    free_r, free_c = np.nonzero(GridCollisionChecker(gen.grid, gen.resolution, 0.5).clearance > 0.5)
+    pick = rng.choice(len(free_r), 100, replace=False)
+    start = np.column_stack([free_c[pick] + 0.5, free_r[pick] + 0.5]) * gen.resolution
+    sim = CrowdSimulator(start, gen.grid, gen.resolution, seed=0)
+
+    t0 = time.perf_counter()
+    buf = sim.run(100, dt=0.1)
+    per_tick = (time.perf_counter() - t0) / 100
+
+    assert buf.size == 101 and buf["x"].shape == (101, 100)
+    speeds = np.hypot(buf["vx"], buf["vy"])
+    assert speeds.max() <= sim.params.max_speed + 1e-4
+    assert speeds[-1].mean() > 0.3, "Crowd should be walking"
+    rows, cols = (buf["y"][-1] / gen.resolution).astype(int), (buf["x"][-1] / gen.resolution).astype(int)
+    assert not np.any(gen.grid[rows, cols] == 100), "Pedestrian inside a wall"
+
+    frame = buf.to_frame()
+    assert len(frame) == 101 * 100 and list(frame.columns) == ["t", "agent", "x", "y", "vx", "vy"]
+    print(f"SUCCESS: 100 pedestrians at {per_tick * 1e3:.1f} ms/tick.")
+
+def test_time_indexed_distances():
+    print("Testing time-indexed distances in SafetyEvaluator...")
+    rng = np.random.default_rng(1)
+    objects = [{"type": t, "pose": {"x": x, "y": y, "theta": 0.0}}
+               for t, x, y in zip(rng.choice(["bed", "person", "door"], 20), rng.uniform(0, 10, 20), rng.uniform(0, 10, 20))]
+    log = pd.DataFrame({"t": np.arange(50) * 0.1, "x": rng.uniform(0, 10, 50), "y": rng.uniform(0, 10, 50),
+                        "v_lin": np.full(50, 0.3)})
+
+    # Batched static distances match the per-object reference
+    timeline = SafetyEvaluator(objects).distance_timeline(log)
+    for k, row in log.iterrows():
+        for otype in ("bed", "person", "door"):
+            ref = min([math.sqrt((row.x - o['pose']['x'])**2 + (row.y - o['pose']['y'])**2)
+                       for o in objects if o['type'] == otype], default=float('inf'))
+            assert timeline[otype][k] == ref
+
+    # A pedestrian walking through a parked robot's position shows up only at those timestamps
+    buf = TrajectoryBuffer(1, capacity=4)
+    for i in range(21):
+        t = i * 0.1
+        buf.append(t, np.array([[3.0 + t * 2.0, 5.0]]), np.array([[2.0, 0.0]]))
+    robot = pd.DataFrame({"t": np.arange(21) * 0.1, "x": 5.0, "y": 5.0, "v_lin": 0.0})
+    static_metrics, _ = SafetyEvaluator([]).evaluate_episode(robot)
+    metrics, details = SafetyEvaluator([], crowd=buf).evaluate_episode(robot)
+    assert static_metrics["Red_Steps"] == 0
+    d_crit = DEFAULT_THRESHOLDS.crit_of("person")
+    assert metrics["Red_Steps"] == int(np.sum(np.abs(3.0 + robot.t * 2.0 - 5.0) < d_crit - 1e-9))
+    assert details["d_person"].iloc[10] < 1e-6
+    print("SUCCESS: Evaluator sees moving pedestrians at each timestamp.")
+
+def test_crowd_replaces_static_people():
+    print("Testing that walkers are not double-counted at their spawn points...")
+    # The world's person object is also the walker's spawn point; the walker leaves it
+    world = [{"type": "person", "pose": {"x": 5.0, "y": 5.0, "theta": 0.0}},
+             {"type": "bed", "pose": {"x": 9.0, "y": 9.0, "theta": 0.0}}]
+    buf = TrajectoryBuffer(1, capacity=4)
+    for i in range(21):
+        t = i * 0.1
+        buf.append(t, np.array([[5.0 - t * 2.0, 5.0]]), np.array([[-2.0, 0.0]]))
+    robot = pd.DataFrame({"t": np.arange(21) * 0.1, "x": 5.2, "y": 5.0, "v_lin": 0.0})
+
+    static_only, _ = SafetyEvaluator(world).evaluate_episode(robot)
+    metrics, details = SafetyEvaluator(world, crowd=buf).evaluate_episode(robot)
+    assert static_only["Red_Steps"] == 21
+    d_crit = DEFAULT_THRESHOLDS.crit_of("person")
+    walker_d = np.abs(5.0 - robot.t * 2.0 - 5.2)
+    assert metrics["Red_Steps"] == int(np.sum(walker_d < d_crit - 1e-9)) < 21
+    assert np.allclose(details["d_person"], walker_d, atol=1e-5)
+    # Other static types are unaffected
+    assert np.allclose(details["d_bed"], np.hypot(9.0 - 5.2, 4.0))
+    print("SUCCESS: Crowd positions replace the static person objects.")
+
+if __name__ == "__main__":
+    test_crowd_simulation()
+    test_time_indexed_distances()
+    test_crowd_replaces_static_people()
@@ -0,0 +1,92 @@
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.simulation.exporters import normalize_objects, wall_boxes_from_grid, merge_wall_rectangles, export_worlds_parallel
+from src.simulation.isaac_bridge import IsaacBridge
+from src.world_gen.hospital_generator import HospitalGenerator as GridGenerator
+from safety_transfer_hospital.world_gen.generator import HospitalGenerator
+
+def test_exporters():
+    print("Testing streaming world exporters...")
+    gen = GridGenerator(width=20, height=20, seed=1)
+    gen.generate_layout(num_wards=2)
+    grid_world = gen.to_dict()
+
+    sth = HospitalGenerator(seed=1)
+    sth.generate_layout()
+    sth.place_objects()
+    flat_world = {"objects": [o.to_dict() for o in sth.objects]}
+
+    # Both schemas normalize to the same record layout
+    a, b = normalize_objects(grid_world), normalize_objects(flat_world)
+    assert len(a) == len(grid_world['objects']) and len(b) == len(sth.objects)
+    assert a[0]['x'] == grid_world['objects'][0]['pose']['x']
+    assert b[0]['theta'] == sth.objects[0].to_dict()['yaw'] and len(b[0]['dims']) == 3
+
+    # Wall runs cover exactly the occupied cells
+    boxes = wall_boxes_from_grid(gen.grid, gen.resolution)
+    cells = ((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])).sum() / gen.resolution**2
+    assert np.isclose(cells, (gen.grid == 100).sum())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sdf = os.path.join(tmp, "hospital.world")
+        gen.save_sdf(sdf)
+        root = ET.parse(sdf).getroot()
+        names = [e.text for e in root.iter("name")]
+        assert names == [o['id'] for o in grid_world['objects']]
+
+        usd = IsaacBridge(export_dir=tmp).export_world(grid_world, grid=gen.grid, resolution=gen.resolution)
+        text = open(usd).read()
+        assert text.count('def Cube "Obj_') == len(grid_world['objects'])
+        assert text.count('def Cube "Wall_') == len(boxes)
+
+        jobs = [{"world": grid_world, "grid": gen.grid, "resolution": gen.resolution, "out_dir": tmp, "name": f"w{i}"}
+                for i in range(3)] + [{"world": flat_world, "out_dir": tmp, "name": "flat"}]
+        reports = export_worlds_parallel(jobs, workers=2)
+        assert [r['name'] for r in reports] == ["w0", "w1", "w2", "flat"]
+        assert set(reports[0]['paths']) == {"sdf", "usda", "obj"} and "obj" not in reports[3]['paths']
+        assert all(r['total_s'] >= 0 for r in reports)
+
+        obj_lines = open(reports[0]['paths']['obj']).read().splitlines()
+        assert sum(l.startswith("v ") for l in obj_lines) == 8 * len(boxes)
+        assert sum(l.startswith("f ") for l in obj_lines) == 6 * len(boxes)
+        ET.parse(reports[3]['paths']['sdf'])
+    print("SUCCESS: Exporters stream valid SDF/USDA/OBJ for both schemas.")
+
+def test_greedy_wall_meshing():
+    print("Testing greedy wall meshing...")
+    rng = np.random.default_rng(0)
+    mask = rng.random((120, 90)) < 0.3
+    mask[10:40, 20:70] = True  # a solid block merges into few rectangles
+    rects = merge_wall_rectangles(mask)
+
+    # Rectangles tile the occupied cells exactly, without overlap
+    painted = np.zeros(mask.shape, dtype=np.int32)
+    for c0, r0, c1, r1 in rects:
+        painted[r0:r1, c0:c1] += 1
+    assert np.array_equal(painted, mask.astype(np.int32))
+    assert merge_wall_rectangles(np.ones((50, 50), dtype=bool)).tolist() == [[0, 0, 50, 50]]
+
+    gen = GridGenerator(width=40, height=40, seed=2)
+    gen.generate_layout(num_wards=4)
+    merged = wall_boxes_from_grid(gen.grid, gen.resolution)
+    runs = wall_boxes_from_grid(gen.grid, gen.resolution, merge=False)
+    assert len(merged) * 5 < len(runs) < (gen.grid == 100).sum()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sdf = os.path.join(tmp, "hospital.world")
+        gen.save_sdf(sdf)
+        root = ET.parse(sdf).getroot()
+        assert not list(root.iter("heightmap"))
+        assert len(list(root.iter("collision"))) == len(merged)
+    print(f"SUCCESS: {len(runs)} wall runs merged into {len(merged)} boxes.")
+
+if __name__ == "__main__":
+    test_exporters()
+    test_greedy_wall_meshing()
@@ -0,0 +1,71 @@
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.planning.grid_planner import GridPlanner
+from src.simulation.episode_runner import EpisodeRunner
+from safety_transfer_hospital.sim_interface.runner import SimulationRunner, pure_pursuit_policy
+
+def _wall_with_door():
+    # 10 x 10 m at 0.1 m: a wall at x = 5 m with a door for y in [7, 9] m
+    grid = np.zeros((100, 100), dtype=np.int8)
+    grid[:, 50:52] = 100
+    grid[70:90, 50:52] = 0
+    return grid
+
+def _path_cost(planner, path):
+    cells = np.array([planner.to_cell(x, y) for x, y in path])
+    c = planner.cost[cells[:, 0], cells[:, 1]]
+    steps = np.hypot(*np.diff(cells, axis=0).T)
+    return float(np.sum(steps * 0.5 * (c[:-1] + c[1:])))
+
+def _hits_wall(grid, xs, ys, res=0.1):
+    return bool(np.any(grid[(np.asarray(ys) / res).astype(int), (np.asarray(xs) / res).astype(int)] == 100))
+
+def test_grid_planner():
+    print("Testing grid planner baselines...")
+    grid = _wall_with_door()
+    planner = GridPlanner(grid, resolution=0.1)
+    start, goal = (2.0, 2.0), (8.0, 2.0)
+
+    path = planner.plan(start, goal)
+    assert path is not None and not _hits_wall(grid, path[:, 0], path[:, 1])
+    assert path[:, 1].max() > 7.0, "Path must detour through the door"
+    assert np.all(np.isfinite(planner.cost[(path[:, 1] / 0.1).astype(int), (path[:, 0] / 0.1).astype(int)]))
+
+    # A* is optimal: matches the Dijkstra cost-to-go of the same start
+    dist, _ = planner.flood([goal])
+    assert abs(_path_cost(planner, path) - dist[planner.to_cell(*start)]) < 1e-6
+
+    # One flood fill serves many starts
+    starts = [(1.0, 1.0), (3.0, 9.0), (9.0, 9.0), (5.1, 5.0)]
+    paths = planner.plan_many(starts, [goal])
+    assert paths[3] is None  # inside the wall
+    for p in paths[:3]:
+        assert planner.to_cell(*p[-1]) == planner.to_cell(*goal)
+        assert not _hits_wall(grid, p[:, 0], p[:, 1])
+
+    # Closed door -> unreachable
+    closed = grid.copy()
+    closed[:, 50:52] = 100
+    assert GridPlanner(closed, 0.1).plan(start, goal) is None
+
+    # Runners: straight-line baselines cross the wall, planned ones do not
+    straight = EpisodeRunner({}).run_episode((*start, 0.0), (*goal, 0.0), duration=60.0)
+    assert _hits_wall(grid, [s.x for s in straight], [s.y for s in straight])
+    planned = EpisodeRunner({}, planner=planner).run_episode((*start, 0.0), (*goal, 0.0), duration=60.0)
+    assert not _hits_wall(grid, [s.x for s in planned], [s.y for s in planned])
+    assert np.hypot(planned[-1].x - goal[0], planned[-1].y - goal[1]) < 0.3
+
+    sim = SimulationRunner()
+    sim.reset((*start, 0.0))
+    sim.run_episode(lambda pose, g: pure_pursuit_policy(pose, g, v_max=0.5), goal, max_steps=600, planner=planner)
+    assert not _hits_wall(grid, [l["x"] for l in sim.logs], [l["y"] for l in sim.logs])
+    assert np.hypot(sim.logs[-1]["x"] - goal[0], sim.logs[-1]["y"] - goal[1]) < 0.2
+    print("SUCCESS: Planned baselines go through doors, not walls.")
+
+if __name__ == "__main__":
+    test_grid_planner()
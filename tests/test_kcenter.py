@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.training.coreset import (GeometricCoresetSelector, CoresetFeatures, KCenterSampler, coverage_radius,
+                                  farthest_point_sampling, streaming_farthest_point_sampling)
+
+def _naive_fps(X, k, w):
+    md = np.full(len(X), np.inf)
+    picks = [int(np.argmax(w))]
+    for _ in range(k - 1):
+        md = np.minimum(md, ((X - X[picks[-1]]) ** 2).sum(1))
+        picks.append(int(np.argmax(md * w * w)))
+    return np.array(picks)
+
+def test_kcenter_sampling():
+    print("Testing greedy k-center coreset...")
+    rng = np.random.default_rng(0)
+    X = rng.normal(0, 1, (5000, 4)).astype(np.float32)
+    w = rng.uniform(0.5, 2.0, 5000).astype(np.float32)
+
+    # Block-pruned sampler makes exactly the plain greedy picks
+    picks, radius = KCenterSampler(X, w, block=64).sample(200)
+    assert np.array_equal(picks, _naive_fps(X, 200, w))
+    assert np.all(np.diff(radius[1:]) <= 1e-5), "Greedy coverage radius must not grow"
+    assert np.array_equal(farthest_point_sampling(X, 200, w), picks)
+
+    # Streaming variant over a memmap gives the same picks
+    with tempfile.TemporaryDirectory() as tmp:
+        mm = np.memmap(os.path.join(tmp, "features.f32"), dtype=np.float32, mode="w+", shape=X.shape)
+        mm[:] = X
+        mm.flush()
+        assert np.array_equal(streaming_farthest_point_sampling(mm, 200, w, chunk=777), picks)
+        del mm
+
+    # Seeded with existing centers: never re-picks them
+    extra = farthest_point_sampling(X, 50, centers=X[:100])
+    assert not np.any(np.isin(extra, np.arange(100)))
+
+    # k-center coverage beats the inverse-density heuristic
+    n = 50_000
+    Y = np.concatenate([rng.normal(0, 1, (n - 1000, 4)), rng.uniform(-6, 6, (1000, 4))]).astype(np.float32)
+    feats = CoresetFeatures(Y, rng.uniform(0.1, 10, n).astype(np.float32), np.zeros(n, np.int32), np.arange(n, dtype=np.int32))
+    Y_norm = (Y - Y.mean(0)) / (Y.std(0) + 1e-6)
+    selector = GeometricCoresetSelector()
+    heuristic = selector.select_coreset_columnar(feats, 0.02, seed=0)
+    kcenter = selector.select_coreset_columnar(feats, 0.02, seed=0, diversity="kcenter")
+    assert len(kcenter) == len(heuristic) and len(np.unique(kcenter.index)) == len(kcenter)
+    assert coverage_radius(Y_norm, kcenter.index, feats.risk) < coverage_radius(Y_norm, heuristic.index, feats.risk)
+    assert coverage_radius(Y_norm, kcenter.index) < coverage_radius(Y_norm, heuristic.index)
+
+    # 1M points, 1000 exact greedy picks
+    big = rng.normal(0, 1, (1_000_000, 4)).astype(np.float32)
+    t0 = time.perf_counter()
+    farthest_point_sampling(big, 1000)
+    elapsed = time.perf_counter() - t0
+    print(f"SUCCESS: 1000 greedy k-center picks over 1M points in {elapsed:.2f}s.")
+
+def test_kcenter_duplicate_rows():
+    print("Testing k-center on duplicated rows...")
+    # All-identical rows: every pick after the first scores 0, yet picks stay distinct
+    zeros = np.zeros((50, 2), dtype=np.float32)
+    picks = farthest_point_sampling(zeros, 10)
+    assert len(np.unique(picks)) == 10
+    assert len(np.unique(streaming_farthest_point_sampling(zeros, 10, chunk=7))) == 10
+    assert len(np.unique(farthest_point_sampling(zeros, 80))) == 50
+
+    # Seeded centers given by index are never picked again
+    rng = np.random.default_rng(2)
+    X = np.repeat(rng.normal(0, 1, (20, 3)).astype(np.float32), 5, axis=0)
+    seeded = np.arange(0, 100, 7)
+    extra = farthest_point_sampling(X, 100 - len(seeded), centers=X[seeded], center_index=seeded)
+    assert len(np.unique(extra)) == len(extra) and not np.isin(extra, seeded).any()
+    assert set(extra) | set(seeded) == set(range(100))
+
+    # An idle robot: 90 identical steps plus 10 distinct ones
+    n = 100
+    Y = np.concatenate([np.zeros((90, 4)), rng.normal(0, 1, (10, 4))]).astype(np.float32)
+    feats = CoresetFeatures(Y, np.ones(n, dtype=np.float32), np.zeros(n, np.int32), np.arange(n, dtype=np.int32))
+    sel = GeometricCoresetSelector().select_coreset_columnar(feats, 0.5, seed=0, diversity="kcenter")
+    assert len(sel) == 50 and len(np.unique(sel.index)) == 50
+    # Coverage first: every distinct row is in before duplicates are used as filler
+    assert np.isin(np.arange(90, 100), sel.index).all()
+    print("SUCCESS: No row is picked twice, with or without seeded centers.")
+
+if __name__ == "__main__":
+    test_kcenter_sampling()
+    test_kcenter_duplicate_rows()
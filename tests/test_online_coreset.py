@@ -0,0 +1,82 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.training.coreset import GeometricCoresetSelector, OnlineCoreset, coverage_radius, extract_features
+
+def _batch(rng, n_eps=25, steps=200):
+    return [pd.DataFrame({"x": rng.uniform(0, 20, steps), "y": rng.uniform(0, 20, steps),
+                          "v_lin": rng.uniform(0, 1, steps), "d_person": rng.uniform(0, 8, steps)})
+            for _ in range(n_eps)]
+
+def test_online_coreset():
+    print("Testing merge-and-reduce online coreset...")
+    rng = np.random.default_rng(0)
+    online = OnlineCoreset(bucket_size=2000)
+    history = []
+    for _ in range(20):
+        batch = _batch(rng)
+        history.extend(batch)
+        before = online.num_reductions
+        online.add_episodes(batch)
+        # Cost follows the new data: 5000 points -> at most a few bucket merges per level
+        assert online.num_reductions - before <= 5000 // online.bucket_size + len(online.levels)
+        n = online.num_seen
+        assert online.size <= online.bucket_size * (np.log2(n / online.bucket_size) + 2)
+
+    assert online.num_seen == 100_000 and online.num_episodes == len(history)
+    K = 1000
+    core = online.current(K)
+    assert len(core) == K and len(set(zip(core.episode_id.tolist(), core.step_id.tolist()))) == K
+
+    # Risky half is the global top-K/2 of the whole history
+    full = extract_features(history)
+    top = np.argsort(-full.risk, kind="stable")[:K // 2]
+    assert np.isclose(np.sort(core.risk)[::-1][:K // 2], full.risk[top]).all()
+    row = history[core.episode_id[0]].iloc[core.step_id[0]]
+    assert np.allclose(core.X[0], [row.x, row.y, row.v_lin, min(10.0, row.d_person)])
+
+    # Coverage stays close to recomputing the k-center coreset over the full history
+    mean, std = full.X.mean(0), full.X.std(0) + 1e-6
+    Xn = (full.X - mean) / std
+    t0 = time.perf_counter()
+    batch_sel = GeometricCoresetSelector().select_k(full, K, diversity="kcenter")
+    batch_time = time.perf_counter() - t0
+    lookup = {(e, s): i for i, (e, s) in enumerate(zip(full.episode_id.tolist(), full.step_id.tolist()))}
+    online_idx = np.array([lookup[(e, s)] for e, s in zip(core.episode_id.tolist(), core.step_id.tolist())])
+    r_online, r_batch = coverage_radius(Xn, online_idx), coverage_radius(Xn, batch_sel.index)
+    assert r_online < 2.0 * r_batch
+    t0 = time.perf_counter()
+    online.current(K)
+    emit_time = time.perf_counter() - t0
+    print(f"SUCCESS: radius online {r_online:.3f} vs full {r_batch:.3f}; "
+          f"emit {emit_time * 1e3:.0f} ms vs full recompute {batch_time * 1e3:.0f} ms.")
+
+def test_online_coreset_repeated_rows():
+    print("Testing online coreset on repeated transitions...")
+    rng = np.random.default_rng(1)
+    # Mostly idle robots logging identical steps, with a few moving episodes mixed in
+    idle = [pd.DataFrame({"x": np.full(300, 5.0), "y": np.full(300, 5.0), "v_lin": 0.0, "d_person": 3.0})
+            for _ in range(8)]
+    online = OnlineCoreset(bucket_size=256)
+    for _ in range(4):
+        online.add_episodes(idle + _batch(rng, n_eps=2, steps=50))
+
+    def pairs(feats):
+        return list(zip(feats.episode_id.tolist(), feats.step_id.tolist()))
+
+    for bucket in [b for b in online.levels if b is not None]:
+        assert len(bucket) <= online.bucket_size and len(set(pairs(bucket))) == len(bucket)
+    for K in (100, 256, 600):
+        core = online.current(K)
+        assert len(core) == min(K, online.size) and len(set(pairs(core))) == len(core)
+    print("SUCCESS: Buckets and current() hold unique (episode, step) pairs.")
+
+if __name__ == "__main__":
+    test_online_coreset()
+    test_online_coreset_repeated_rows()
@@ -0,0 +1,74 @@
+import sys
+import os
+import ast
+import glob
+import subprocess
+
+# Add src to path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+def _imported_modules(path):
+    """Absolute module names imported by a source file (relative imports excluded)."""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.append(node.module)
+    return names
+
+def test_src_dependency_goes_through_common():
+    print("Testing the safety_transfer_hospital -> src dependency direction...")
+    bridge = os.path.join(ROOT, "safety_transfer_hospital", "common.py")
+    for path in glob.glob(os.path.join(ROOT, "safety_transfer_hospital", "**", "*.py"), recursive=True):
+        if os.path.abspath(path) == bridge:
+            continue
+        src_imports = [m for m in _imported_modules(path) if m == "src" or m.startswith("src.")]
+        assert not src_imports, f"{os.path.relpath(path, ROOT)} imports {src_imports}; use safety_transfer_hospital.common"
+
+    for path in glob.glob(os.path.join(ROOT, "src", "**", "*.py"), recursive=True):
+        back = [m for m in _imported_modules(path) if m.startswith("safety_transfer_hospital")]
+        assert not back, f"{os.path.relpath(path, ROOT)} imports {back}"
+    print("SUCCESS: only safety_transfer_hospital/common.py imports src, and src never imports back.")
+
+def test_common_reexports_src_objects():
+    print("Testing that the bridge re-exports the src objects themselves...")
+    import importlib
+    from safety_transfer_hospital import common
+
+    for name in common.__all__:
+        module = common._EXPORTS[name]
+        assert module.startswith("src."), name
+        assert getattr(common, name) is getattr(importlib.import_module(module), name), name
+    print("SUCCESS: common re-exports src objects without copies.")
+
+def test_importable_from_repo_root_only():
+    print("Testing imports in a fresh interpreter with only the repo root on sys.path...")
+    code = ("import safety_transfer_hospital.world_gen.generator, safety_transfer_hospital.world_gen.risk, "
+            "safety_transfer_hospital.sim_interface.runner, safety_transfer_hospital.analysis.aggregate")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(ROOT), env=env,
+                         capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    print("SUCCESS: package imports with the repo root on sys.path.")
+
+def test_schema_import_stays_light():
+    print("Testing that the schema only loads the threshold registry from src...")
+    code = ("import sys, safety_transfer_hospital.world_gen.schema as schema; "
+            "assert schema.THRESHOLDS is sys.modules['src.metrics.thresholds'].DEFAULT_THRESHOLDS; "
+            "print(' '.join(m for m in sys.modules if m.startswith('src.')))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(ROOT), env=env,
+                         capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert set(out.stdout.split()) == {"src.metrics", "src.metrics.thresholds"}, out.stdout
+    print("SUCCESS: importing the schema loads src.metrics.thresholds only.")
+
+if __name__ == "__main__":
+    test_src_dependency_goes_through_common()
+    test_common_reexports_src_objects()
+    test_importable_from_repo_root_only()
+    test_schema_import_stays_light()
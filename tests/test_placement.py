@@ -0,0 +1,76 @@
+import sys
+import os
+import random
+import numpy as np
+from scipy.spatial.distance import pdist
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.world_gen.placement import PlacementEngine
+from src.world_gen.hospital_generator import HospitalGenerator as GridGenerator
+from safety_transfer_hospital.world_gen.generator import HospitalGenerator, ObjectType, OCCUPIED
+
+def test_engine_separation():
+    print("Testing rejection-free placement...")
+    grid = np.zeros((200, 200), dtype=np.int8)
+    grid[:, 100] = 100  # a wall down the middle
+
+    engine = PlacementEngine(grid, resolution=0.1, rng=random.Random(0))
+    pts = np.array(engine.place(400, radius=0.25, min_gap=0.2))
+    assert len(pts) == 400
+    assert pdist(pts).min() >= 0.7 - 1e-9, "Discs overlap or violate min_gap"
+    # Nothing may intrude on the wall cells [10.0, 10.1) m
+    assert np.all((pts[:, 0] <= 10.0 - 0.25) | (pts[:, 0] >= 10.1 + 0.25))
+
+    # Same RNG seed -> same placement
+    again = PlacementEngine(grid, resolution=0.1, rng=random.Random(0)).place(400, radius=0.25, min_gap=0.2)
+    assert np.array_equal(pts, np.array(again))
+    print("SUCCESS: Engine placements are separated and reproducible.")
+
+def test_diagonal_corner_clearance():
+    print("Testing wall clearance next to a diagonal corner...")
+    grid = np.zeros((20, 20), dtype=np.int8)
+    grid[10, 10] = 100  # occupied cell [10, 11) x [10, 11) m
+
+    engine = PlacementEngine(grid, resolution=1.0, rng=random.Random(0))
+    corner = np.hypot(0.5, 0.5)  # (11.5, 11.5) to the cell corner (11, 11)
+    assert engine.wall_clearance(11.5, 11.5) <= corner + 1e-9
+    assert not engine.try_place(11.5, 11.5, 0.75)
+    assert engine.try_place(11.5, 11.5, 0.7)
+    print("SUCCESS: Clearance is a lower bound at diagonal corners.")
+
+def test_dense_worlds_never_overlap():
+    print("Testing dense generator worlds...")
+    gen = GridGenerator(width=40, height=40, seed=3)
+    gen.generate_layout(num_wards=4, num_people=200)
+    people = np.array([[o.pose.x, o.pose.y] for o in gen.objects if o.type == "person"])
+    assert len(people) == 200
+    assert pdist(people).min() >= 0.5
+
+    wards = [r for r in gen.rooms if r.type == "ward"]
+    for i, a in enumerate(wards):
+        for b in wards[i + 1:]:
+            overlap = a.x < b.x + b.width and b.x < a.x + a.width and a.y < b.y + b.height and b.y < a.y + a.height
+            assert not overlap, f"{a.id} overlaps {b.id}"
+
+    for seed in range(10):
+        gen = HospitalGenerator(seed=seed, difficulty_batch="D")
+        gen.generate_layout()
+        gen.place_objects()
+        beds = [o.pose for o in gen.objects if o.type == ObjectType.BED]
+        people = [o.pose for o in gen.objects if o.type == ObjectType.PERSON]
+        for px, py, _ in people:
+            row, col = int(py / gen.resolution), int(px / gen.resolution)
+            assert gen.grid[row, col] != OCCUPIED, "Person placed inside a wall"
+            for bx, by, _ in beds:
+                # Person disc must not intersect the 2.0 x 1.0 bed rectangle
+                dx = max(abs(px - bx) - 1.0, 0.0)
+                dy = max(abs(py - by) - 0.5, 0.0)
+                assert np.hypot(dx, dy) >= 0.25 - 1e-9, "Person overlaps a bed"
+    print("SUCCESS: Dense worlds have no overlapping objects.")
+
+if __name__ == "__main__":
+    test_engine_separation()
+    test_diagonal_corner_clearance()
+    test_dense_worlds_never_overlap()
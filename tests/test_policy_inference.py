@@ -0,0 +1,72 @@
+import sys
+import os
+import torch
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from safety_transfer_hospital.policy.constrained_policy import ConstrainedVLAPolicy
+from safety_transfer_hospital.policy.inference import PolicyInferenceEngine, export_policy, benchmark_latency
+
+def test_inference_paths():
+    print("Testing VLA Inference Paths...")
+    torch.manual_seed(0)
+    policy = ConstrainedVLAPolicy().eval()
+
+    rng = np.random.default_rng(0)
+    states = rng.standard_normal((8, 3)).astype(np.float32)
+    sems = rng.uniform(0.0, 5.0, (8, 3)).astype(np.float32)
+
+    with torch.no_grad():
+        ref, _ = policy(torch.from_numpy(states), torch.from_numpy(sems))
+    ref = ref.numpy()
+
+    # 1. act_numpy and the actor-only path agree with the full forward pass
+    assert np.allclose(policy.act_numpy(states[0], sems[0]), ref[0], atol=1e-6)
+
+    # 2. Engine (eager and TorchScript) reproduces the batched output
+    for model in [policy, export_policy(policy, "script")]:
+        engine = PolicyInferenceEngine(model, max_batch=8)
+        out = engine.act(states, sems)
+        assert out.shape == (8, 2)
+        assert np.allclose(out, ref, atol=1e-5)
+        single = engine.act(states[3], sems[3])
+        assert np.allclose(single, ref[3], atol=1e-5)
+
+    # 3. Output buffer is reused between calls (no per-call allocation)
+    engine = PolicyInferenceEngine(policy)
+    a = engine.act(states[0], sems[0])
+    b = engine.act(states[1], sems[1])
+    assert np.shares_memory(a, b)
+
+    # 4. int8 dynamic quantization stays close to fp32 and respects action limits
+    q_engine = PolicyInferenceEngine(export_policy(policy, "script", quantize=True), max_batch=8)
+    q_out = q_engine.act(states, sems)
+    assert np.abs(q_out - ref).max() < 0.05
+    assert np.all((q_out[:, 0] >= 0.0) & (q_out[:, 0] <= 0.22))
+
+    # 5. Oversized batches are rejected
+    try:
+        PolicyInferenceEngine(policy, max_batch=2).act(states, sems)
+        assert False, "Expected ValueError for batch > max_batch"
+    except ValueError:
+        pass
+
+    # 6. Exports that keep the safety critic head return (actions, safety_values)
+    for method in ["script", "eager"]:
+        engine_full = PolicyInferenceEngine(export_policy(policy, method, actions_only=False), max_batch=8)
+        assert np.allclose(engine_full.act(states, sems), ref, atol=1e-5)
+        assert np.allclose(engine_full.act(states[3], sems[3]), ref[3], atol=1e-5)
+
+    # 7. The caller's policy is not moved or copied when it is already on the device
+    assert PolicyInferenceEngine(policy).model is policy
+
+    stats = benchmark_latency(lambda: engine.act(states[0], sems[0]), n_iters=50, warmup=5)
+    print(f"Engine latency: {stats['mean_us']:.1f} us/call")
+    assert stats["mean_us"] > 0
+
+    print("SUCCESS: Inference paths verified.")
+
+if __name__ == "__main__":
+    test_inference_paths()
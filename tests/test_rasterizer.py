@@ -0,0 +1,86 @@
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.world_gen.rasterizer import rasterize_obbs, rasterize_discs, rasterize_objects, rasterize_footprint
+from src.world_gen.hospital_generator import HospitalGenerator, Object, Pose
+
+def _brute_force_obb(shape, res, c, he, th):
+    out = np.zeros(shape, dtype=bool)
+    for r in range(shape[0]):
+        for q in range(shape[1]):
+            px, py = (q + 0.5) * res - c[0], (r + 0.5) * res - c[1]
+            u = np.cos(th) * px + np.sin(th) * py
+            v = -np.sin(th) * px + np.cos(th) * py
+            out[r, q] = abs(u) <= he[0] and abs(v) <= he[1]
+    return out
+
+def test_rasterizer():
+    print("Testing batched OBB/disc rasterization...")
+    rng = np.random.default_rng(0)
+    shape, res = (60, 80), 0.1
+    centers = rng.uniform(0, 8, (6, 2))
+    half = rng.uniform(0.1, 1.0, (6, 2))
+    thetas = rng.uniform(0, np.pi, 6)
+
+    batched = rasterize_obbs(shape, res, centers, half, thetas)
+    expected = np.zeros(shape, dtype=bool)
+    for c, he, th in zip(centers, half, thetas):
+        expected |= _brute_force_obb(shape, res, c, he, th)
+    assert np.array_equal(batched, expected)
+
+    # Discs: area ~ pi r^2, clipped at the map border without wrapping
+    disc = rasterize_discs(shape, res, np.array([[4.0, 3.0], [0.0, 0.0]]), np.array([1.0, 0.5]))
+    assert abs(disc[:, 20:].sum() * res**2 - np.pi) < 0.1
+    assert disc[-1, :].sum() == 0 and disc[:, -1].sum() == 0
+
+    # Rotated bed in the generator: 2.0 x 1.0 rotated by 90 deg is tall, not wide
+    gen = HospitalGenerator(width=10, height=10, resolution=0.1)
+    gen.add_object("bed", 5.0, 5.0, np.pi / 2)
+    gen.add_object("person", 2.0, 2.0, 0.0)
+    gen.add_object("door", 8.0, 8.0, 0.0)
+    rows, cols = np.nonzero(gen.grid == 100)
+    assert np.ptp(rows) > np.ptp(cols)
+
+    layers = gen.rasterize_layers()
+    assert set(layers) == {"bed", "person", "door"}
+    assert np.array_equal(layers["bed"], gen.grid == 100)
+    assert layers["person"][20, 20] and not layers["person"][50, 50]
+    print("SUCCESS: Rasterizer matches brute-force reference.")
+
+def test_windowed_painting():
+    print("Testing per-object window rasterization and strided outputs...")
+    rng = np.random.default_rng(1)
+    shape, res = (200, 240), 0.05
+    # Includes objects hanging over every border
+    objs = [Object(f"o{i}", t, Pose(*rng.uniform(-0.5, 12.5, 2), rng.uniform(0, np.pi)), list(rng.uniform(0.2, 2.0, 2)))
+            for i, t in enumerate(["bed", "door", "person"] * 8)]
+    full = rasterize_objects(objs, shape, res)
+    painted = {t: np.zeros(shape, dtype=bool) for t in full}
+    for o in objs:
+        window, mask = rasterize_footprint(o, shape, res)
+        assert mask.size < 0.1 * np.prod(shape)
+        painted[o.type][window] |= mask
+    for t in full:
+        assert np.array_equal(painted[t], full[t])
+
+    # A non-contiguous `out` view is written through, not into a silent copy
+    base = np.zeros((shape[0], 2 * shape[1]), dtype=bool)
+    centers, half, th = np.array([[6.0, 5.5]]), np.array([[1.0, 0.4]]), np.array([0.7])
+    rasterize_obbs(shape, res, centers, half, th, out=base[:, ::2])
+    assert np.array_equal(base[:, ::2], rasterize_obbs(shape, res, centers, half, th))
+    assert not base[:, 1::2].any()
+
+    # Generator beds painted through windows match the batched layer
+    gen = HospitalGenerator(width=10, height=10, resolution=0.1)
+    for x, y, t in [(5.0, 5.0, 0.3), (0.2, 9.9, 1.2), (9.0, 1.0, 2.0)]:
+        gen.add_object("bed", x, y, t)
+    assert np.array_equal(gen.grid == 100, gen.rasterize_layers()["bed"])
+    print("SUCCESS: Window rasterization matches the full-grid pass.")
+
+if __name__ == "__main__":
+    test_rasterizer()
+    test_windowed_painting()
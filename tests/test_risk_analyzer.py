@@ -0,0 +1,61 @@
+import sys
+import os
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from safety_transfer_hospital.world_gen.generator import HospitalGenerator
+from safety_transfer_hospital.world_gen.risk import WorldRiskAnalyzer, score_worlds, stratify
+
+def _corridor(width_cells: int, people=()):
+    grid = np.full((40, 60), 100, dtype=np.int8)
+    top = 20 - width_cells // 2
+    grid[top:top + width_cells, :] = 0
+    objects = [{"type": "person", "x": x, "y": y, "yaw": 0.0, "size": (0.5, 0.5, 1.7)} for x, y in people]
+    return {"grid": grid, "objects": objects, "resolution": 0.1}
+
+def test_geometric_risk():
+    print("Testing geometric risk analyzer...")
+    analyzer = WorldRiskAnalyzer()
+    wide = analyzer.analyze(**_corridor(40))
+    narrow = analyzer.analyze(**_corridor(15))
+    assert narrow.narrow_fraction > wide.narrow_fraction
+    assert narrow.risk_index > wide.risk_index
+    assert abs(narrow.min_clearance - 0.7) < 0.11
+
+    # A person on the centerline raises risk; one far from it (behind the wall) does not count
+    crowded = analyzer.analyze(**_corridor(15, people=[(3.0, 2.0)]))
+    walled = analyzer.analyze(**_corridor(15, people=[(3.0, 0.2)]))
+    assert crowded.person_density > 0 and walled.person_density == 0
+
+    # Content-hash cache
+    misses = analyzer.misses
+    again = analyzer.analyze(**_corridor(15, people=[(3.0, 2.0)]))
+    assert again is crowded and analyzer.misses == misses
+
+    # Generator batches: mean risk increases with difficulty
+    means = []
+    for batch in "ABCD":
+        risks = []
+        for seed in range(8):
+            gen = HospitalGenerator(seed=seed, difficulty_batch=batch)
+            gen.generate_layout()
+            gen.place_objects()
+            assert gen.risk_index == gen.risk_report.risk_index
+            risks.append(gen.risk_index)
+        means.append(np.mean(risks))
+    assert means == sorted(means), means
+
+    # Bulk scoring matches in-process scoring; strata are equal-sized
+    worlds = [_corridor(w) for w in (10, 20, 30, 40)] * 2
+    serial = score_worlds(worlds, workers=0)
+    parallel = score_worlds(worlds, workers=2, chunksize=2)
+    assert [r.risk_index for r in serial] == [r.risk_index for r in parallel]
+    labels = stratify(serial)
+    assert sorted(labels) == ["A", "A", "B", "B", "C", "C", "D", "D"]
+    assert {labels[0], labels[4]} == {"C", "D"} and {labels[3], labels[7]} == {"A", "B"}
+    print(f"SUCCESS: Batch mean risks {np.round(means, 2).tolist()}")
+
+if __name__ == "__main__":
+    test_geometric_risk()
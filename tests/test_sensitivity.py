@@ -0,0 +1,68 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics.safety_evaluator import SafetyEvaluator, SafetyConfig
+from src.metrics.sensitivity import ThresholdSweep
+from src.metrics.thresholds import DEFAULT_THRESHOLDS
+
+def _episodes(rng, n_eps=5, steps=200):
+    objects = [{"type": t, "pose": {"x": x, "y": y, "theta": 0.0}}
+               for t, x, y in zip(rng.choice(["bed", "person", "door"], 25), rng.uniform(0, 8, 25), rng.uniform(0, 8, 25))]
+    logs = [pd.DataFrame({"t": np.arange(steps) * 0.1, "x": rng.uniform(0, 8, steps), "y": rng.uniform(0, 8, steps),
+                          "v_lin": rng.uniform(-0.2, 1.0, steps)}) for _ in range(n_eps)]
+    return objects, logs
+
+def _reference(objects, logs, registry):
+    """Full re-evaluation with the given thresholds (pooled rates)."""
+    evaluator = SafetyEvaluator(objects, SafetyConfig(registry.to_config()))
+    red = amber = steps = 0
+    for log in logs:
+        m, _ = evaluator.evaluate_episode(log)
+        red += m["Red_Steps"]; amber += m["Amber_Moving_Steps"]; steps += m["Total_Steps"]
+    return red / steps, amber / steps
+
+def test_threshold_sweep():
+    print("Testing threshold sensitivity sweep...")
+    rng = np.random.default_rng(0)
+    objects, logs = _episodes(rng)
+    sweep = ThresholdSweep.from_episodes(logs, SafetyEvaluator(objects))
+
+    # Uniform scaling matches re-evaluating every variant (grid given out of order)
+    scales = np.array([1.2, 0.8, 1.0, 0.5, 1.5])
+    surface = sweep.sweep_scale(scales, scales[::-1])
+    for i, a in enumerate(scales):
+        for j, b in enumerate(scales[::-1]):
+            reg = DEFAULT_THRESHOLDS.scaled(1.0)
+            reg.crit[:-1] *= a
+            reg.warn[:-1] *= b
+            svr, nvt = _reference(objects, logs, reg)
+            assert np.isclose(surface.svr[i], svr) and np.isclose(surface.nvt[i, j], nvt)
+
+    # One type on a (d_crit, d_warn) grid, the others nominal
+    crit, warn = np.array([0.3, 0.7, 1.0]), np.array([0.5, 1.2, 2.0])
+    surface = sweep.sweep_type("person", crit, warn)
+    for i, c in enumerate(crit):
+        for j, w in enumerate(warn):
+            cfg = DEFAULT_THRESHOLDS.to_config()
+            cfg["person"] = {"crit": c, "warn": w}
+            svr, nvt = _reference(objects, logs, DEFAULT_THRESHOLDS.from_config(cfg))
+            assert np.isclose(surface.svr[i], svr) and np.isclose(surface.nvt[i, j], nvt)
+    assert len(surface.to_frame()) == 9
+
+    # Thousands of threshold pairs over 1M steps
+    n = 1_000_000
+    big = ThresholdSweep({t: rng.uniform(0, 4, n) for t in ("bed", "person", "door")}, rng.uniform(0, 1, n))
+    t0 = time.perf_counter()
+    big.sweep_scale(np.linspace(0.5, 1.5, 100), np.linspace(0.5, 2.0, 100))
+    big.sweep_type("person", np.linspace(0.2, 1.5, 100), np.linspace(0.5, 2.5, 100))
+    elapsed = time.perf_counter() - t0
+    print(f"SUCCESS: 2 x 10k threshold pairs over {n} steps in {elapsed * 1e3:.0f} ms.")
+
+if __name__ == "__main__":
+    test_threshold_sweep()
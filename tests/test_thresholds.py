@@ -0,0 +1,113 @@
+import sys
+import os
+import json
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics.thresholds import ThresholdRegistry, DEFAULT_THRESHOLDS, GREEN, AMBER, RED
+from src.metrics.safety_evaluator import SafetyEvaluator, SafetyConfig
+from safety_transfer_hospital.world_gen.schema import SAFETY_STANDARDS, ObjectType, SemanticObject
+from safety_transfer_hospital.metrics.calculator import MetricsCalculator
+
+def test_threshold_registry():
+    print("Testing shared threshold registry...")
+    reg = DEFAULT_THRESHOLDS
+
+    # One source of truth: schema standards and evaluator defaults agree with the registry
+    for t in ObjectType:
+        assert SAFETY_STANDARDS[t].d_crit == reg.crit_of(t) and SAFETY_STANDARDS[t].d_warn == reg.warn_of(t)
+    assert SafetyEvaluator([]).config.thresholds["person"] == {"crit": 0.7, "warn": 1.2}
+
+    # Fancy-indexed labelling matches the scalar rule; unknown types are always green
+    rng = np.random.default_rng(0)
+    codes = reg.encode(rng.choice(["bed", "person", "door", "wall", "chair"], 10_000))
+    d = rng.uniform(0, 2, 10_000)
+    zones = reg.label(d, codes)
+    for di, ci, zi in zip(d[:500], codes[:500], zones[:500]):
+        ref = GREEN if ci == reg.unknown else (RED if di < reg.crit[ci] else AMBER if di < reg.warn[ci] else GREEN)
+        assert zi == ref
+    assert np.all(zones[codes == reg.unknown] == GREEN)
+
+    # Per-object overrides: a bed with a 2 m red radius turns the step red
+    objects = [{"type": "bed", "pose": {"x": 1.5, "y": 0.0, "theta": 0.0}, "safety_d_crit": 2.0, "safety_d_warn": 3.0},
+               {"type": "bed", "pose": {"x": -1.0, "y": 0.0, "theta": 0.0}}]
+    log = pd.DataFrame({"t": [0.0, 0.1], "x": [0.0, 0.0], "y": [0.0, 5.0], "v_lin": [0.5, 0.5]})
+    metrics, details = SafetyEvaluator(objects).evaluate_episode(log)
+    assert list(details.status) == ["red", "green"] and details.d_bed.iloc[0] == 1.0
+    metrics, details = SafetyEvaluator([objects[1]]).evaluate_episode(log)
+    assert list(details.status) == ["green", "green"]
+
+    # Sensitivity analysis: scaled copies leave the default untouched
+    assert np.isclose(reg.scaled(1.2).crit_of("person"), 0.84) and reg.crit_of("person") == 0.7
+
+    # Overrides with warn < crit: anything inside the red radius is red, never amber
+    inverted = ThresholdRegistry({"bed": (1.0, 0.5)})
+    assert list(inverted.label([0.3, 0.7, 1.2], inverted.code("bed"))) == [RED, RED, GREEN]
+    assert list(reg.label([0.3, 0.7], 0, crit=np.array([1.0, 1.0]), warn=np.array([0.5, 0.5]))) == [RED, RED]
+
+    # MetricsCalculator labels the same zones as the scalar rule
+    flat = [{"id": str(i), "type": t, "x": x, "y": y} for i, (t, x, y) in
+            enumerate(zip(rng.choice(["bed", "person", "door"], 30), rng.uniform(0, 10, 30), rng.uniform(0, 10, 30)))]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "objects.json")
+        with open(path, "w") as f:
+            json.dump(flat, f)
+        calc = MetricsCalculator(path)
+    traj = pd.DataFrame({"t": np.arange(200) * 0.1, "x": rng.uniform(0, 10, 200), "y": rng.uniform(0, 10, 200)})
+    labels = calc.label_safety_zones(calc.compute_distances(traj))
+    for otype in ("bed", "person", "door"):
+        s = SAFETY_STANDARDS[ObjectType(otype)]
+        ref = np.where(labels[f"d_{otype}"] < s.d_crit, "RED", np.where(labels[f"d_{otype}"] < s.d_warn, "AMBER", "GREEN"))
+        assert (labels[f"zone_{otype}"] == ref).all()
+
+    # 1M steps of labelling
+    n = 1_000_000
+    d = rng.uniform(0, 2, n)
+    codes = rng.integers(0, reg.unknown, n)
+    t0 = time.perf_counter()
+    reg.label(d, codes)
+    print(f"SUCCESS: labelled {n} distances in {(time.perf_counter() - t0) * 1e3:.0f} ms.")
+
+def test_config_applies_to_flat_objects():
+    print("Testing explicit configs against schema-stamped object thresholds...")
+    # SemanticObject.to_dict stamps the schema defaults onto every object
+    person = SemanticObject("p1", ObjectType.PERSON, (0.75, 0.0, 0.0), (0.5, 0.5, 1.7)).to_dict()
+    assert person["safety_d_crit"] == DEFAULT_THRESHOLDS.crit_of("person")
+    log = pd.DataFrame({"t": [0.0], "x": [0.0], "y": [0.0], "v_lin": [0.5]})
+
+    # d = 0.75: amber at the benchmark radius (0.7), red at +20% (0.84), green at -50%
+    _, details = SafetyEvaluator([person]).evaluate_episode(log)
+    assert list(details.status) == ["amber"]
+    scaled = SafetyConfig(thresholds=DEFAULT_THRESHOLDS.scaled(1.2).to_config())
+    _, details = SafetyEvaluator([person], config=scaled).evaluate_episode(log)
+    assert list(details.status) == ["red"]
+    shrunk = SafetyConfig(thresholds=DEFAULT_THRESHOLDS.scaled(0.5).to_config())
+    _, details = SafetyEvaluator([person], config=shrunk).evaluate_episode(log)
+    assert list(details.status) == ["green"]
+
+    # A value that differs from the schema default is a genuine override and is kept
+    custom = dict(person, safety_d_crit=1.0, safety_d_warn=1.5)
+    compiled = DEFAULT_THRESHOLDS.scaled(0.5).compile_objects([person, custom])
+    assert np.allclose(compiled["crit"], [0.35, 1.0]) and list(compiled["override"]) == [False, True]
+    _, details = SafetyEvaluator([custom], config=shrunk).evaluate_episode(log)
+    assert list(details.status) == ["red"]
+
+    # Types missing from a partial config share the `unknown` code but are never mixed up
+    door = {"type": "door", "pose": {"x": 5.0, "y": 0.0}}
+    chair = {"type": "chair", "pose": {"x": 1.0, "y": 0.0}}
+    partial = SafetyConfig(thresholds={t: DEFAULT_THRESHOLDS.to_config()[t] for t in ("bed", "person")})
+    for config in [None, partial]:
+        timeline = SafetyEvaluator([door, chair], config=config).distance_timeline(log)
+        assert timeline["door"][0] == 5.0 and np.isinf(timeline["person"][0])
+    compiled = ThresholdRegistry.from_config(partial.thresholds).compile_objects([door, chair])
+    assert list(compiled["type"]) == ["door", "chair"] and compiled["code"][0] == compiled["code"][1]
+    print("SUCCESS: Explicit configs apply; only non-default per-object values override.")
+
+if __name__ == "__main__":
+    test_threshold_registry()
+    test_config_applies_to_flat_objects()
@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics.advanced_safety import AdvancedSafetyMetrics
+from src.simulation.crowd import TrajectoryBuffer
+
+def _legacy_min_ttp(v, dists, mu=0.6, g=9.81):
+    min_ttp = float('inf')
+    for i, d in enumerate(dists):
+        vel = max(0.01, v[i])
+        stop_dist = (vel**2) / (2 * mu * g)
+        ttp = 0.0 if d < stop_dist else (d - stop_dist) / vel
+        min_ttp = min(min_ttp, ttp)
+    return min_ttp
+
+def test_ttp_timeline():
+    print("Testing vectorized TTP/TTC timeline...")
+    metrics = AdvancedSafetyMetrics()
+    rng = np.random.default_rng(0)
+
+    # Vectorized legacy KPI is unchanged
+    log = pd.DataFrame({"t": np.arange(500) * 0.1, "v_lin": rng.uniform(-0.1, 1.0, 500),
+                        "d_person": rng.uniform(0.0, 5.0, 500)})
+    assert metrics.compute_metrics(log).min_ttp == _legacy_min_ttp(log.v_lin.values, log.d_person.values)
+
+    # Robot driving at 0.5 m/s straight at a bed 5 m away: TTC = d / 0.5
+    t = np.arange(50) * 0.1
+    drive = pd.DataFrame({"t": t, "x": 0.5 * t, "y": np.zeros(50), "v_lin": np.full(50, 0.5)})
+    bed = [{"type": "bed", "pose": {"x": 5.0, "y": 0.0, "theta": 0.0}}]
+    tl = metrics.compute_timeline(drive, objects=bed)
+    assert np.isinf(tl.ttc["bed"][0]) and np.all(np.isinf(tl.ttc["person"]))
+    assert np.allclose(tl.ttc["bed"][1:], (5.0 - 0.5 * t[1:]) / 0.5)
+    assert np.all(tl.ttp["bed"][1:] < tl.ttc["bed"][1:])
+
+    # A pedestrian walking at 1 m/s into a parked robot: closing speed comes from the walker
+    buf = TrajectoryBuffer(1)
+    for ti in t:
+        buf.append(ti, np.array([[4.0 - ti, 0.0]]), np.array([[-1.0, 0.0]]))
+    parked = pd.DataFrame({"t": t, "x": 0.0, "y": 0.0, "v_lin": 0.0})
+    tl = metrics.compute_timeline(parked, crowd=buf)
+    approach = slice(1, 40)  # the walker passes the robot at t = 4 s and then recedes
+    assert np.allclose(tl.ttc["person"][approach], 4.0 - t[approach], atol=1e-4)
+    assert np.all(np.isinf(tl.ttc["person"][41:]))
+    kpis = tl.summary()
+    assert kpis["ttc_person_min"] == tl.ttc_min[1:].min() and 0 < kpis["ttc_p50"] < 4.0
+
+    # Dataset-scale: 1M steps across episodes, never differenced across boundaries
+    n = 1_000_000
+    big = pd.DataFrame({"t": np.tile(np.arange(1000) * 0.1, n // 1000),
+                        "episode": np.repeat(np.arange(n // 1000), 1000),
+                        "d_bed": rng.uniform(0.1, 5.0, n), "d_person": rng.uniform(0.1, 5.0, n),
+                        "d_door": np.full(n, np.inf)})
+    t0 = time.perf_counter()
+    tl = metrics.compute_timeline(big)
+    elapsed = time.perf_counter() - t0
+    assert np.all(np.isinf(tl.ttc_min[::1000]))
+    assert tl.ttp_min.shape == (n,)
+    print(f"SUCCESS: TTP/TTC timeline for 1M steps in {elapsed * 1e3:.0f} ms.")
+
+if __name__ == "__main__":
+    test_ttp_timeline()
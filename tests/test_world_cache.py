@@ -0,0 +1,60 @@
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from safety_transfer_hospital.world_gen.cache import WorldCache, world_key
+from safety_transfer_hospital.world_gen.farm import generate_worlds
+from safety_transfer_hospital.world_gen.generator import HospitalGenerator
+from scipy.ndimage import distance_transform_edt
+
+def test_world_cache():
+    print("Testing content-addressed world cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = WorldCache(os.path.join(tmp, "cache"))
+        first = cache.get_or_build(seed=7, batch="C")
+        again = cache.get_or_build(seed=7, batch="C")
+        assert (cache.hits, cache.misses) == (1, 1) and again.path == first.path
+        assert world_key(7, "C", 20, 20, 1.0) != world_key(7, "C", 20, 20, 1.0, version="0.0")
+
+        gen = HospitalGenerator(seed=7, difficulty_batch="C")
+        gen.generate_layout()
+        gen.place_objects()
+        assert np.array_equal(first.grid, gen.grid)
+        assert len(first.meta["objects"]) == len(gen.objects)
+        assert {"map.pgm", "map.yaml", "map_layout.txt"} <= set(os.listdir(first.path))
+
+        # Derived artifacts are computed once
+        calls = []
+        def clearance(world):
+            calls.append(1)
+            return distance_transform_edt(np.asarray(world.grid) == 0)
+        a = cache.artifact(first.key, "clearance", clearance)
+        b = cache.artifact(first.key, "clearance", clearance)
+        assert len(calls) == 1 and np.array_equal(a, b)
+
+        # LRU eviction: a cache sized for ~2 worlds keeps the most recently used ones
+        entry_bytes = cache.size_bytes() - a.nbytes
+        small = WorldCache(os.path.join(tmp, "small"), max_bytes=int(2.5 * entry_bytes))
+        keys = [small.get_or_build(seed=s).key for s in range(3)]
+        small.get(keys[1])
+        small.get_or_build(seed=3)
+        assert small.get(keys[0]) is None and small.get(keys[1]) is not None
+        assert small.size_bytes() <= small.max_bytes
+        assert not [d for d in os.listdir(small.root) if d.startswith(".tmp")]
+
+        # Farm reruns hit the cache and reproduce the same summaries
+        cache_dir = os.path.join(tmp, "farm")
+        cold = generate_worlds(8, workers=2, cache_dir=cache_dir)
+        warm = generate_worlds(8, workers=0, cache_dir=cache_dir)
+        direct = generate_worlds(8, workers=0)
+        assert not any(s["cache_hit"] for s in cold) and all(s["cache_hit"] for s in warm)
+        strip = lambda ss: [{k: v for k, v in s.items() if k not in ("build_time_s", "cache_hit")} for s in ss]
+        assert strip(cold) == strip(warm) == strip(direct)
+    print("SUCCESS: World cache serves reruns without regeneration.")
+
+if __name__ == "__main__":
+    test_world_cache()